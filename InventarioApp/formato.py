@@ -0,0 +1,172 @@
+import codecs
+import itertools
+import locale
+import operator
+import re
+
+# Formato de datos.txt
+# --------------------
+# Versión 2: una primera línea de encabezado y luego una fila por producto con
+# los campos separados por tabuladores:
+#     #INVENTARIO 2	id_producto	nombre	cantidad	precio
+#     A1	Teclado, inalámbrico	10	25.5
+# Dentro de un campo, "\" se escribe "\\", el tabulador "\t" y los saltos de
+# línea "\n" y "\r", así que un nombre puede tener comas, tabuladores o saltos.
+# Un archivo sin encabezado es del formato anterior (id,nombre,cantidad,precio
+# separados por comas) y se sigue pudiendo leer; al guardar se escribe el nuevo.
+#
+# Se lee por bloques de TAM_BLOQUE caracteres y cada bloque se parte en
+# columnas de una vez (un split para todo el bloque y int/float por columna),
+# sin recorrer fila por fila salvo para desescapar o para informar un error.
+#
+# datos.txt se escribe en UTF-8. Los archivos sin encabezado los escribía la
+# versión anterior con la codificación del sistema: si no son UTF-8 válido se
+# leen con locale.getpreferredencoding (ver codificacion).
+
+ENCABEZADO = "#INVENTARIO"
+VERSION = 2
+COLUMNAS = ("id_producto", "nombre", "cantidad", "precio")
+TAM_BLOQUE = 1 << 20
+FILAS_BLOQUE = 10000
+
+_ESCAPES = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+_DESESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+_RE_ESCAPE = re.compile(r"[\\\t\n\r]")
+_RE_DESESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def escapar(texto):
+    return _RE_ESCAPE.sub(lambda m: _ESCAPES[m.group()], texto)
+
+
+def desescapar(texto):
+    return _RE_DESESCAPE.sub(lambda m: _DESESCAPES.get(m.group(1), m.group(1)), texto)
+
+
+# ---------- Escritura ----------
+def escribir(f, productos):
+    """Escribe en `f` (abierto en modo texto) el encabezado y los productos."""
+    f.write("\t".join((f"{ENCABEZADO} {VERSION}",) + COLUMNAS) + "\n")
+    for i in range(0, len(productos), FILAS_BLOQUE):
+        bloque = productos[i:i + FILAS_BLOQUE]
+        texto = "".join([f"{p.id_producto}\t{p.nombre}\t{p.cantidad}\t{p.precio!r}\n" for p in bloque])
+        # Si el bloque tiene exactamente 3 tabuladores y un salto por fila, y ninguna "\" ni "\r",
+        # ningún campo necesita escaparse; si no, se arma fila por fila
+        if texto.count("\t") != 3 * len(bloque) or texto.count("\n") != len(bloque) \
+                or "\\" in texto or "\r" in texto:
+            texto = "".join([f"{escapar(p.id_producto)}\t{escapar(p.nombre)}\t{p.cantidad}\t{p.precio!r}\n"
+                             for p in bloque])
+        f.write(texto)
+
+
+# ---------- Lectura ----------
+def codificacion(ruta):
+    """Codificación con la que abrir `ruta`: UTF-8, o la del sistema para un archivo anterior que no lo es."""
+    with open(ruta, "rb") as f:
+        if f.read(len(ENCABEZADO)) == ENCABEZADO.encode("ascii"):
+            return "utf-8"
+        f.seek(0)
+        decodificador = codecs.getincrementaldecoder("utf-8")()
+        try:
+            for bloque in iter(lambda: f.read(TAM_BLOQUE), b""):
+                decodificador.decode(bloque)
+            decodificador.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return locale.getpreferredencoding(False)
+    return "utf-8"
+
+
+def leer(f):
+    """
+    Lee un archivo de inventario abierto en modo texto, de cualquier versión.
+    Devuelve, por cada bloque, cuatro listas paralelas: (ids, nombres, cantidades, precios).
+    Una fila mal formada produce ValueError con su número de línea.
+    """
+    primera = f.readline()
+    if not primera.startswith(ENCABEZADO):
+        yield from _leer_anterior(primera, f)
+        return
+    try:
+        version = int(primera[len(ENCABEZADO):].split("\t")[0])
+    except ValueError:
+        raise ValueError(f"Encabezado de inventario no válido: {primera.strip()!r}") from None
+    if version != VERSION:
+        raise ValueError(f"Versión de archivo de inventario no soportada: {version}")
+
+    linea = 2
+    resto = ""
+    while True:
+        bloque = f.read(TAM_BLOQUE)
+        if not bloque:
+            break
+        # Se procesa hasta el último salto de línea; lo que sigue va con el bloque siguiente
+        texto = resto + bloque
+        corte = texto.rfind("\n") + 1
+        texto, resto = texto[:corte], texto[corte:]
+        if texto:
+            yield _columnas(texto, linea)
+            linea += texto.count("\n")
+    if resto:
+        yield _columnas(resto + "\n", linea)
+
+
+def _columnas(texto, linea):
+    # Se parte solo por tabuladores: el precio de cada fila queda pegado al ID de la
+    # siguiente ("25.5\nA2") y esos campos se vuelven a partir por "\n" todos juntos
+    filas = texto.count("\n")
+    campos = texto.split("\t")
+    unidos = campos[3::3]
+    # El total de campos no basta: una fila de 5 y otra de 3 suman 8 y correrían las columnas.
+    # Están alineadas si cada campo unido tiene un salto (y entonces exactamente uno)
+    if len(campos) == 3 * filas + 1 and sum(map(operator.contains, unidos, itertools.repeat("\n"))) == filas:
+        partes = "\n".join(unidos).split("\n")  # precio, ID, precio, ID, ..., precio, ""
+        try:
+            columnas = ([campos[0]] + partes[1:-1:2], campos[1::3],
+                        list(map(int, campos[2::3])), list(map(float, partes[0::2])))
+        except ValueError:
+            pass
+        else:
+            if "\\" in texto:
+                columnas = ([desescapar(x) if "\\" in x else x for x in columnas[0]],
+                            [desescapar(x) if "\\" in x else x for x in columnas[1]],
+                            columnas[2], columnas[3])
+            return columnas
+    # Algo no encaja (línea vacía o mal formada): se revisa fila por fila
+    columnas = ([], [], [], [])
+    for n, fila in enumerate(texto[:-1].split("\n"), start=linea):
+        if fila:
+            _agregar_fila(columnas, fila.split("\t"), n, desescapar)
+    return columnas
+
+
+def _leer_anterior(primera, f):
+    # Formato anterior: id,nombre,cantidad,precio sin escapar. El nombre puede haber quedado
+    # con comas, así que se toma el primer campo y los dos últimos y el resto es el nombre
+    columnas = ([], [], [], [])
+    for n, fila in enumerate(itertools.chain([primera], f), start=1):
+        _agregar_fila_anterior(columnas, fila, n)
+        if len(columnas[0]) >= FILAS_BLOQUE:
+            yield columnas
+            columnas = ([], [], [], [])
+    yield columnas
+
+
+def _agregar_fila_anterior(columnas, fila, n):
+    fila = fila.strip()
+    if not fila:
+        return
+    idp, _, resto = fila.partition(",")
+    _agregar_fila(columnas, [idp] + resto.rsplit(",", 2), n, lambda x: x)
+
+
+def _agregar_fila(columnas, campos, n, convertir):
+    if len(campos) != 4:
+        raise ValueError(f"Línea {n}: se esperaban 4 campos y hay {len(campos)}")
+    try:
+        cantidad, precio = int(campos[2]), float(campos[3])
+    except ValueError:
+        raise ValueError(f"Línea {n}: cantidad o precio no válidos ({campos[2]!r}, {campos[3]!r})") from None
+    columnas[0].append(convertir(campos[0]))
+    columnas[1].append(convertir(campos[1]))
+    columnas[2].append(cantidad)
+    columnas[3].append(precio)
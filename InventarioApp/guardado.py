@@ -0,0 +1,75 @@
+import queue
+import threading
+
+# Segundos que se espera tras un cambio por si llegan más, para guardarlos juntos
+RETARDO_GUARDADO = 0.3
+
+
+class GuardadoDiferido:
+    """
+    Guarda en un hilo aparte para que la interfaz no espere al disco.
+    `pedir()` solo marca que hay cambios; el hilo espera RETARDO_GUARDADO,
+    llama una vez a `guardar` (que toma los datos en ese momento) y, si hubo
+    más cambios mientras escribía, vuelve a guardar. Los avisos para la
+    interfaz quedan en `avisos`: ("guardando", None), ("guardado", None) o
+    ("error", mensaje). Un guardado que falla se avisa y el hilo sigue; si el
+    hilo llegara a terminar por un error, `pedir` y `cerrar` lo informan con
+    RuntimeError en lugar de dejar cambios sin guardar en silencio.
+    """
+
+    def __init__(self, guardar, retardo=RETARDO_GUARDADO):
+        self.guardar = guardar
+        self.retardo = retardo
+        self.avisos = queue.Queue()
+        self.error = None           # mensaje del último guardado fallido
+        self.fallo = None           # motivo por el que terminó el hilo, si no fue cerrar()
+        self.pendiente = False
+        self.cerrado = False
+        self.condicion = threading.Condition()
+        self.hilo = threading.Thread(target=self.ejecutar, name="guardado-inventario", daemon=True)
+        self.hilo.start()
+
+    def pedir(self):
+        self.revisar_hilo()
+        with self.condicion:
+            self.pendiente = True
+            self.condicion.notify()
+
+    def revisar_hilo(self):
+        if self.fallo is not None or (not self.cerrado and not self.hilo.is_alive()):
+            raise RuntimeError(f"El hilo de guardado terminó: {self.fallo}")
+
+    def ejecutar(self):
+        try:
+            self.bucle()
+        except BaseException as e:
+            self.fallo = f"{type(e).__name__}: {e}"
+            self.avisos.put(("error", self.fallo))
+            raise
+
+    def bucle(self):
+        while True:
+            with self.condicion:
+                self.condicion.wait_for(lambda: self.pendiente or self.cerrado)
+                if not self.pendiente:
+                    return
+                # Se juntan los cambios que lleguen durante la espera (cerrar la corta)
+                self.condicion.wait_for(lambda: self.cerrado, self.retardo)
+                self.pendiente = False
+            self.avisos.put(("guardando", None))
+            try:
+                self.guardar()
+            except Exception as e:  # p. ej. OSError del disco o un dato que no se puede escribir
+                self.error = str(e) if isinstance(e, OSError) else f"{type(e).__name__}: {e}"
+                self.avisos.put(("error", self.error))
+            else:
+                self.error = None
+                self.avisos.put(("guardado", None))
+
+    def cerrar(self):
+        """Guarda lo pendiente y termina el hilo (se espera a que acabe)."""
+        with self.condicion:
+            self.cerrado = True
+            self.condicion.notify()
+        self.hilo.join()
+        self.revisar_hilo()
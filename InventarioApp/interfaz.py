@@ -1,17 +1,23 @@
+import queue
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import messagebox
 from inventario import Inventario
 from producto import Producto
+from tabla_virtual import TablaVirtual
 
 class InventarioApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Sistema de Gestión de Inventario - UEA")
         self.root.geometry("700x500")
-        self.root.bind("<Escape>", lambda e: self.root.destroy())
+        self.root.bind("<Escape>", lambda e: self.salir())
+        self.root.protocol("WM_DELETE_WINDOW", self.salir)
 
-        self.inventario = Inventario()
+        # Los cambios se guardan en un hilo aparte; la interfaz solo lee sus avisos
+        self.inventario = Inventario(guardar_en_segundo_plano=True)
         self.crear_interfaz()
+        self.inventario.suscribir(self.tabla.cambio)
+        self.revisar_guardado()
 
     def crear_interfaz(self):
         info = tk.Label(self.root, text="Estudiante: Jofre Castro\nCarrera: Ingeniería en TI\nParalelo: A", font=("Arial", 12))
@@ -23,42 +29,71 @@ class InventarioApp:
         tk.Button(frame_botones, text="Agregar Producto", command=self.agregar_producto).grid(row=0, column=0, padx=5)
         tk.Button(frame_botones, text="Modificar Producto", command=self.modificar_producto).grid(row=0, column=1, padx=5)
         tk.Button(frame_botones, text="Eliminar Producto", command=self.eliminar_producto).grid(row=0, column=2, padx=5)
-        tk.Button(frame_botones, text="Salir", command=self.root.quit).grid(row=0, column=3, padx=5)
+        tk.Button(frame_botones, text="Salir", command=self.salir).grid(row=0, column=3, padx=5)
 
         columnas = ("ID", "Nombre", "Cantidad", "Precio")
-        self.tabla = ttk.Treeview(self.root, columns=columnas, show="headings")
-        for col in columnas:
-            self.tabla.heading(col, text=col)
+        campos = ("id_producto", "nombre", "cantidad", "precio")
+        # Solo se crean filas de Tk para lo visible, aunque el inventario sea enorme
+        self.tabla = TablaVirtual(self.root, columnas, campos, self.inventario,
+                                  valores=self.valores_fila, clave=lambda p: p.id_producto)
         self.tabla.pack(pady=20, fill="both", expand=True)
+        self.estado = tk.Label(self.root, text="", anchor="w")
+        self.estado.pack(side="bottom", fill="x", padx=10)
         self.root.bind("<Delete>", lambda e: self.eliminar_producto())
 
         self.cargar_tabla()
 
     def cargar_tabla(self):
-        for item in self.tabla.get_children():
-            self.tabla.delete(item)
-        for p in self.inventario.mostrar_productos():
-            self.tabla.insert("", tk.END, values=(p.id_producto, p.nombre, p.cantidad, p.precio))
+        # Después de abrir, cada cambio llega a la tabla por Inventario.suscribir
+        self.tabla.refrescar()
+
+    def revisar_guardado(self):
+        while True:
+            try:
+                aviso, detalle = self.inventario.guardado.avisos.get_nowait()
+            except queue.Empty:
+                break
+            if aviso == "guardando":
+                self.estado.config(text="Guardando...", fg="black")
+            elif aviso == "guardado":
+                self.estado.config(text="Cambios guardados", fg="black")
+            else:
+                self.estado.config(text=f"Error al guardar: {detalle}", fg="red")
+        self.root.after(100, self.revisar_guardado)
+
+    def salir(self):
+        self.estado.config(text="Guardando...", fg="black")
+        self.root.update_idletasks()
+        try:
+            self.inventario.cerrar()
+        except RuntimeError as e:
+            messagebox.showerror("Error", f"No se pudieron guardar los cambios:\n{e}")
+        else:
+            if self.inventario.guardado.error:
+                messagebox.showerror("Error", f"No se pudieron guardar los cambios:\n{self.inventario.guardado.error}")
+        self.root.destroy()
+
+    def valores_fila(self, p):
+        return (p.id_producto, p.nombre, p.cantidad, p.precio)
 
     def agregar_producto(self):
         self.mostrar_formulario("Agregar Producto")
 
     def modificar_producto(self):
-        item = self.tabla.focus()
-        if not item:
+        producto = self.inventario.buscar_producto(self.tabla.seleccionado())
+        if producto is None:
             messagebox.showwarning("Atención", "Seleccione un producto para modificar.")
             return
-        valores = self.tabla.item(item, "values")
-        self.mostrar_formulario("Modificar Producto", valores)
+        self.mostrar_formulario("Modificar Producto", self.valores_fila(producto))
 
     def eliminar_producto(self):
-        item = self.tabla.focus()
-        if not item:
+        id_producto = self.tabla.seleccionado()
+        if id_producto is None:
             messagebox.showwarning("Atención", "Seleccione un producto para eliminar.")
             return
-        valores = self.tabla.item(item, "values")
-        self.inventario.eliminar_producto(valores[0])
-        self.cargar_tabla()
+        if not self.inventario.eliminar_producto(id_producto):
+            messagebox.showwarning("Atención", "El producto ya no existe.")
+            return
         messagebox.showinfo("Eliminado", "Producto eliminado correctamente.")
 
     def mostrar_formulario(self, titulo, valores=None):
@@ -94,11 +129,13 @@ class InventarioApp:
             precio = float(precio_entry.get())
 
             if valores:
-                self.inventario.modificar_producto(idp, nombre, cantidad, precio)
-            else:
-                self.inventario.agregar_producto(Producto(idp, nombre, cantidad, precio))
+                if not self.inventario.modificar_producto(idp, nombre, cantidad, precio):
+                    messagebox.showwarning("Atención", f"No existe un producto con ID {idp}.", parent=ventana)
+                    return
+            elif not self.inventario.agregar_producto(Producto(idp, nombre, cantidad, precio)):
+                messagebox.showwarning("Atención", f"Ya existe un producto con ID {idp}.", parent=ventana)
+                return
 
-            self.cargar_tabla()
             ventana.destroy()
 
         tk.Button(ventana, text="Guardar", command=guardar).grid(row=4, columnspan=2, pady=10)
@@ -1,39 +1,144 @@
+import gc
 import os
+import formato
 from producto import Producto
+from guardado import GuardadoDiferido
 
 class Inventario:
-    def __init__(self, archivo="datos.txt"):
+    def __init__(self, archivo="datos.txt", guardar_en_segundo_plano=False):
         self.archivo = archivo
-        self.productos = []
+        # id_producto -> Producto; el diccionario conserva el orden de alta
+        self.productos = {}
+        # Funciones avisadas de cada cambio: funcion(evento, producto), con evento
+        # "agregado", "modificado" o "eliminado"
+        self.observadores = []
+        # (campo, descendente) -> productos ordenados; se descartan con los cambios
+        self.indices_orden = {}
         self.cargar_desde_archivo()
+        # En segundo plano, cada cambio solo pide un guardado y un hilo escribe el archivo
+        self.guardado = GuardadoDiferido(self.guardar_en_archivo) if guardar_en_segundo_plano else None
+
+    def suscribir(self, funcion):
+        self.observadores.append(funcion)
+
+    def notificar(self, evento, producto):
+        # Los órdenes por campo se rehacen al pedirse; el de alta solo cambia al agregar
+        # (va al final) o eliminar, así que se conserva o se extiende antes de avisar
+        orden_alta = self.indices_orden.get((None, False))
+        self.indices_orden.clear()
+        if orden_alta is not None and evento != "eliminado":
+            if evento == "agregado":
+                orden_alta.append(producto)
+            self.indices_orden[(None, False)] = orden_alta
+        for funcion in self.observadores:
+            funcion(evento, producto)
 
     def agregar_producto(self, producto):
-        self.productos.append(producto)
-        self.guardar_en_archivo()
+        """Agrega el producto; devuelve False (sin cambiar nada) si su ID ya existe."""
+        if producto.id_producto in self.productos:
+            return False
+        self.productos[producto.id_producto] = producto
+        self.guardar()
+        self.notificar("agregado", producto)
+        return True
 
     def eliminar_producto(self, id_producto):
-        self.productos = [p for p in self.productos if p.id_producto != id_producto]
-        self.guardar_en_archivo()
+        producto = self.productos.pop(id_producto, None)
+        if producto is None:
+            return False
+        self.guardar()
+        self.notificar("eliminado", producto)
+        return True
 
     def modificar_producto(self, id_producto, nombre, cantidad, precio):
-        for p in self.productos:
-            if p.id_producto == id_producto:
-                p.set_nombre(nombre)
-                p.set_cantidad(cantidad)
-                p.set_precio(precio)
-        self.guardar_en_archivo()
+        p = self.productos.get(id_producto)
+        if p is None:
+            return False
+        p.set_nombre(nombre)
+        p.set_cantidad(cantidad)
+        p.set_precio(precio)
+        self.guardar()
+        self.notificar("modificado", p)
+        return True
+
+    def guardar(self):
+        if self.guardado is None:
+            self.guardar_en_archivo()
+        else:
+            self.guardado.pedir()
+
+    def cerrar(self):
+        """Termina de guardar los cambios pendientes."""
+        if self.guardado is not None:
+            self.guardado.cerrar()
 
     def mostrar_productos(self):
-        return self.productos
+        return list(self.productos.values())
+
+    def buscar_producto(self, id_producto):
+        return self.productos.get(id_producto)
+
+    def contar(self):
+        return len(self.productos)
+
+    def pagina(self, desde, cantidad, campo=None, descendente=False):
+        """Productos desde la posición `desde`, en orden de alta o por `campo` (atributo de Producto)."""
+        clave = (campo, descendente)
+        lista = self.indices_orden.get(clave)
+        if lista is None:
+            # Se arma una vez y las páginas siguientes solo recortan; orden de alta = orden del diccionario
+            if campo is None:
+                lista = list(reversed(self.productos.values())) if descendente else list(self.productos.values())
+            else:
+                lista = sorted(self.productos.values(), key=lambda p: getattr(p, campo), reverse=descendente)
+            self.indices_orden[clave] = lista
+        return lista[desde:desde + cantidad]
 
     def guardar_en_archivo(self):
-        with open(self.archivo, "w") as f:
-            for p in self.productos:
-                f.write(f"{p.id_producto},{p.nombre},{p.cantidad},{p.precio}\n")
+        # Copiar los valores es una sola operación, así que el hilo de guardado no los ve a medio
+        # cambiar; un producto modificado mientras se escribe queda bien en el guardado siguiente.
+        # Se escribe a un temporal y se reemplaza para no dejar el archivo cortado.
+        productos = list(self.productos.values())
+        temporal = self.archivo + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            formato.escribir(f, productos)
+        os.replace(temporal, self.archivo)
 
     def cargar_desde_archivo(self):
         if os.path.exists(self.archivo):
-            with open(self.archivo, "r") as f:
-                for linea in f:
-                    idp, nombre, cantidad, precio = linea.strip().split(",")
-                    self.productos.append(Producto(idp, nombre, int(cantidad), float(precio)))
+            # Crear muchos objetos seguidos dispara recolecciones de basura que no liberan nada
+            # y que son la mayor parte del tiempo de carga; se pausan mientras se lee
+            gc_activo = gc.isenabled()
+            gc.disable()
+            try:
+                cargados = self._leer_archivo(repetidos=False)
+                if cargados is None:
+                    cargados = self._leer_archivo(repetidos=True)
+            finally:
+                if gc_activo:
+                    gc.enable()
+            if not self.productos:
+                self.productos = cargados
+            else:
+                for p in cargados.values():
+                    self.productos.setdefault(p.id_producto, p)
+
+    def _leer_archivo(self, repetidos):
+        """
+        {ID: Producto} del archivo. Con repetidos=False cada bloque va directo al
+        diccionario y, si aparece un ID repetido, devuelve None para volver a leer
+        con repetidos=True, que como agregar_producto conserva el primero.
+        """
+        productos = {}
+        # Lee tanto el formato actual como el anterior separado por comas (ver formato.py)
+        with open(self.archivo, "r", encoding=formato.codificacion(self.archivo)) as f:
+            for ids, nombres, cantidades, precios in formato.leer(f):
+                if not repetidos:
+                    antes = len(productos)
+                    productos.update(zip(ids, map(Producto, ids, nombres, cantidades, precios)))
+                    if len(productos) - antes != len(ids):
+                        return None
+                    continue
+                for p in map(Producto, ids, nombres, cantidades, precios):
+                    productos.setdefault(p.id_producto, p)
+        return productos
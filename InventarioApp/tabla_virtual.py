@@ -0,0 +1,176 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Filas extra que se piden al inventario por encima y por debajo de las visibles,
+# para que desplazarse un poco no vuelva a consultar
+SOBREBARRIDO = 20
+ALTO_FILA = 20
+
+
+class TablaVirtual(ttk.Frame):
+    """
+    Tabla con desplazamiento virtual: el Treeview solo tiene tantas filas como
+    caben en pantalla y al desplazarse se reescriben sus valores con los
+    productos de esa posición, pedidos a `fuente`:
+      fuente.contar()                                   -> número de productos
+      fuente.pagina(desde, cantidad, campo, descendente) -> productos desde esa posición
+    Al hacer clic en un encabezado se ordena por esa columna (el orden lo
+    resuelve la fuente con un índice, no se reordenan filas de Tk).
+    """
+
+    def __init__(self, master, columnas, campos, fuente, valores, clave):
+        super().__init__(master)
+        self.columnas = columnas
+        self.campos = dict(zip(columnas, campos))
+        self.fuente = fuente
+        self.valores = valores      # producto -> tupla de valores de la fila
+        self.clave = clave          # producto -> identificador único
+        self.desde = 0
+        self.total = 0
+        self.filas_visibles = 1
+        self.orden = None
+        self.descendente = False
+        self.seleccion = None       # clave del producto seleccionado
+        self.items = []             # filas de Tk reutilizadas
+        self.visibles = {}          # clave -> item de Tk que la muestra
+        self.productos_visibles = []
+        self.cache = None           # (desde, orden, descendente, productos)
+
+        self.tabla = ttk.Treeview(self, columns=columnas, show="headings", selectmode="browse", height=1)
+        for col in columnas:
+            self.tabla.heading(col, text=col, command=lambda c=col: self.ordenar_por(c))
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self.desplazar)
+        self.tabla.pack(side="left", fill="both", expand=True)
+        self.barra.pack(side="right", fill="y")
+
+        self.tabla.bind("<Configure>", self.ajustar_tamano)
+        self.tabla.bind("<<TreeviewSelect>>", self.al_seleccionar)
+        self.tabla.bind("<MouseWheel>", lambda e: self.mover(-1 if e.delta > 0 else 1, "units"))
+        self.tabla.bind("<Button-4>", lambda e: self.mover(-1, "units"))
+        self.tabla.bind("<Button-5>", lambda e: self.mover(1, "units"))
+        self.tabla.bind("<Prior>", lambda e: self.mover(-1, "pages"))
+        self.tabla.bind("<Next>", lambda e: self.mover(1, "pages"))
+        self.tabla.bind("<Up>", lambda e: self.mover_seleccion(-1))
+        self.tabla.bind("<Down>", lambda e: self.mover_seleccion(1))
+
+    # ---------- Desplazamiento ----------
+    def ajustar_tamano(self, evento):
+        alto_fila = int(ttk.Style().lookup("Treeview", "rowheight") or ALTO_FILA)
+        filas = max(1, (evento.height - alto_fila) // alto_fila)  # menos el encabezado
+        if filas != self.filas_visibles:
+            self.filas_visibles = filas
+            self.tabla.configure(height=filas)
+            self.refrescar()
+
+    def desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra: ("moveto", fracción) o ("scroll", n, "units"/"pages")."""
+        if accion == "moveto":
+            self.ir_a(int(float(cantidad) * self.total))
+        else:
+            self.mover(int(cantidad), unidad)
+
+    def mover(self, n, unidad):
+        paso = self.filas_visibles if unidad == "pages" else 3
+        self.ir_a(self.desde + n * paso)
+        return "break"
+
+    def ir_a(self, desde):
+        desde = max(0, min(desde, self.total - self.filas_visibles))
+        if desde != self.desde:
+            self.desde = desde
+            self.refrescar(contar=False)
+
+    def mover_seleccion(self, n):
+        posiciones = [self.clave(p) for p in self.productos_visibles]
+        if self.seleccion in posiciones:
+            i = posiciones.index(self.seleccion) + n
+        else:
+            i = 0 if n > 0 else len(posiciones) - 1
+        if i < 0:
+            self.ir_a(self.desde - 1)
+            i = 0
+        elif i >= len(posiciones):
+            self.ir_a(self.desde + 1)
+            i = len(self.productos_visibles) - 1
+        if self.productos_visibles:
+            self.seleccion = self.clave(self.productos_visibles[i])
+            self.marcar_seleccion()
+        return "break"
+
+    # ---------- Datos ----------
+    def productos(self, desde, cantidad):
+        """Productos de la ventana pedida, usando la ventana ampliada ya consultada si la contiene."""
+        if self.cache is not None:
+            inicio, orden, descendente, productos = self.cache
+            if (orden, descendente) == (self.orden, self.descendente) and inicio <= desde \
+                    and desde + cantidad <= inicio + len(productos):
+                return productos[desde - inicio:desde - inicio + cantidad]
+        inicio = max(0, desde - SOBREBARRIDO)
+        productos = self.fuente.pagina(inicio, cantidad + 2 * SOBREBARRIDO, self.orden, self.descendente)
+        self.cache = (inicio, self.orden, self.descendente, productos)
+        return productos[desde - inicio:desde - inicio + cantidad]
+
+    def refrescar(self, contar=True):
+        if contar:
+            self.total = self.fuente.contar()
+            self.cache = None
+            self.desde = max(0, min(self.desde, self.total - self.filas_visibles))
+        self.productos_visibles = self.productos(self.desde, self.filas_visibles)
+        # Solo se crean o borran filas de Tk si cambió cuántas se ven
+        while len(self.items) < len(self.productos_visibles):
+            self.items.append(self.tabla.insert("", tk.END, values=()))
+        while len(self.items) > len(self.productos_visibles):
+            self.tabla.delete(self.items.pop())
+        self.visibles = {}
+        for item, p in zip(self.items, self.productos_visibles):
+            self.tabla.item(item, values=self.valores(p))
+            self.visibles[self.clave(p)] = item
+        self.marcar_seleccion()
+        if self.total:
+            self.barra.set(self.desde / self.total, min(1.0, (self.desde + len(self.items)) / self.total))
+        else:
+            self.barra.set(0.0, 1.0)
+
+    def cambio(self, evento, producto):
+        """Para Inventario.suscribir: una modificación visible toca una fila; lo demás corre posiciones."""
+        item = self.visibles.get(self.clave(producto))
+        if evento == "modificado" and item is not None and self.orden is None:
+            self.tabla.item(item, values=self.valores(producto))
+            self.cache = None
+            return
+        if evento == "eliminado" and self.clave(producto) == self.seleccion:
+            self.seleccion = None
+        self.refrescar()
+
+    # ---------- Orden y selección ----------
+    def ordenar_por(self, columna):
+        campo = self.campos[columna]
+        if self.orden == campo:
+            self.descendente = not self.descendente
+        else:
+            self.orden, self.descendente = campo, False
+        for col in self.columnas:
+            marca = (" ▼" if self.descendente else " ▲") if self.campos[col] == campo else ""
+            self.tabla.heading(col, text=col + marca)
+        self.desde = 0
+        self.refrescar()
+
+    def al_seleccionar(self, evento):
+        elegidos = self.tabla.selection()
+        if elegidos:
+            for clave, item in self.visibles.items():
+                if item == elegidos[0]:
+                    self.seleccion = clave
+                    break
+
+    def marcar_seleccion(self):
+        item = self.visibles.get(self.seleccion)
+        if item is None:
+            self.tabla.selection_set(())
+        elif self.tabla.selection() != (item,):
+            self.tabla.selection_set(item)
+            self.tabla.focus(item)
+
+    def seleccionado(self):
+        """Clave del producto seleccionado (aunque ya no esté a la vista) o None."""
+        return self.seleccion
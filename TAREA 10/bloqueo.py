@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bloqueo entre procesos para el archivo de inventario
+----------------------------------------------------
+- Bloqueo consultivo (fcntl.flock) sobre un archivo auxiliar `<ruta>.lock`, así
+  el inventario se puede reemplazar con os.replace sin perder el bloqueo.
+- Reentrante dentro del proceso: los hilos comparten un contador de profundidad
+  y solo el primer `adquirir` toca el archivo.
+- La espera tiene un tiempo máximo; al agotarse se lanza `BloqueoOcupado`.
+- En plataformas sin fcntl (Windows) solo se sincronizan los hilos del proceso.
+"""
+
+from __future__ import annotations
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+ESPERA_BLOQUEO = 10.0
+_INTERVALO_REINTENTO = 0.05
+
+
+class BloqueoOcupado(Exception):
+    """Otro proceso retiene el bloqueo de `ruta` más allá del tiempo de espera."""
+
+    def __init__(self, ruta: str, espera: float) -> None:
+        super().__init__(f"'{ruta}' está bloqueado por otro proceso (se esperó {espera:g} s).")
+        self.ruta = ruta
+        self.espera = espera
+
+
+class BloqueoArchivo:
+    def __init__(self, ruta: str, espera: float = ESPERA_BLOQUEO) -> None:
+        self.ruta = ruta
+        self.espera = espera
+        self._hilos = threading.RLock()
+        self._profundidad = 0
+        self._fd: Optional[int] = None
+
+    @property
+    def retenido(self) -> bool:
+        return self._profundidad > 0
+
+    def adquirir(self, espera: Optional[float] = None) -> None:
+        """Toma el bloqueo exclusivo; lanza BloqueoOcupado si no llega a tiempo."""
+        espera = self.espera if espera is None else espera
+        limite = time.monotonic() + espera
+        if not self._hilos.acquire(timeout=max(espera, 0.0)):
+            raise BloqueoOcupado(self.ruta, espera)
+        try:
+            if self._profundidad == 0 and fcntl is not None:
+                self._bloquear_archivo(limite, espera)
+        except BaseException:
+            self._hilos.release()
+            raise
+        self._profundidad += 1
+
+    def _bloquear_archivo(self, limite: float, espera: float) -> None:
+        fd = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= limite:
+                        raise BloqueoOcupado(self.ruta, espera)
+                    time.sleep(_INTERVALO_REINTENTO)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def liberar(self) -> None:
+        if self._profundidad == 0:
+            raise RuntimeError(f"El bloqueo '{self.ruta}' no está retenido.")
+        self._profundidad -= 1
+        if self._profundidad == 0 and self._fd is not None:
+            # Cerrar el descriptor libera el flock
+            os.close(self._fd)
+            self._fd = None
+        self._hilos.release()
+
+    @contextmanager
+    def retener(self, espera: Optional[float] = None) -> Iterator[None]:
+        self.adquirir(espera)
+        try:
+            yield
+        finally:
+            self.liberar()
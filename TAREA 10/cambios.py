@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Flujo de cambios del inventario (change data capture)
+-----------------------------------------------------
+Cada cambio confirmado (agregar, actualizar, eliminar) se publica como un
+evento: el registro del diario más un número de secuencia, la versión del
+archivo y la hora. Así cachés, índices o exportadores consumen solo los deltas
+en lugar de releer todo el inventario.
+
+- BufferCambios: anillo en memoria (deque con capacidad fija) con los últimos
+  eventos. `leer_desde` devuelve lo posterior a una secuencia e indica si el
+  anillo ya descartó eventos; `suscribir` entrega lotes a una función desde un
+  hilo propio, sin frenar a quien modifica el inventario.
+- RegistroCambios: los mismos eventos agregados como líneas JSON a un archivo
+  (inventario.json.cambios) para que otro proceso los siga.
+- SeguidorCambios: lee ese archivo por lotes desde un punto de control
+  (desplazamiento + secuencia, guardado de forma atómica) y espera nuevas líneas
+  sin volver a leer lo ya procesado.
+"""
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CAPACIDAD_BUFFER = 10000
+TAM_LOTE = 1000
+INTERVALO_SONDEO = 0.2
+
+Evento = Dict
+
+
+def _serializar(evento: Evento) -> bytes:
+    return json.dumps(evento, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def crear_eventos(registros: Iterable[Dict], primera_secuencia: int, version: int) -> List[Evento]:
+    momento = time.time()
+    return [
+        {"secuencia": s, "version": version, "momento": momento, **registro}
+        for s, registro in enumerate(registros, start=primera_secuencia)
+    ]
+
+
+# ---------------------- En memoria ----------------------
+class BufferCambios:
+    def __init__(self, capacidad: int = CAPACIDAD_BUFFER) -> None:
+        self._eventos: Deque[Evento] = deque(maxlen=capacidad)
+        self._cond = threading.Condition()
+        self.secuencia = 0  # la del último evento publicado
+
+    def publicar(self, eventos: List[Evento]) -> None:
+        if not eventos:
+            return
+        with self._cond:
+            self._eventos.extend(eventos)
+            self.secuencia = eventos[-1]["secuencia"]
+            self._cond.notify_all()
+
+    def leer_desde(self, secuencia: int, maximo: int = TAM_LOTE) -> Tuple[List[Evento], int]:
+        """
+        Hasta `maximo` eventos con secuencia mayor que `secuencia` y cuántos se
+        perdieron porque el anillo ya los descartó (0 si no faltó ninguno).
+        """
+        with self._cond:
+            if not self._eventos or self._eventos[-1]["secuencia"] <= secuencia:
+                return [], 0
+            primera = self._eventos[0]["secuencia"]
+            perdidos = max(0, primera - secuencia - 1)
+            # Con el archivo de cambios compartido la secuencia puede saltar (eventos de otros procesos),
+            # así que no se calcula la posición: se retrocede desde el final, donde suele estar el lector
+            inicio = len(self._eventos)
+            while inicio > 0 and self._eventos[inicio - 1]["secuencia"] > secuencia:
+                inicio -= 1
+            fin = min(inicio + maximo, len(self._eventos))
+            return [self._eventos[i] for i in range(inicio, fin)], perdidos
+
+    def esperar(self, secuencia: int, tiempo: Optional[float] = None) -> bool:
+        """Espera a que haya eventos posteriores a `secuencia`; False si venció el tiempo."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.secuencia > secuencia, tiempo)
+
+    def suscribir(self, funcion: Callable[[List[Evento]], None], tam_lote: int = TAM_LOTE,
+                  desde: Optional[int] = None) -> "Suscripcion":
+        """Entrega a `funcion` lotes de eventos nuevos desde un hilo aparte (por defecto desde ahora)."""
+        return Suscripcion(self, funcion, tam_lote, self.secuencia if desde is None else desde)
+
+
+class Suscripcion:
+    def __init__(self, buffer: BufferCambios, funcion: Callable[[List[Evento]], None],
+                 tam_lote: int, desde: int) -> None:
+        self.secuencia = desde
+        self.perdidos = 0  # eventos descartados por el anillo antes de entregarse
+        self.error: Optional[BaseException] = None
+        self._buffer = buffer
+        self._funcion = funcion
+        self._tam_lote = tam_lote
+        self._detenida = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="suscripcion-cambios", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self) -> None:
+        while not self._detenida.is_set():
+            if not self._buffer.esperar(self.secuencia, INTERVALO_SONDEO):
+                continue
+            lote, perdidos = self._buffer.leer_desde(self.secuencia, self._tam_lote)
+            self.perdidos += perdidos
+            if not lote:
+                continue
+            try:
+                self._funcion(lote)
+            except BaseException as e:  # la suscripción se detiene; el inventario sigue
+                self.error = e
+                return
+            self.secuencia = lote[-1]["secuencia"]
+
+    def detener(self) -> None:
+        self._detenida.set()
+        if self._hilo is not threading.current_thread():
+            self._hilo.join()
+
+
+# ---------------------- En archivo ----------------------
+class RegistroCambios:
+    """Archivo de eventos de solo agregado. Quien escribe debe tener tomado el bloqueo del inventario."""
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta = ruta
+        self._f = open(ruta, "ab")
+        self._tamano = -1
+        self.secuencia = 0
+        # Una escritura cortada por una caída deja una línea sin terminar: se cierra para no pegarle la siguiente
+        if self._f.tell() > 0:
+            with open(ruta, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._f.write(b"\n")
+                    self._f.flush()
+
+    def siguiente_secuencia(self) -> int:
+        # Otro proceso pudo agregar eventos: si el tamaño cambió, se relee la última secuencia
+        tamano = os.fstat(self._f.fileno()).st_size
+        if tamano != self._tamano:
+            self.secuencia = ultima_secuencia(self.ruta)
+            self._tamano = tamano
+        return self.secuencia + 1
+
+    def escribir(self, eventos: List[Evento]) -> None:
+        if not eventos:
+            return
+        self._f.write(b"".join(_serializar(e) for e in eventos))
+        self._f.flush()
+        self.secuencia = eventos[-1]["secuencia"]
+        self._tamano = os.fstat(self._f.fileno()).st_size
+
+    def cerrar(self) -> None:
+        self._f.close()
+
+
+def ultima_secuencia(ruta: str, tam_cola: int = 1 << 16) -> int:
+    """Secuencia del último evento completo del archivo (0 si no hay)."""
+    try:
+        with open(ruta, "rb") as f:
+            tamano = f.seek(0, os.SEEK_END)
+            while True:
+                inicio = max(0, tamano - tam_cola)
+                f.seek(inicio)
+                lineas = f.read(tamano - inicio).split(b"\n")
+                # La última pieza está incompleta (o vacía); la primera puede estar cortada
+                completas = lineas[:-1] if inicio == 0 else lineas[1:-1]
+                for linea in reversed(completas):
+                    try:
+                        return int(json.loads(linea)["secuencia"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                if inicio == 0:
+                    return 0
+                tam_cola *= 4
+    except FileNotFoundError:
+        return 0
+
+
+class SeguidorCambios:
+    """
+    Sigue un archivo de eventos desde el último punto de control:
+
+        seguidor = SeguidorCambios("inventario.json.cambios", "exportador.control")
+        for lote in seguidor.lotes():
+            procesar(lote)
+            seguidor.confirmar()
+
+    Solo se entregan líneas completas; una escritura a medias se lee en la vuelta siguiente.
+    """
+
+    def __init__(self, ruta: str, ruta_control: Optional[str] = None, tam_lote: int = TAM_LOTE) -> None:
+        self.ruta = ruta
+        self.ruta_control = ruta_control
+        self.tam_lote = tam_lote
+        self.desplazamiento = 0
+        self.secuencia = 0
+        self.descartadas = 0  # líneas ilegibles saltadas (restos de una escritura cortada)
+        self._pendiente: Optional[Tuple[int, int]] = None
+        if ruta_control is not None:
+            try:
+                with open(ruta_control, "r", encoding="utf-8") as f:
+                    control = json.load(f)
+                self.desplazamiento = int(control["desplazamiento"])
+                self.secuencia = int(control["secuencia"])
+            except FileNotFoundError:
+                pass
+
+    def leer_lote(self) -> List[Evento]:
+        """Hasta `tam_lote` eventos nuevos (lista vacía si no hay). Avanza al llamar a `confirmar`."""
+        desplazamiento, secuencia = self._pendiente or (self.desplazamiento, self.secuencia)
+        try:
+            with open(self.ruta, "rb") as f:
+                if f.seek(0, os.SEEK_END) < desplazamiento:
+                    raise ValueError(f"'{self.ruta}' es más corto que el punto de control (¿se reemplazó?).")
+                f.seek(desplazamiento)
+                eventos: List[Evento] = []
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break  # escritura en curso
+                    desplazamiento += len(linea)
+                    try:
+                        evento = json.loads(linea)
+                        evento["secuencia"]
+                    except (ValueError, KeyError, TypeError):
+                        self.descartadas += 1
+                        continue
+                    if evento["secuencia"] > secuencia:
+                        eventos.append(evento)
+                        secuencia = evento["secuencia"]
+                        if len(eventos) >= self.tam_lote:
+                            break
+        except FileNotFoundError:
+            return []
+        self._pendiente = (desplazamiento, secuencia)
+        return eventos
+
+    def confirmar(self) -> None:
+        """Marca como procesado lo leído y guarda el punto de control (tmp + os.replace)."""
+        if self._pendiente is None:
+            return
+        self.desplazamiento, self.secuencia = self._pendiente
+        self._pendiente = None
+        if self.ruta_control is None:
+            return
+        tmp = self.ruta_control + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"desplazamiento": self.desplazamiento, "secuencia": self.secuencia}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.ruta_control)
+
+    def lotes(self, seguir: bool = True, intervalo: float = INTERVALO_SONDEO,
+              detener: Optional[threading.Event] = None) -> Iterator[List[Evento]]:
+        """
+        Lotes de eventos nuevos. Con `seguir` espera más eventos (hasta que se
+        active `detener`); si no, termina al llegar al final del archivo. Lo no
+        confirmado se vuelve a entregar en la próxima ejecución.
+        """
+        while detener is None or not detener.is_set():
+            lote = self.leer_lote()
+            if lote:
+                yield lote
+                continue
+            if not seguir:
+                return
+            if detener is not None:
+                detener.wait(intervalo)
+            else:
+                time.sleep(intervalo)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generador de carga para servicio.py
+-----------------------------------
+Abre --clientes conexiones y cada una envía --peticiones peticiones, una tras
+otra (espera la respuesta antes de mandar la siguiente). Una fracción
+--escrituras son altas y cambios de cantidad sobre productos propios del
+cliente; el resto son lecturas por id y por nombre. Al final informa
+peticiones/s, latencias p50/p99/máxima por tipo de operación (solo de las
+peticiones respondidas) y cuántas conexiones o peticiones fallaron.
+
+Uso:
+- python carga_servicio.py
+- python carga_servicio.py --clientes 100 --peticiones 500 --escrituras 0.2
+- python carga_servicio.py --unix /tmp/inventario.sock
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List
+
+from servicio import HOST, PUERTO
+
+_PALABRAS = ("teclado", "mouse", "monitor", "cable", "cargador", "disco", "memoria", "router")
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+async def cliente(n: int, args: argparse.Namespace, latencias: Dict[str, List[float]], errores: List[str]) -> None:
+    if args.unix:
+        lector, escritor = await asyncio.open_unix_connection(args.unix)
+    else:
+        lector, escritor = await asyncio.open_connection(args.host, args.puerto)
+    rnd = random.Random(args.semilla + n)
+    propios: List[str] = []
+    try:
+        for i in range(args.peticiones):
+            if rnd.random() < args.escrituras or not propios:
+                if propios and rnd.random() < 0.5:
+                    tipo = "actualizar"
+                    peticion = {"op": "actualizar", "id_producto": rnd.choice(propios), "cantidad": rnd.randrange(500)}
+                else:
+                    tipo = "agregar"
+                    id_ = f"{args.prefijo}{n}-{i}"
+                    nombre = f"{rnd.choice(_PALABRAS)} {rnd.randrange(1000)}"
+                    peticion = {"op": "agregar", "producto": {"id": id_, "nombre": nombre,
+                                                              "cantidad": rnd.randrange(500), "precio": 1.5}}
+                    propios.append(id_)
+            elif rnd.random() < 0.5:
+                tipo = "buscar_id"
+                peticion = {"op": "buscar_id", "id_producto": rnd.choice(propios)}
+            else:
+                tipo = "buscar_nombre"
+                peticion = {"op": "buscar_nombre", "texto": f"{rnd.choice(_PALABRAS)} {rnd.randrange(1000)}", "limite": 20}
+            peticion["id"] = i
+            inicio = time.perf_counter()
+            escritor.write(json.dumps(peticion).encode("utf-8") + b"\n")
+            await escritor.drain()
+            linea = await lector.readline()
+            if not linea:
+                errores.append(f"cliente {n}: el servicio cerró la conexión")
+                return
+            latencias.setdefault(tipo, []).append(time.perf_counter() - inicio)
+            respuesta = json.loads(linea)
+            if not respuesta.get("ok") and tipo != "buscar_id":
+                errores.append(f"cliente {n}: {respuesta.get('mensaje')}")
+    finally:
+        escritor.close()
+
+
+async def ejecutar(args: argparse.Namespace) -> int:
+    latencias: Dict[str, List[float]] = {}
+    errores: List[str] = []
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(
+        *(cliente(n, args, latencias, errores) for n in range(args.clientes)), return_exceptions=True
+    )
+    total_s = time.perf_counter() - inicio
+    fallidas = [r for r in resultados if isinstance(r, OSError)]  # conexión rechazada, socket inexistente...
+    errores += [f"{type(r).__name__}: {r}" for r in resultados if isinstance(r, BaseException)]
+
+    todas = sorted(x for lista in latencias.values() for x in lista)
+    print(f"{len(todas)} peticiones respondidas de {args.clientes - len(fallidas)}/{args.clientes} clientes "
+          f"en {total_s:.2f} s ({len(todas) / total_s:,.0f} pet/s)")
+    print(f"{'operación':<15}{'n':>8}{'p50 ms':>10}{'p99 ms':>10}{'máx ms':>10}")
+    for tipo, valores in sorted(latencias.items()) + [("total", todas)]:
+        v = sorted(valores)
+        if not v:
+            print(f"{tipo:<15}{0:>8}{'sin respuestas':>30}")
+            continue
+        print(f"{tipo:<15}{len(v):>8}{percentil(v, 50) * 1000:>10.2f}{percentil(v, 99) * 1000:>10.2f}{v[-1] * 1000:>10.2f}")
+    if errores:
+        print(f"❌ {len(errores)} errores ({len(fallidas)} conexiones fallidas); primero: {errores[0]}")
+        return 1
+    return 0
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generador de carga para servicio.py")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--unix", default=None, help="conectarse a un socket Unix en lugar de TCP")
+    parser.add_argument("--clientes", type=int, default=20)
+    parser.add_argument("--peticiones", type=int, default=200, help="peticiones por cliente")
+    parser.add_argument("--escrituras", type=float, default=0.1, help="fracción de escrituras (0 a 1)")
+    parser.add_argument("--semilla", type=int, default=12345)
+    parser.add_argument("--prefijo", default=f"carga{int(time.time())}-",
+                        help="prefijo de los ids creados (por defecto distinto en cada corrida)")
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(ejecutar(crear_parser().parse_args())))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diario de escritura anticipada (write-ahead log) para el inventario
+--------------------------------------------------------------------
+- Cada mutación se agrega como una línea JSON compacta al final del archivo.
+- Un hilo en segundo plano agrupa los fsync (group commit): varias escrituras
+  pendientes se hacen durables con una sola llamada a os.fsync.
+- `leer` recorre los registros válidos y detecta un último registro truncado
+  (p. ej. por un corte de energía a mitad de escritura).
+"""
+
+from __future__ import annotations
+import json
+import os
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+TAM_BLOQUE_ESCRITURA = 1 << 20
+
+
+class DiarioCorrupto(Exception):
+    """El diario contiene un registro ilegible a partir de `desplazamiento` bytes."""
+
+    def __init__(self, ruta: str, desplazamiento: int, registros_validos: int) -> None:
+        super().__init__(
+            f"Registro ilegible en '{ruta}' (byte {desplazamiento}, tras {registros_validos} registros válidos)."
+        )
+        self.ruta = ruta
+        self.desplazamiento = desplazamiento
+        self.registros_validos = registros_validos
+
+
+def _serializar(registro: Dict) -> bytes:
+    return json.dumps(registro, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class Diario:
+    def __init__(self, ruta: str, intervalo_fsync: float = 0.0) -> None:
+        """
+        Abre (o crea) el diario en modo de solo agregado.
+        Las escrituras que llegan mientras un fsync está en curso se sincronizan
+        juntas en el siguiente; `intervalo_fsync` (segundos) agrega una ventana
+        extra de espera para agrupar más a costa de latencia.
+        """
+        self.ruta = ruta
+        self.intervalo_fsync = intervalo_fsync
+        self.num_registros = self.contar_registros(ruta)
+        self._f = open(ruta, "ab")
+        self._cond = threading.Condition()
+        self._escritos = 0
+        self._sincronizados = 0
+        self._error: Optional[OSError] = None
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._bucle_fsync, name="diario-fsync", daemon=True)
+        self._hilo.start()
+
+    # ---------------------- Escritura ----------------------
+    def registrar(self, registros: Iterable[Dict], durable: bool = True) -> None:
+        """
+        Agrega los registros al diario. Si `durable` es True, espera a que el
+        fsync que los cubre haya terminado. Lanza OSError si la escritura falla.
+        """
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            if self._cerrado:
+                raise OSError(f"El diario '{self.ruta}' está cerrado.")
+            inicio = self._f.tell()
+            escritos = 0
+            try:
+                # Por bloques, para no armar en memoria lotes enormes (importaciones)
+                bloque: List[bytes] = []
+                tam = 0
+                for r in registros:
+                    linea = _serializar(r)
+                    bloque.append(linea)
+                    tam += len(linea)
+                    if tam >= TAM_BLOQUE_ESCRITURA:
+                        self._f.write(b"".join(bloque))
+                        escritos += len(bloque)
+                        bloque, tam = [], 0
+                if bloque:
+                    self._f.write(b"".join(bloque))
+                    escritos += len(bloque)
+                if not escritos:
+                    return
+                self._f.flush()
+            except OSError:
+                # No dejar medio registro al final del archivo
+                try:
+                    self._f.truncate(inicio)
+                    self._f.seek(inicio)
+                except OSError:
+                    pass
+                raise
+            self.num_registros += escritos
+            self._escritos += 1
+            objetivo = self._escritos
+            self._cond.notify_all()
+            if durable:
+                while self._sincronizados < objetivo and self._error is None:
+                    self._cond.wait()
+                if self._error is not None:
+                    raise self._error
+
+    def sincronizar(self) -> None:
+        """Espera a que todo lo escrito hasta ahora sea durable."""
+        with self._cond:
+            objetivo = self._escritos
+            while self._sincronizados < objetivo and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+
+    def _bucle_fsync(self) -> None:
+        while True:
+            with self._cond:
+                while self._sincronizados == self._escritos and not self._cerrado:
+                    self._cond.wait()
+                if self._cerrado and self._sincronizados == self._escritos:
+                    return
+            # Ventana de agrupación: deja llegar más escrituras antes del fsync
+            if self.intervalo_fsync > 0:
+                threading.Event().wait(self.intervalo_fsync)
+            with self._cond:
+                objetivo = self._escritos
+                fd = self._f.fileno()
+            try:
+                os.fsync(fd)
+            except OSError as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._sincronizados = max(self._sincronizados, objetivo)
+                self._cond.notify_all()
+
+    # ---------------------- Rotación y cierre ----------------------
+    def rotar(self, destino: str) -> None:
+        """
+        Mueve el contenido actual a `destino` y continúa con un diario vacío.
+        Se usa para compactar: el segmento rotado se pliega en la instantánea.
+        """
+        with self._cond:
+            while self._sincronizados < self._escritos and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+            self._f.close()
+            os.replace(self.ruta, destino)
+            self._f = open(self.ruta, "ab")
+            self.num_registros = 0
+
+    def cerrar(self) -> None:
+        with self._cond:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            self._cond.notify_all()
+        self._hilo.join()
+        self._f.close()
+
+    # ---------------------- Lectura ----------------------
+    @staticmethod
+    def leer(ruta: str) -> Iterator[Dict]:
+        """
+        Genera los registros del diario en orden. Si encuentra un registro
+        truncado o ilegible lanza DiarioCorrupto después de entregar todos los
+        registros válidos anteriores.
+        """
+        if not os.path.exists(ruta):
+            return
+        desplazamiento = 0
+        validos = 0
+        with open(ruta, "rb") as f:
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    raise DiarioCorrupto(ruta, desplazamiento, validos)
+                try:
+                    registro = json.loads(linea)
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    raise DiarioCorrupto(ruta, desplazamiento, validos)
+                if not isinstance(registro, dict):
+                    raise DiarioCorrupto(ruta, desplazamiento, validos)
+                yield registro
+                desplazamiento += len(linea)
+                validos += 1
+
+    @staticmethod
+    def contar_registros(ruta: str) -> int:
+        if not os.path.exists(ruta):
+            return 0
+        total = 0
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                total += bloque.count(b"\n")
+        return total
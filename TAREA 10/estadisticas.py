@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estadísticas agregadas del inventario mantenidas en cada cambio
+---------------------------------------------------------------
+Responde "cuántos productos", "unidades en stock", "valor total", "precio
+promedio", precio mínimo/máximo y un histograma de precios sin recorrer el
+catálogo:
+- conteo y sumas se ajustan en O(1) por alta, baja o modificación; las sumas de
+  flotantes son compensadas (Neumaier) para que restar no acumule error;
+- mínimo y máximo usan montículos con borrado perezoso: un precio que ya no
+  existe se descarta recién cuando llega a la cima (O(log n) amortizado);
+- el histograma cuenta productos por tramo de precio (LIMITES_HISTOGRAMA).
+
+`verificar` recalcula todo con un recorrido completo y lista las diferencias.
+"""
+
+from __future__ import annotations
+import heapq
+import math
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LIMITES_HISTOGRAMA: Tuple[float, ...] = (1, 5, 10, 50, 100, 500, 1000)
+
+
+class SumaCompensada:
+    """Suma de flotantes con compensación de Neumaier; admite sumandos negativos."""
+
+    __slots__ = ("_suma", "_error")
+
+    def __init__(self) -> None:
+        self._suma = 0.0
+        self._error = 0.0
+
+    def agregar(self, x: float) -> None:
+        t = self._suma + x
+        if abs(self._suma) >= abs(x):
+            self._error += (self._suma - t) + x
+        else:
+            self._error += (x - t) + self._suma
+        self._suma = t
+
+    @property
+    def valor(self) -> float:
+        return self._suma + self._error
+
+
+class Estadisticas:
+    def __init__(self, limites: Sequence[float] = LIMITES_HISTOGRAMA) -> None:
+        self.limites = tuple(limites)
+        self.productos = 0
+        self.unidades = 0
+        self._valor = SumaCompensada()
+        self._precios = SumaCompensada()
+        self._histograma = [0] * (len(self.limites) + 1)
+        # precio -> cuántos productos lo tienen; los montículos pueden tener precios ya ausentes
+        self._conteo_precios: Dict[float, int] = {}
+        self._minimos: List[float] = []
+        self._maximos: List[float] = []  # negados
+
+    @classmethod
+    def construir(cls, productos: Iterable[Any], limites: Sequence[float] = LIMITES_HISTOGRAMA) -> "Estadisticas":
+        est = cls(limites)
+        for p in productos:
+            est.agregar(p)
+        return est
+
+    # ---------------------- Mantenimiento ----------------------
+    def agregar(self, producto: Any) -> None:
+        self._ajustar(producto, 1)
+        n = self._conteo_precios.get(producto.precio, 0)
+        self._conteo_precios[producto.precio] = n + 1
+        if n == 0:
+            heapq.heappush(self._minimos, producto.precio)
+            heapq.heappush(self._maximos, -producto.precio)
+            if len(self._minimos) > 2 * len(self._conteo_precios) + 32:
+                self._reconstruir_monticulos()
+
+    def quitar(self, producto: Any) -> None:
+        self._ajustar(producto, -1)
+        n = self._conteo_precios[producto.precio] - 1
+        if n:
+            self._conteo_precios[producto.precio] = n
+        else:
+            del self._conteo_precios[producto.precio]
+
+    def aplicar(self, antes: Optional[Any], despues: Optional[Any]) -> None:
+        """Refleja un cambio: alta (antes=None), baja (despues=None) o modificación."""
+        if antes is not None:
+            self.quitar(antes)
+        if despues is not None:
+            self.agregar(despues)
+
+    def _ajustar(self, p: Any, signo: int) -> None:
+        self.productos += signo
+        self.unidades += signo * p.cantidad
+        self._valor.agregar(signo * p.cantidad * p.precio)
+        self._precios.agregar(signo * p.precio)
+        self._histograma[bisect_right(self.limites, p.precio)] += signo
+
+    def _reconstruir_monticulos(self) -> None:
+        self._minimos = list(self._conteo_precios)
+        heapq.heapify(self._minimos)
+        self._maximos = [-p for p in self._conteo_precios]
+        heapq.heapify(self._maximos)
+
+    # ---------------------- Consultas ----------------------
+    @property
+    def valor_total(self) -> float:
+        return self._valor.valor
+
+    @property
+    def precio_promedio(self) -> Optional[float]:
+        return self._precios.valor / self.productos if self.productos else None
+
+    @property
+    def precio_minimo(self) -> Optional[float]:
+        while self._minimos and self._minimos[0] not in self._conteo_precios:
+            heapq.heappop(self._minimos)
+        return self._minimos[0] if self._minimos else None
+
+    @property
+    def precio_maximo(self) -> Optional[float]:
+        while self._maximos and -self._maximos[0] not in self._conteo_precios:
+            heapq.heappop(self._maximos)
+        return -self._maximos[0] if self._maximos else None
+
+    def histograma(self) -> List[Tuple[str, int]]:
+        """Pares (tramo, cantidad de productos), p. ej. ('10-50', 42)."""
+        etiquetas = [f"<{self.limites[0]:g}"]
+        etiquetas += [f"{a:g}-{b:g}" for a, b in zip(self.limites, self.limites[1:])]
+        etiquetas.append(f">={self.limites[-1]:g}")
+        return list(zip(etiquetas, self._histograma))
+
+    def resumen(self) -> Dict[str, Any]:
+        return {
+            "productos": self.productos,
+            "unidades": self.unidades,
+            "valor_total": self.valor_total,
+            "precio_promedio": self.precio_promedio,
+            "precio_minimo": self.precio_minimo,
+            "precio_maximo": self.precio_maximo,
+            "histograma": dict(self.histograma()),
+        }
+
+    def verificar(self, productos: Iterable[Any]) -> List[str]:
+        """Recalcula todo recorriendo `productos` y describe cada agregado que no coincide."""
+        esperado = Estadisticas.construir(productos, self.limites).resumen()
+        actual = self.resumen()
+        diferencias = []
+        for clave, valor in esperado.items():
+            obtenido = actual[clave]
+            if isinstance(valor, float) and isinstance(obtenido, float):
+                iguales = math.isclose(valor, obtenido, rel_tol=1e-9, abs_tol=1e-6)
+            else:
+                iguales = valor == obtenido
+            if not iguales:
+                diferencias.append(f"{clave}: se esperaba {valor}, hay {obtenido}")
+        return diferencias
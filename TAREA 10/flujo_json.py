@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lectura y escritura incremental de listas JSON
+----------------------------------------------
+- `iterar_lista_json` entrega los elementos de una lista JSON uno a uno leyendo
+  el archivo por bloques, sin cargar el documento completo en memoria.
+- `abrir_lista_json` acepta además un objeto {"version": N, "productos": [...]}
+  y devuelve los metadatos (los que preceden a la lista) junto con el iterador.
+- `escribir_lista_json` escribe los elementos de un iterable por lotes, con un
+  producto por línea, sin construir la lista completa.
+Los errores de formato se reportan como json.JSONDecodeError, igual que json.load.
+"""
+
+from __future__ import annotations
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+TAM_BLOQUE = 1 << 16
+TAM_LOTE = 1000
+
+_ESPACIOS = " \t\n\r"
+
+
+class _LectorBloques:
+    """Búfer de texto sobre un archivo que se rellena a medida que se consume."""
+
+    def __init__(self, f: TextIO, tam_bloque: int) -> None:
+        self.f = f
+        self.tam_bloque = tam_bloque
+        self.buf = ""
+        self.pos = 0
+        self.consumido = 0  # caracteres descartados antes de buf (para mensajes de error)
+        self.fin = False
+
+    def rellenar(self) -> bool:
+        if self.fin:
+            return False
+        bloque = self.f.read(self.tam_bloque)
+        if not bloque:
+            self.fin = True
+            return False
+        if self.pos > len(self.buf) // 2:
+            self.consumido += self.pos
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += bloque
+        return True
+
+    def saltar_espacios(self) -> str:
+        """Avanza hasta el siguiente carácter significativo y lo devuelve ('' al final)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _ESPACIOS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.rellenar():
+                return ""
+
+    def error(self, mensaje: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(mensaje, self.buf, self.pos)
+
+    def decodificar(self, decoder: json.JSONDecoder) -> Any:
+        """Decodifica el siguiente valor JSON, pidiendo más bloques si está incompleto."""
+        while True:
+            try:
+                valor, fin = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.rellenar():
+                    continue
+                raise
+            if fin == len(self.buf) and self.rellenar():
+                # Un número al final del búfer podría continuar en el próximo bloque
+                continue
+            self.pos = fin
+            return valor
+
+
+def iterar_lista_json(f: TextIO, tam_bloque: int = TAM_BLOQUE) -> Iterator[Any]:
+    """Genera los elementos de la lista JSON contenida en `f`."""
+    _, elementos = abrir_lista_json(f, tam_bloque=tam_bloque)
+    return elementos
+
+
+def abrir_lista_json(
+    f: TextIO, clave_lista: str = "productos", tam_bloque: int = TAM_BLOQUE
+) -> Tuple[Dict[str, Any], Iterator[Any]]:
+    """
+    Lee la cabecera del documento y devuelve (metadatos, elementos). El documento
+    puede ser una lista JSON (metadatos vacíos) o un objeto cuyos campos anteriores
+    a `clave_lista` son metadatos pequeños (p. ej. la versión). Solo se lee hasta
+    el inicio de la lista, así que sirve para consultar la versión en O(1).
+    """
+    lector = _LectorBloques(f, tam_bloque)
+    decoder = json.JSONDecoder()
+    meta: Dict[str, Any] = {}
+    c = lector.saltar_espacios()
+    if c == "{":
+        lector.pos += 1
+        while True:
+            if lector.saltar_espacios() != '"':
+                raise lector.error(f"Se esperaba la clave '{clave_lista}' en el objeto JSON.")
+            clave = lector.decodificar(decoder)
+            if lector.saltar_espacios() != ":":
+                raise lector.error("Se esperaba ':' en el objeto JSON.")
+            lector.pos += 1
+            if clave == clave_lista:
+                break
+            lector.saltar_espacios()
+            meta[clave] = lector.decodificar(decoder)
+            if lector.saltar_espacios() != ",":
+                raise lector.error(f"Falta la lista '{clave_lista}' en el objeto JSON.")
+            lector.pos += 1
+        envuelto = True
+    elif c == "[":
+        envuelto = False
+    else:
+        raise lector.error("El contenido no es una lista JSON.")
+    return meta, _elementos(lector, decoder, envuelto)
+
+
+def _elementos(lector: _LectorBloques, decoder: json.JSONDecoder, envuelto: bool) -> Iterator[Any]:
+    if lector.saltar_espacios() != "[":
+        raise lector.error("El contenido no es una lista JSON.")
+    lector.pos += 1
+    if lector.saltar_espacios() == "]":
+        lector.pos += 1
+    else:
+        while True:
+            yield lector.decodificar(decoder)
+            c = lector.saltar_espacios()
+            lector.pos += 1
+            if c == "]":
+                break
+            if c != ",":
+                raise lector.error("Se esperaba ',' o ']' en la lista JSON.")
+            lector.saltar_espacios()
+    if envuelto:
+        # Campos posteriores a la lista: se validan pero no se usan
+        while lector.saltar_espacios() == ",":
+            lector.pos += 1
+            lector.saltar_espacios()
+            lector.decodificar(decoder)
+            if lector.saltar_espacios() != ":":
+                raise lector.error("Se esperaba ':' en el objeto JSON.")
+            lector.pos += 1
+            lector.saltar_espacios()
+            lector.decodificar(decoder)
+        if lector.saltar_espacios() != "}":
+            raise lector.error("Se esperaba '}' al final del objeto JSON.")
+        lector.pos += 1
+    if lector.saltar_espacios() != "":
+        raise lector.error("Contenido extra después de la lista JSON.")
+
+
+def escribir_lista_json(
+    f: TextIO,
+    elementos: Iterable[Dict],
+    tam_lote: int = TAM_LOTE,
+    meta: Optional[Dict[str, Any]] = None,
+    clave_lista: str = "productos",
+) -> int:
+    """
+    Escribe `elementos` como una lista JSON (un elemento por línea) y devuelve
+    cuántos se escribieron. Solo mantiene en memoria un lote a la vez. Con `meta`
+    el documento es un objeto: los metadatos primero y luego la lista en `clave_lista`.
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    total = 0
+    lote = []
+    if meta is not None:
+        campos = "".join(f"{dumps(k)}: {dumps(v)}, " for k, v in meta.items())
+        f.write("{" + campos + dumps(clave_lista) + ": ")
+    f.write("[")
+    for elem in elementos:
+        lote.append(dumps(elem))
+        if len(lote) >= tam_lote:
+            f.write(("\n  " if total == 0 else ",\n  ") + ",\n  ".join(lote))
+            total += len(lote)
+            lote.clear()
+    if lote:
+        f.write(("\n  " if total == 0 else ",\n  ") + ",\n  ".join(lote))
+        total += len(lote)
+    cierre = "}" if meta is not None else ""
+    f.write(("\n]" if total else "]") + cierre + "\n")
+    return total
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formato binario columnar para catálogos de productos
+----------------------------------------------------
+Un archivo guarda una versión (contador de guardados) y cada campo como una
+columna independiente:
+- cantidad: int64[n]        precio: float64[n]
+- id y nombre: desplazamientos uint64[n+1] + montículo de bytes UTF-8
+- orden: uint64[n] con las filas ordenadas por id (búsqueda binaria)
+
+Al abrirlo se hace mmap del archivo y solo se lee la cabecera, así que abrir un
+catálogo es O(1) sin importar su tamaño. `CatalogoColumnar` se comporta como el
+diccionario {id: Producto} del inventario: materializa productos al pedirlos y
+guarda altas, cambios y bajas en memoria hasta el próximo guardado.
+
+Los números se guardan en orden de bytes little-endian (el nativo en x86/ARM).
+"""
+
+from __future__ import annotations
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from flujo_json import abrir_lista_json, escribir_lista_json
+
+MAGIA = b"INVCOL02"
+_CABECERA = struct.Struct("<8sQQ7Q")  # magia, versión, n, 7 desplazamientos de sección
+# Primera versión del formato, sin contador de versión (se lee como versión 0)
+MAGIA_V1 = b"INVCOL01"
+_CABECERA_V1 = struct.Struct("<8sQ7Q")
+
+
+class FormatoColumnarInvalido(ValueError):
+    """El archivo no es un catálogo columnar válido (o está truncado)."""
+
+
+def _leer_cabecera(datos: Any, ruta: str) -> Tuple[int, int, List[int]]:
+    """(versión, n, secciones) de la cabecera; acepta también el formato INVCOL01."""
+    magia = bytes(datos[:8])
+    if magia == MAGIA and len(datos) >= _CABECERA.size:
+        _, version, n, *secciones = _CABECERA.unpack_from(datos, 0)
+        return version, n, secciones
+    if magia == MAGIA_V1 and len(datos) >= _CABECERA_V1.size:
+        _, n, *secciones = _CABECERA_V1.unpack_from(datos, 0)
+        return 0, n, secciones
+    if magia in (MAGIA, MAGIA_V1):
+        raise FormatoColumnarInvalido(f"'{ruta}' es demasiado corto.")
+    raise FormatoColumnarInvalido(f"'{ruta}' no es un catálogo columnar.")
+
+
+def leer_version(ruta: str) -> int:
+    """Versión guardada en la cabecera, sin mapear el resto del archivo."""
+    with open(ruta, "rb") as f:
+        return _leer_cabecera(f.read(_CABECERA.size), ruta)[0]
+
+
+def _alinear(f: BinaryIO) -> int:
+    pos = f.tell()
+    relleno = (-pos) % 8
+    if relleno:
+        f.write(b"\0" * relleno)
+    return pos + relleno
+
+
+def escribir_columnar(f: BinaryIO, filas: Iterable[Tuple[str, str, int, float]], version: int = 0) -> int:
+    """
+    Escribe las filas (id, nombre, cantidad, precio) en formato columnar y
+    devuelve cuántas se escribieron. `f` debe ser un archivo binario nuevo.
+    """
+    if sys.byteorder != "little":
+        raise OSError("El formato columnar requiere una plataforma little-endian.")
+    cantidades = array("q")
+    precios = array("d")
+    ids_off = array("Q", [0])
+    nombres_off = array("Q", [0])
+    ids_heap = bytearray()
+    nombres_heap = bytearray()
+    claves = []
+    for id_, nombre, cantidad, precio in filas:
+        clave = id_.encode("utf-8")
+        claves.append(clave)
+        ids_heap += clave
+        ids_off.append(len(ids_heap))
+        nombres_heap += nombre.encode("utf-8")
+        nombres_off.append(len(nombres_heap))
+        cantidades.append(cantidad)
+        precios.append(precio)
+    n = len(claves)
+    orden = array("Q", sorted(range(n), key=claves.__getitem__))
+    del claves
+
+    f.write(b"\0" * _CABECERA.size)
+    secciones = []
+    for datos in (cantidades, precios, ids_off, ids_heap, nombres_off, nombres_heap, orden):
+        secciones.append(_alinear(f))
+        f.write(datos)
+    _alinear(f)
+    fin = f.tell()
+    f.seek(0)
+    f.write(_CABECERA.pack(MAGIA, version, n, *secciones))
+    f.seek(fin)
+    return n
+
+
+class CatalogoColumnar(MutableMapping):
+    """Vista {id: producto} sobre un archivo columnar mapeado en memoria."""
+
+    def __init__(self, ruta: str, fabrica: Callable[[str, str, int, float], Any]) -> None:
+        self.ruta = ruta
+        self._fabrica = fabrica
+        self._f = open(ruta, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            self._f.close()
+            raise FormatoColumnarInvalido(f"'{ruta}' está vacío.")
+        try:
+            self._mapear()
+        except (FormatoColumnarInvalido, struct.error, TypeError, ValueError) as e:
+            self.cerrar()
+            if isinstance(e, FormatoColumnarInvalido):
+                raise
+            raise FormatoColumnarInvalido(f"'{ruta}' tiene secciones inválidas: {e}")
+        # Cambios en memoria sobre el archivo base
+        self._cache: Dict[str, Any] = {}     # productos del archivo ya materializados (o modificados)
+        self._extra: Dict[str, Any] = {}     # productos que no están en el archivo
+        self._eliminados: Set[str] = set()   # ids del archivo dados de baja
+
+    def _mapear(self) -> None:
+        mm = self._mm
+        self.version, n, secciones = _leer_cabecera(mm, self.ruta)
+        if any(s > len(mm) for s in secciones) or list(secciones) != sorted(secciones):
+            raise FormatoColumnarInvalido(f"'{self.ruta}' está truncado.")
+        mv = self._mv = memoryview(mm)
+        c, p, io_, ih, no, nh, o = secciones
+        self._n = n
+        self._cantidades = mv[c:c + 8 * n].cast("q")
+        self._precios = mv[p:p + 8 * n].cast("d")
+        self._ids_off = mv[io_:io_ + 8 * (n + 1)].cast("Q")
+        self._nombres_off = mv[no:no + 8 * (n + 1)].cast("Q")
+        self._orden = mv[o:o + 8 * n].cast("Q")
+        completas = (len(self._cantidades) == len(self._precios) == len(self._orden) == n
+                     and len(self._ids_off) == len(self._nombres_off) == n + 1)
+        if not completas or self._ids_off[n] > no - ih or self._nombres_off[n] > o - nh:
+            raise FormatoColumnarInvalido(f"'{self.ruta}' está truncado.")
+        self._ids_heap = mv[ih:ih + self._ids_off[n]]
+        self._nombres_heap = mv[nh:nh + self._nombres_off[n]]
+
+    @classmethod
+    def abrir(cls, ruta: str, fabrica: Callable[[str, str, int, float], Any]) -> "CatalogoColumnar":
+        return cls(ruta, fabrica)
+
+    def cerrar(self) -> None:
+        # Liberar las vistas antes de cerrar el mmap (si no, mmap.close falla)
+        for nombre in ("_nombres_heap", "_ids_heap", "_orden", "_nombres_off", "_ids_off", "_precios", "_cantidades", "_mv"):
+            v = self.__dict__.pop(nombre, None)
+            if v is not None:
+                v.release()
+        self._mm.close()
+        self._f.close()
+
+    # --- acceso a filas del archivo ---
+    def _id_fila(self, fila: int) -> str:
+        return str(self._ids_heap[self._ids_off[fila]:self._ids_off[fila + 1]], "utf-8")
+
+    def _fila(self, id_: str) -> Optional[int]:
+        """Búsqueda binaria del id en la columna `orden`: O(log n)."""
+        clave = id_.encode("utf-8")
+        heap, off, orden = self._ids_heap, self._ids_off, self._orden
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            fila = orden[mid]
+            actual = heap[off[fila]:off[fila + 1]].tobytes()
+            if actual < clave:
+                lo = mid + 1
+            elif actual > clave:
+                hi = mid
+            else:
+                return fila
+        return None
+
+    def fila(self, fila: int) -> Tuple[str, str, int, float]:
+        """Fila `fila` del archivo como tupla (id, nombre, cantidad, precio)."""
+        no = self._nombres_off
+        return (
+            self._id_fila(fila),
+            str(self._nombres_heap[no[fila]:no[fila + 1]], "utf-8"),
+            self._cantidades[fila],
+            self._precios[fila],
+        )
+
+    def filas(self) -> Iterator[Tuple[str, str, int, float]]:
+        for i in range(self._n):
+            yield self.fila(i)
+
+    # --- interfaz de diccionario ---
+    def __getitem__(self, id_: str) -> Any:
+        p = self._extra.get(id_)
+        if p is not None:
+            return p
+        p = self._cache.get(id_)
+        if p is not None:
+            return p
+        if id_ in self._eliminados:
+            raise KeyError(id_)
+        fila = self._fila(id_)
+        if fila is None:
+            raise KeyError(id_)
+        # Se conserva el objeto para que los cambios en sitio (actualizar) persistan
+        p = self._cache[id_] = self._fabrica(*self.fila(fila))
+        return p
+
+    def __contains__(self, id_: object) -> bool:
+        if not isinstance(id_, str):
+            return False
+        if id_ in self._extra or id_ in self._cache:
+            return True
+        return id_ not in self._eliminados and self._fila(id_) is not None
+
+    def __setitem__(self, id_: str, producto: Any) -> None:
+        if id_ in self._extra or self._fila(id_) is None:
+            self._extra[id_] = producto
+        else:
+            self._eliminados.discard(id_)
+            self._cache[id_] = producto
+
+    def __delitem__(self, id_: str) -> None:
+        if id_ in self._extra:
+            del self._extra[id_]
+            return
+        if id_ in self._eliminados or self._fila(id_) is None:
+            raise KeyError(id_)
+        self._cache.pop(id_, None)
+        self._eliminados.add(id_)
+
+    def __len__(self) -> int:
+        return self._n - len(self._eliminados) + len(self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        eliminados = self._eliminados
+        for i in range(self._n):
+            id_ = self._id_fila(i)
+            if id_ not in eliminados:
+                yield id_
+        yield from list(self._extra)
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        """Recorre en orden de archivo; las filas no tocadas se materializan sin cachear."""
+        eliminados, cache, fabrica = self._eliminados, self._cache, self._fabrica
+        for i in range(self._n):
+            id_ = self._id_fila(i)
+            if id_ in eliminados:
+                continue
+            p = cache.get(id_)
+            yield p if p is not None else fabrica(*self.fila(i))
+        yield from list(self._extra.values())
+
+
+# ---------------------- Conversión JSON <-> columnar ----------------------
+def _escribir_atomico(ruta: str, escribir: Callable[[Any], int], binario: bool) -> int:
+    tmp = f"{ruta}.tmp"
+    if binario:
+        f = open(tmp, "wb")
+    else:
+        f = open(tmp, "w", encoding="utf-8")
+    with f:
+        n = escribir(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, ruta)
+    return n
+
+
+def json_a_columnar(ruta_json: str, ruta_columnar: str) -> int:
+    """Convierte el JSON de productos al formato columnar (conserva la versión). Devuelve el número de filas."""
+    vistos: Dict[str, Tuple[str, str, int, float]] = {}
+    with open(ruta_json, "r", encoding="utf-8") as f:
+        meta, elementos = abrir_lista_json(f)
+        for d in elementos:
+            id_ = str(d.get("id", "")).strip()
+            if id_:  # ignorar registros sin id; el último duplicado gana, igual que al cargar
+                vistos[id_] = (id_, str(d.get("nombre", "")).strip(), int(d.get("cantidad", 0)), float(d.get("precio", 0.0)))
+    version = int(meta.get("version", 0))
+    return _escribir_atomico(ruta_columnar, lambda f: escribir_columnar(f, vistos.values(), version), binario=True)
+
+
+def columnar_a_json(ruta_columnar: str, ruta_json: str) -> int:
+    """Convierte un catálogo columnar al JSON de productos (conserva la versión). Devuelve el número de filas."""
+    catalogo = CatalogoColumnar(ruta_columnar, lambda *fila: fila)
+    try:
+        dicts = ({"id": i, "nombre": n, "cantidad": c, "precio": p} for i, n, c, p in catalogo.filas())
+        meta = {"version": catalogo.version}
+        return _escribir_atomico(ruta_json, lambda f: escribir_lista_json(f, dicts, meta=meta), binario=False)
+    finally:
+        catalogo.cerrar()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importación masiva de productos desde CSV o JSONL
+-------------------------------------------------
+- Lee el archivo en flujo y entrega lotes de (número_de_línea, dict).
+- Convierte cada lote con `desde_dict` de una sola pasada; solo si el lote falla
+  se repite fila a fila para identificar las filas con errores.
+- Los errores por fila se escriben en un CSV aparte en lugar de abortar.
+"""
+
+from __future__ import annotations
+import csv
+import gc
+import json
+import os
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+FORMATOS_IMPORTACION = ("csv", "jsonl")
+TAM_LOTE = 10000
+
+ErrorFila = Tuple[int, str]
+
+
+@contextmanager
+def pausar_gc() -> Iterator[None]:
+    """
+    Desactiva el recolector cíclico durante una carga masiva: crear millones de
+    objetos sin ciclos dispara recolecciones completas que no liberan nada.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def inferir_formato(ruta: str) -> Optional[str]:
+    ext = os.path.splitext(ruta)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return None
+
+
+def _filas_csv(ruta: str) -> Iterator[Tuple[int, Any]]:
+    with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+        lector = csv.reader(f)
+        encabezado = next(lector, None)
+        if encabezado is None:
+            return
+        claves = [c.strip().lower() for c in encabezado]
+        for fila in lector:
+            if fila:
+                # line_num cuenta líneas físicas (incluye el encabezado)
+                yield lector.line_num, dict(zip(claves, fila))
+
+
+def _filas_jsonl(ruta: str) -> Iterator[Tuple[int, Any]]:
+    with open(ruta, "r", encoding="utf-8") as f:
+        for n, linea in enumerate(f, start=1):
+            if linea.strip():
+                yield n, linea
+
+
+def leer_lotes(ruta: str, formato: str, tam_lote: int = TAM_LOTE) -> Iterator[List[Tuple[int, Any]]]:
+    """Lotes de (línea, dato crudo): dict para CSV, texto para JSONL."""
+    filas = _filas_csv(ruta) if formato == "csv" else _filas_jsonl(ruta)
+    while True:
+        lote = list(islice(filas, tam_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def convertir_lote(
+    lote: List[Tuple[int, Any]], formato: str, desde_dict: Callable[[Dict], Any]
+) -> Tuple[List[Tuple[int, Any]], List[ErrorFila]]:
+    """Convierte un lote a productos; devuelve (productos_con_línea, errores)."""
+    if formato == "jsonl":
+        try:
+            return [(n, desde_dict(json.loads(t))) for n, t in lote], []
+        except (ValueError, TypeError, AttributeError):
+            pass
+    else:
+        try:
+            return [(n, desde_dict(d)) for n, d in lote], []
+        except (ValueError, TypeError, AttributeError):
+            pass
+    # Camino lento: algún registro es inválido, ubicarlo fila a fila
+    productos: List[Tuple[int, Any]] = []
+    errores: List[ErrorFila] = []
+    for n, dato in lote:
+        try:
+            d = json.loads(dato) if formato == "jsonl" else dato
+            if not isinstance(d, dict):
+                raise TypeError("el registro no es un objeto JSON")
+            productos.append((n, desde_dict(d)))
+        except json.JSONDecodeError as e:
+            errores.append((n, f"JSON inválido: {e.msg}"))
+        except (ValueError, TypeError, AttributeError) as e:
+            errores.append((n, f"Valor inválido: {e}"))
+    return productos, errores
+
+
+class RegistroErrores:
+    """Escribe los errores por fila a un CSV solo si aparece alguno."""
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta = ruta
+        self.total = 0
+        self.muestra: List[ErrorFila] = []
+        self._f = None
+        self._w = None
+
+    def agregar(self, errores: List[ErrorFila]) -> None:
+        if not errores:
+            return
+        if self._f is None:
+            self._f = open(self.ruta, "w", encoding="utf-8", newline="")
+            self._w = csv.writer(self._f)
+            self._w.writerow(["linea", "error"])
+        self._w.writerows(errores)
+        self.total += len(errores)
+        if len(self.muestra) < 5:
+            self.muestra.extend(errores[: 5 - len(self.muestra)])
+
+    def cerrar(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
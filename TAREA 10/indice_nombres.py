@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice invertido de trigramas para búsquedas por subcadena en nombres
+----------------------------------------------------------------------
+- Cada nombre normalizado (minúsculas) se descompone en trigramas; cada trigrama
+  apunta al conjunto de documentos que lo contienen.
+- Una consulta de 3 o más caracteres intersecta las listas de sus trigramas
+  (de la más corta a la más larga) y solo verifica la subcadena en esos candidatos.
+- Consultas de 1-2 caracteres recorren los nombres ya normalizados.
+- Los resultados se devuelven en orden de inserción, como el diccionario del inventario.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Set
+
+
+def normalizar(texto: str) -> str:
+    return texto.lower()
+
+
+def trigramas(texto: str) -> Set[str]:
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTrigramas:
+    def __init__(self) -> None:
+        self._siguiente = 0
+        self._doc: Dict[str, int] = {}        # id -> número de documento (orden de inserción)
+        self._ids: Dict[int, str] = {}        # número de documento -> id
+        self._nombres: Dict[int, str] = {}    # número de documento -> nombre normalizado
+        self._listas: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc)
+
+    def agregar(self, id_: str, nombre: str) -> None:
+        if id_ in self._doc:
+            self.renombrar(id_, nombre)
+            return
+        doc = self._siguiente
+        self._siguiente += 1
+        self._doc[id_] = doc
+        self._ids[doc] = id_
+        self._indexar(doc, normalizar(nombre))
+
+    def eliminar(self, id_: str) -> None:
+        doc = self._doc.pop(id_, None)
+        if doc is None:
+            return
+        del self._ids[doc]
+        self._desindexar(doc)
+
+    def renombrar(self, id_: str, nombre: str) -> None:
+        """Cambia el nombre conservando la posición del documento."""
+        doc = self._doc.get(id_)
+        if doc is None:
+            self.agregar(id_, nombre)
+            return
+        nuevo = normalizar(nombre)
+        if self._nombres[doc] == nuevo:
+            return
+        self._desindexar(doc)
+        self._indexar(doc, nuevo)
+
+    def buscar(self, texto: str) -> List[str]:
+        """Ids cuyos nombres contienen `texto`, sin distinguir mayúsculas."""
+        t = normalizar(texto)
+        nombres = self._nombres
+        if len(t) < 3:
+            docs = [doc for doc, nombre in nombres.items() if t in nombre]
+        else:
+            listas = []
+            for g in trigramas(t):
+                lista = self._listas.get(g)
+                if not lista:
+                    return []
+                listas.append(lista)
+            listas.sort(key=len)
+            candidatos = listas[0]
+            for lista in listas[1:]:
+                candidatos = candidatos & lista
+                if not candidatos:
+                    return []
+            docs = [doc for doc in candidatos if t in nombres[doc]]
+        docs.sort()
+        ids = self._ids
+        return [ids[doc] for doc in docs]
+
+    # --- helpers privados ---
+    def _indexar(self, doc: int, nombre: str) -> None:
+        self._nombres[doc] = nombre
+        listas = self._listas
+        for g in trigramas(nombre):
+            lista = listas.get(g)
+            if lista is None:
+                listas[g] = {doc}
+            else:
+                lista.add(doc)
+
+    def _desindexar(self, doc: int) -> None:
+        nombre = self._nombres.pop(doc)
+        listas = self._listas
+        for g in trigramas(nombre):
+            lista = listas.get(g)
+            if lista is not None:
+                lista.discard(doc)
+                if not lista:
+                    del listas[g]
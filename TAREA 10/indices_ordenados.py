@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índices ordenados secundarios (cantidad, precio, valor de stock)
+----------------------------------------------------------------
+Cada índice es una lista ordenada de pares (clave, id) mantenida con bisect:
+- consultas por rango y umbral en O(log n + k);
+- top-k por clave en O(k) desde el final de la lista;
+- altas y bajas con búsqueda O(log n) más un desplazamiento de memoria (memmove)
+  de la lista, que en la práctica es muy rápido incluso con cientos de miles de filas.
+Junto a los pares se guarda la lista de solo claves, en el mismo orden: las
+consultas por umbral buscan en ella con bisect, sin el `key=` de Python 3.10.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+class IndiceOrdenado:
+    def __init__(self, clave: Callable[[Any], float]) -> None:
+        self.clave = clave
+        self._entradas: List[Tuple[float, str]] = []
+        self._claves: List[float] = []  # self._entradas[i][0], para bisect por clave
+
+    @classmethod
+    def construir(cls, clave: Callable[[Any], float], productos: Iterable[Any]) -> "IndiceOrdenado":
+        indice = cls(clave)
+        indice._entradas = sorted((clave(p), p.id) for p in productos)
+        indice._claves = [c for c, _ in indice._entradas]
+        return indice
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def agregar(self, producto: Any) -> None:
+        entrada = (self.clave(producto), producto.id)
+        i = bisect_right(self._entradas, entrada)
+        self._entradas.insert(i, entrada)
+        self._claves.insert(i, entrada[0])
+
+    def eliminar(self, producto: Any) -> None:
+        entrada = (self.clave(producto), producto.id)
+        i = bisect_left(self._entradas, entrada)
+        if i < len(self._entradas) and self._entradas[i] == entrada:
+            del self._entradas[i]
+            del self._claves[i]
+
+    def actualizar(self, antes: Any, despues: Any) -> None:
+        if self.clave(antes) != self.clave(despues) or antes.id != despues.id:
+            self.eliminar(antes)
+            self.agregar(despues)
+
+    # ---------------------- Consultas ----------------------
+    def menores_que(self, umbral: float) -> List[str]:
+        """Ids con clave < umbral, de menor a mayor."""
+        fin = bisect_left(self._claves, umbral)
+        return [id_ for _, id_ in self._entradas[:fin]]
+
+    def rango(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> List[str]:
+        """Ids con minimo <= clave <= maximo (extremos opcionales), de menor a mayor."""
+        inicio = 0 if minimo is None else bisect_left(self._claves, minimo)
+        fin = len(self._claves) if maximo is None else bisect_right(self._claves, maximo)
+        return [id_ for _, id_ in self._entradas[inicio:fin]]
+
+    def mayores(self, k: int) -> List[str]:
+        """Los k ids con mayor clave, de mayor a menor."""
+        if k <= 0:
+            return []
+        return [id_ for _, id_ in reversed(self._entradas[-k:])]
@@ -10,24 +10,82 @@ Características clave:
 - Recuperación ante archivo corrupto: realiza un respaldo automático y reinicia un archivo sano.
 - Interfaz de consola con mensajes claros de éxito/fallo en operaciones.
 - Escritura atómica mediante archivo temporal + os.replace para reducir riesgo de corrupción.
+- Lectura y escritura del JSON por bloques (memoria acotada aunque el catálogo crezca).
+- Formato alternativo columnar binario (--formato columnar) que se abre con mmap en O(1).
+- Búsqueda por nombre con índice de trigramas mantenido en cada cambio.
+- Índices ordenados por cantidad, precio y valor de stock para consultas de
+  bajo stock, rangos de precio y "más valiosos" sin recorrer todo el catálogo.
+- Estadísticas agregadas (unidades, valor total, precio promedio/mínimo/máximo,
+  histograma de precios) mantenidas en cada cambio, con verificación por recorrido.
+- Flujo de cambios: cada cambio confirmado se publica como evento en un anillo en
+  memoria (`inv.cambios`) y, con --cambios, en inventario.json.cambios para que
+  otro proceso lo siga por lotes (`seguir-cambios`) con puntos de control.
+- Transacciones (`with inv.transaccion()` / `aplicar_lote`) que confirman muchos
+  cambios con un solo guardado y los revierten todos si algo falla.
+- Modo diario opcional (--diario): cada mutación agrega un registro compacto a
+  inventario.json.diario en lugar de reescribir todo el archivo; una compactación
+  en segundo plano pliega el diario en la instantánea inventario.json.
+- Varios procesos sobre el mismo archivo: la carga y cada guardado se hacen con
+  un bloqueo (inventario.json.lock) y el archivo lleva un contador de versión.
+  Si otro proceso guardó antes, los cambios se fusionan sobre la versión nueva
+  en lugar de pisarla; detectarlo cuesta solo un os.stat (inodo, mtime, tamaño).
 
 Formato de almacenamiento:
-- JSON con una lista de productos, cada producto es un dict con claves: id, nombre, cantidad, precio.
+- JSON {"version": N, "productos": [...]}, cada producto es un dict con claves: id, nombre, cantidad, precio.
+  Una lista JSON sin envoltorio (formato anterior) se lee como versión 0.
+- Columnar (opcional): columnas binarias separadas, ver formato_columnar.py.
 
 Uso:
 - Ejecutar:  python inventario.py
+- Con diario: python inventario.py --diario
+- Columnar:   python inventario.py --formato columnar
+- Convertir:  python inventario.py convertir inventario.json inventario.col --a columnar
+- Exportar:   python inventario.py exportar inventario.csv.gz --fragmentos 4
+- Importar:   python inventario.py importar productos.csv   (o .jsonl)
+- Resumen:    python inventario.py estadisticas --verificar
+- Cambios:    python inventario.py --cambios   /   python inventario.py seguir-cambios --control exportador.control
 """
 
 from __future__ import annotations
+import argparse
+import csv
 import json
 import os
 import sys
-from dataclasses import dataclass, asdict
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, MutableMapping, Optional, Tuple
+
+from bloqueo import ESPERA_BLOQUEO, BloqueoArchivo, BloqueoOcupado
+from cambios import BufferCambios, RegistroCambios, SeguidorCambios, crear_eventos
+from diario import Diario, DiarioCorrupto
+from estadisticas import Estadisticas
+from exportacion import exportar_csv
+from importacion import (
+    FORMATOS_IMPORTACION, RegistroErrores, convertir_lote, inferir_formato, leer_lotes, pausar_gc,
+)
+from flujo_json import abrir_lista_json, escribir_lista_json, iterar_lista_json
+from formato_columnar import (
+    CatalogoColumnar, FormatoColumnarInvalido, columnar_a_json, escribir_columnar, json_a_columnar, leer_version,
+)
+from indice_nombres import IndiceTrigramas
+from indices_ordenados import IndiceOrdenado
 
 
 ARCHIVO_POR_DEFECTO = "inventario.json"
+ARCHIVO_COLUMNAR_POR_DEFECTO = "inventario.col"
+FORMATOS = ("json", "columnar")
+UMBRAL_COMPACTACION = 10000
+
+# Claves de los índices ordenados secundarios
+CLAVES_INDICES = {
+    "cantidad": attrgetter("cantidad"),
+    "precio": attrgetter("precio"),
+    "valor": lambda p: p.cantidad * p.precio,
+}
 
 
 @dataclass
@@ -47,12 +105,124 @@ class Producto:
             precio=float(d.get("precio", 0.0)),
         )
 
+    def a_dict(self) -> Dict:
+        # Igual que dataclasses.asdict pero sin su copia profunda genérica (mucho más rápido)
+        return {"id": self.id, "nombre": self.nombre, "cantidad": self.cantidad, "precio": self.precio}
+
+
+def _conflicto_registro(productos: MutableMapping[str, Producto], registro: Dict) -> Optional[str]:
+    """Motivo por el que `registro` no se puede aplicar sobre `productos` (None si se puede)."""
+    op = registro.get("op")
+    if op == "agregar":
+        id_ = str(registro.get("producto", {}).get("id", "")).strip()
+        if id_ in productos:
+            return f"'{id_}' ya fue agregado por otro proceso"
+    elif op in ("actualizar", "eliminar"):
+        id_ = str(registro.get("id", ""))
+        if id_ not in productos:
+            return f"'{id_}' fue eliminado por otro proceso"
+    return None
+
+
+def _aplicar_registro(productos: Dict[str, Producto], registro: Dict) -> None:
+    """
+    Aplica un registro del diario. Es idempotente (agregar reemplaza, actualizar
+    y eliminar ignoran ids ausentes), así que reaplicar un segmento que ya se
+    plegó en la instantánea produce el mismo estado.
+    """
+    op = registro.get("op")
+    if op == "agregar":
+        p = Producto.desde_dict(registro.get("producto", {}))
+        if p.id:
+            productos[p.id] = p
+    elif op == "actualizar":
+        p = productos.get(str(registro.get("id", "")))
+        if p is not None:
+            campos = registro.get("campos", {})
+            if "nombre" in campos:
+                p.nombre = str(campos["nombre"]).strip()
+            if "cantidad" in campos:
+                p.cantidad = int(campos["cantidad"])
+            if "precio" in campos:
+                p.precio = float(campos["precio"])
+    elif op == "eliminar":
+        productos.pop(str(registro.get("id", "")), None)
+
+
+class Transaccion:
+    """Cambios pendientes de una transacción y cómo deshacerlos."""
+
+    def __init__(self) -> None:
+        self.registros: List[Dict] = []
+        self.deshacer: List[Tuple[str, Optional[Producto]]] = []
+        self.cancelada = False
+        self.ok: Optional[bool] = None
+        self.mensaje = ""
+
+    def anotar(self, registro: Dict, id_: str, anterior: Optional[Producto]) -> None:
+        self.registros.append(registro)
+        self.deshacer.append((id_, anterior))
+
+    def cancelar(self) -> None:
+        """Marca la transacción para revertirse al salir del bloque `with`."""
+        self.cancelada = True
+
 
 class Inventario:
-    def __init__(self, ruta_archivo: str = ARCHIVO_POR_DEFECTO) -> None:
+    def __init__(
+        self,
+        ruta_archivo: str = ARCHIVO_POR_DEFECTO,
+        usar_diario: bool = False,
+        umbral_compactacion: int = UMBRAL_COMPACTACION,
+        formato: str = "json",
+        espera_bloqueo: float = ESPERA_BLOQUEO,
+        registrar_cambios: bool = False,
+    ) -> None:
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido '{formato}'. Use uno de: {', '.join(FORMATOS)}.")
         self.ruta_archivo = ruta_archivo
-        self.productos: Dict[str, Producto] = {}
+        self.formato = formato
+        self.usar_diario = usar_diario
+        self.umbral_compactacion = umbral_compactacion
+        self.ruta_diario = f"{ruta_archivo}.diario"
+        self.ruta_segmento = f"{ruta_archivo}.diario.1"
+        self.ruta_cambios = f"{ruta_archivo}.cambios"
+        # En formato columnar es un CatalogoColumnar (mmap) con la misma interfaz de dict
+        self.productos: MutableMapping[str, Producto] = {}
+        self._diario: Optional[Diario] = None
+        self._tx: Optional[Transaccion] = None
+        # Índices derivados: se construyen al primer uso y se mantienen en cada cambio
+        self._indice_nombres: Optional[IndiceTrigramas] = None
+        self._indices_ordenados: Optional[Dict[str, IndiceOrdenado]] = None
+        self._estadisticas: Optional[Estadisticas] = None
+        # Flujo de cambios confirmados: anillo en memoria y, opcionalmente, archivo para otros procesos
+        self.cambios = BufferCambios()
+        self._registro_cambios = RegistroCambios(self.ruta_cambios) if registrar_cambios else None
+        self.ultimo_error_cambios: Optional[str] = None
+        self._bloqueo_instantanea = threading.Lock()
+        self._hilo_compactacion: Optional[threading.Thread] = None
+        self.ultimo_error_compactacion: Optional[str] = None
+        # Coordinación entre procesos: versión del archivo cargado y su huella (os.stat)
+        self._bloqueo = BloqueoArchivo(f"{ruta_archivo}.lock", espera_bloqueo)
+        self.version = 0
+        self._huella: Optional[Tuple] = None
+        self.solo_lectura = False
+        aviso = ""
+        if usar_diario:
+            # El diario solo admite un escritor: se retiene el bloqueo mientras esté abierto
+            try:
+                self._bloqueo.adquirir()
+            except (BloqueoOcupado, OSError) as e:
+                self.solo_lectura = True
+                aviso = f" Modo solo lectura: {e}"
         ok, msg = self.cargar_desde_archivo()
+        msg += aviso
+        if usar_diario and not self.solo_lectura:
+            try:
+                self._diario = Diario(self.ruta_diario)
+            except OSError as e:
+                self._bloqueo.liberar()
+                ok, msg = False, f"{msg} No se pudo abrir el diario '{self.ruta_diario}': {e}"
         # Notar: no imprimimos aquí para no ensuciar salida en tests, pero la UI reporta estos mensajes.
         self._ultimo_mensaje_inicio = msg
 
@@ -62,39 +232,49 @@ class Inventario:
         Carga el inventario desde el archivo JSON. Si el archivo no existe, lo crea vacío.
         Maneja archivo corrupto realizando respaldo y reinicio seguro.
         """
+        self._invalidar_indices()
+        self._cerrar_catalogo()
+        if self.solo_lectura:
+            # Otro proceso escribe el diario: se lee sin bloquear ni reparar nada
+            ok, msg = self._cargar()
+        else:
+            try:
+                with self._bloqueo.retener():
+                    ok, msg = self._cargar()
+            except BloqueoOcupado as e:
+                return False, f"No se pudo cargar el inventario: {e}"
+            except OSError as e:
+                return False, f"No se pudo bloquear '{self._bloqueo.ruta}': {e}"
+        self._huella = self._huella_archivo()
+        return ok, msg
+
+    def _cargar(self) -> Tuple[bool, str]:
         try:
             if not os.path.exists(self.ruta_archivo):
                 # Crear archivo vacío
-                self._guardar_lista_productos([])  # crea el archivo sano
-                self.productos = {}
+                self._crear_vacio()  # crea el archivo sano
+                if self.usar_diario:
+                    return self._reproducir_diario()
                 return True, f"Archivo '{self.ruta_archivo}' no encontrado. Se creó uno nuevo."
-            # Leer y decodificar JSON
-            with open(self.ruta_archivo, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                raise json.JSONDecodeError("El contenido no es una lista JSON.", doc=str(data), pos=0)
-            self.productos = {}
-            for item in data:
-                p = Producto.desde_dict(item)
-                if p.id:  # ignorar registros sin id
-                    self.productos[p.id] = p
+            # Leer y decodificar JSON de forma incremental (o mapear el archivo columnar)
+            self.version, self.productos = self._leer_instantanea()
+            if self.usar_diario:
+                return self._reproducir_diario()
             return True, f"Inventario cargado correctamente desde '{self.ruta_archivo}'. Productos: {len(self.productos)}"
         except FileNotFoundError:
             # Raza de condición: fue borrado entre exists() y open()
             try:
-                self._guardar_lista_productos([])
-                self.productos = {}
+                self._crear_vacio()
                 return True, f"Archivo '{self.ruta_archivo}' no encontrado. Se creó uno nuevo."
             except PermissionError:
                 return False, f"Permiso denegado al crear '{self.ruta_archivo}'. Verifique permisos de escritura."
         except PermissionError:
             return False, f"Permiso denegado al leer '{self.ruta_archivo}'. Ejecute con permisos adecuados."
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, FormatoColumnarInvalido):
             # Archivo corrupto: crear respaldo y reiniciar
             backup = self._respaldar_archivo_corrupto()
             try:
-                self._guardar_lista_productos([])
-                self.productos = {}
+                self._crear_vacio()
                 return False, (
                     f"El archivo estaba corrupto. Se creó un respaldo en '{backup}' y se reinició '{self.ruta_archivo}' vacío."
                 )
@@ -105,38 +285,354 @@ class Inventario:
         except OSError as e:
             return False, f"Error del sistema al leer '{self.ruta_archivo}': {e}"
 
+    def _crear_vacio(self) -> None:
+        if self.solo_lectura:
+            raise PermissionError(f"'{self.ruta_archivo}' está abierto en modo solo lectura.")
+        self._guardar_lista_productos([])
+        self.productos = {}
+        self.version = 0
+
+    def _reproducir_diario(self) -> Tuple[bool, str]:
+        """
+        Aplica sobre la instantánea el segmento pendiente de compactar y luego el
+        diario activo. Un último registro truncado se trata como archivo corrupto:
+        se respalda el diario y se conserva solo la parte válida.
+        """
+        aplicados = 0
+        avisos: List[str] = []
+        for ruta in (self.ruta_segmento, self.ruta_diario):
+            try:
+                for registro in Diario.leer(ruta):
+                    _aplicar_registro(self.productos, registro)
+                    aplicados += 1
+            except DiarioCorrupto as e:
+                if self.solo_lectura:
+                    # Puede ser un registro que el otro proceso está escribiendo ahora mismo
+                    avisos.append(f"Se omitió el final incompleto de '{ruta}'.")
+                    continue
+                backup = self._respaldar_archivo_corrupto(ruta)
+                try:
+                    self._truncar_diario(backup, ruta, e.desplazamiento)
+                    avisos.append(f"El diario '{ruta}' terminaba en un registro incompleto. Se creó un respaldo en '{backup}'.")
+                except OSError as err:
+                    avisos.append(f"El diario '{ruta}' estaba dañado y no se pudo reparar: {err}. Respaldo en '{backup}'.")
+            except OSError as e:
+                return False, f"Error del sistema al leer el diario '{ruta}': {e}"
+        resumen = f"+{aplicados} cambios del diario. Productos: {len(self.productos)}"
+        if avisos:
+            return False, " ".join(avisos) + f" Se recuperaron {resumen}"
+        return True, f"Inventario cargado correctamente desde '{self.ruta_archivo}' ({resumen})"
+
+    @staticmethod
+    def _truncar_diario(origen: str, destino: str, longitud: int) -> None:
+        """Reescribe `destino` con los primeros `longitud` bytes (válidos) de `origen`."""
+        tmp = f"{destino}.tmp"
+        with open(origen, "rb") as fo, open(tmp, "wb") as fd:
+            restante = longitud
+            while restante > 0:
+                bloque = fo.read(min(restante, 1 << 20))
+                if not bloque:
+                    break
+                fd.write(bloque)
+                restante -= len(bloque)
+            fd.flush()
+            os.fsync(fd.fileno())
+        os.replace(tmp, destino)
+
+    def _confirmar(self, registros: List[Dict]) -> Tuple[bool, str]:
+        """
+        Hace durables los cambios ya aplicados en memoria. En modo diario solo se
+        agregan los registros; si no, se reescribe el archivo completo (fusionando
+        con lo que haya guardado otro proceso).
+        """
+        if self.solo_lectura:
+            return False, f"'{self.ruta_archivo}' está abierto en modo solo lectura (otro proceso usa el diario)."
+        if self._diario is None:
+            return self._guardar_fusionando(registros)
+        try:
+            self._diario.registrar(registros)
+        except PermissionError:
+            return False, f"Permiso denegado al escribir en '{self.ruta_diario}'."
+        except OSError as e:
+            return False, f"Error del sistema al escribir el diario '{self.ruta_diario}': {e}"
+        self._publicar_cambios(registros)
+        if self._diario.num_registros >= self.umbral_compactacion:
+            self._iniciar_compactacion()
+        return True, f"Cambio registrado en '{self.ruta_diario}'."
+
+    # ---------------------- Concurrencia entre procesos ----------------------
+    def _huella_archivo(self) -> Tuple:
+        """(inodo, mtime_ns, tamaño) del archivo y, en modo diario, de los diarios."""
+        rutas = [self.ruta_archivo]
+        if self.usar_diario:
+            rutas += [self.ruta_segmento, self.ruta_diario]
+        huella = []
+        for ruta in rutas:
+            try:
+                st = os.stat(ruta)
+                huella.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except OSError:
+                huella.append(None)
+        return tuple(huella)
+
+    def hay_cambios_externos(self) -> bool:
+        """
+        Indica si otro proceso modificó el archivo desde la última carga o guardado.
+        Solo consulta os.stat, así que se puede llamar antes de cada operación.
+        """
+        if self._diario is not None:
+            return False  # con el diario abierto este proceso es el único escritor
+        return self._huella_archivo() != self._huella
+
+    def recargar_si_cambio(self) -> Tuple[bool, str]:
+        """Recarga el inventario si cambió en disco. Devuelve (recargado, mensaje)."""
+        if self._tx is not None or not self.hay_cambios_externos():
+            return False, ""
+        version = self.version
+        ok, msg = self.cargar_desde_archivo()
+        if not ok:
+            return False, msg
+        if version == self.version and not self.usar_diario:
+            return False, ""
+        return True, f"El inventario cambió en otro proceso y se recargó (versión {self.version})."
+
+    def _leer_version_disco(self) -> int:
+        """Versión del archivo en disco leyendo solo su cabecera."""
+        if self.formato == "columnar":
+            return leer_version(self.ruta_archivo)
+        with open(self.ruta_archivo, "r", encoding="utf-8") as f:
+            meta, _ = abrir_lista_json(f)
+        return int(meta.get("version", 0))
+
+    def _guardar_fusionando(self, registros: List[Dict]) -> Tuple[bool, str]:
+        """
+        Guarda con el bloqueo tomado. Si otro proceso guardó una versión nueva, se
+        aplican `registros` sobre ella; si alguno choca (alta de un id que ya
+        existe, cambio o baja de uno que ya no existe) no se guarda nada.
+        """
+        try:
+            with self._bloqueo.retener():
+                version_disco: Optional[int] = None
+                if self._huella_archivo() != self._huella:
+                    try:
+                        version_disco = self._leer_version_disco()
+                    except (FileNotFoundError, json.JSONDecodeError, FormatoColumnarInvalido, ValueError):
+                        version_disco = None  # ausente o ilegible: se reescribe con lo de memoria
+                if version_disco is None or version_disco == self.version:
+                    self._guardar_lista_productos((p.a_dict() for p in self.productos.values()), self.version + 1)
+                    self.version += 1
+                    self._huella = self._huella_archivo()
+                    self._publicar_cambios(registros)
+                    return True, f"Inventario guardado en '{self.ruta_archivo}' (versión {self.version})."
+                ok, msg = self._fusionar(registros)
+                if ok:
+                    self._publicar_cambios(registros)
+                return ok, msg
+        except BloqueoOcupado as e:
+            return False, f"No se guardó: {e}"
+        except PermissionError:
+            return False, f"Permiso denegado al escribir en '{self.ruta_archivo}'. Cierre el archivo si está abierto o cambie permisos."
+        except (json.JSONDecodeError, FormatoColumnarInvalido) as e:
+            return False, f"No se pudo leer la versión de otro proceso: {e}"
+        except OSError as e:
+            return False, f"Error del sistema al guardar '{self.ruta_archivo}': {e}"
+
+    def _fusionar(self, registros: List[Dict]) -> Tuple[bool, str]:
+        version, frescos = self._leer_instantanea()
+        try:
+            for registro in registros:
+                motivo = _conflicto_registro(frescos, registro)
+                if motivo is not None:
+                    # La memoria queda como estaba; recargar_si_cambio traerá la versión nueva
+                    return False, f"Conflicto con la versión {version} de otro proceso: {motivo}. Recargue el inventario."
+                _aplicar_registro(frescos, registro)
+            self._guardar_lista_productos((p.a_dict() for p in frescos.values()), version + 1)
+        except BaseException:
+            if isinstance(frescos, CatalogoColumnar):
+                frescos.cerrar()
+            raise
+        self._cerrar_catalogo()
+        self.productos = frescos
+        self._invalidar_indices()
+        self.version = version + 1
+        self._huella = self._huella_archivo()
+        return True, f"Cambios fusionados con la versión {version} de otro proceso y guardados (versión {self.version})."
+
+    def _publicar_cambios(self, registros: List[Dict]) -> None:
+        """
+        Publica los registros ya confirmados como eventos. Se llama con el bloqueo
+        tomado, así la secuencia del archivo de cambios no se repite entre procesos.
+        """
+        if self._registro_cambios is not None:
+            eventos = crear_eventos(registros, self._registro_cambios.siguiente_secuencia(), self.version)
+            try:
+                self._registro_cambios.escribir(eventos)
+            except OSError as e:
+                # El cambio ya es durable; solo falta su evento en el archivo
+                self.ultimo_error_cambios = f"No se pudo escribir '{self.ruta_cambios}': {e}"
+        else:
+            eventos = crear_eventos(registros, self.cambios.secuencia + 1, self.version)
+        self.cambios.publicar(eventos)
+
+    # ---------------------- Compactación ----------------------
+    def _iniciar_compactacion(self) -> bool:
+        """Rota el diario y pliega el segmento en la instantánea en un hilo aparte."""
+        if self._diario is None:
+            return False
+        if self._hilo_compactacion is not None and self._hilo_compactacion.is_alive():
+            return False
+        try:
+            # Si quedó un segmento de una compactación anterior, se pliega primero
+            if not os.path.exists(self.ruta_segmento):
+                self._diario.rotar(self.ruta_segmento)
+        except OSError as e:
+            self.ultimo_error_compactacion = f"No se pudo rotar el diario: {e}"
+            return False
+        self._hilo_compactacion = threading.Thread(target=self._compactar, name="compactacion", daemon=True)
+        self._hilo_compactacion.start()
+        return True
+
+    def _compactar(self) -> None:
+        """Instantánea en disco + segmento rotado -> nueva instantánea (no toca la memoria)."""
+        try:
+            # El bloqueo entre procesos ya lo retiene este proceso mientras el diario está abierto
+            with self._bloqueo_instantanea:
+                version, productos = self._leer_instantanea()
+                try:
+                    for registro in Diario.leer(self.ruta_segmento):
+                        _aplicar_registro(productos, registro)
+                    self._escribir_instantanea((p.a_dict() for p in productos.values()), version + 1)
+                    self.version = version + 1
+                finally:
+                    if isinstance(productos, CatalogoColumnar):
+                        productos.cerrar()
+            os.remove(self.ruta_segmento)
+            self.ultimo_error_compactacion = None
+        except (OSError, ValueError, DiarioCorrupto) as e:
+            # El segmento se conserva; se reaplica al cargar o en la próxima compactación
+            self.ultimo_error_compactacion = f"Falló la compactación: {e}"
+
+    def compactar(self) -> Tuple[bool, str]:
+        """Compacta de inmediato y espera a que termine."""
+        if self._diario is None:
+            return False, "El inventario no usa diario."
+        self.esperar_compactacion()
+        if not self._iniciar_compactacion():
+            return False, self.ultimo_error_compactacion or "No se pudo iniciar la compactación."
+        self.esperar_compactacion()
+        if self.ultimo_error_compactacion:
+            return False, self.ultimo_error_compactacion
+        return True, f"Diario compactado en '{self.ruta_archivo}'."
+
+    def esperar_compactacion(self) -> None:
+        if self._hilo_compactacion is not None:
+            self._hilo_compactacion.join()
+
+    def cerrar(self) -> None:
+        """Espera compactaciones en curso y cierra el diario (sincronizando lo pendiente)."""
+        self.esperar_compactacion()
+        if self._diario is not None:
+            self._diario.cerrar()
+            self._diario = None
+            self._bloqueo.liberar()
+        if self._registro_cambios is not None:
+            self._registro_cambios.cerrar()
+            self._registro_cambios = None
+        self._cerrar_catalogo()
+
+    def _cerrar_catalogo(self) -> None:
+        if isinstance(self.productos, CatalogoColumnar):
+            self.productos.cerrar()
+            self.productos = {}
+
+    def iterar_archivo(self) -> Iterator[Producto]:
+        """Genera los productos guardados en el archivo uno a uno (memoria acotada)."""
+        if self.formato == "columnar":
+            catalogo = CatalogoColumnar(self.ruta_archivo, Producto)
+            try:
+                for fila in catalogo.filas():
+                    yield Producto(*fila)
+            finally:
+                catalogo.cerrar()
+            return
+        with open(self.ruta_archivo, "r", encoding="utf-8") as f:
+            for item in iterar_lista_json(f):
+                yield Producto.desde_dict(item)
+
+    def _leer_instantanea(self) -> Tuple[int, MutableMapping[str, Producto]]:
+        """(versión, productos) del archivo en disco."""
+        if self.formato == "columnar":
+            # O(1): solo se mapea el archivo; los productos se materializan al usarlos
+            catalogo = CatalogoColumnar(self.ruta_archivo, Producto)
+            return catalogo.version, catalogo
+        productos: Dict[str, Producto] = {}
+        with open(self.ruta_archivo, "r", encoding="utf-8") as f:
+            meta, elementos = abrir_lista_json(f)
+            for item in elementos:
+                p = Producto.desde_dict(item)
+                if p.id:  # ignorar registros sin id
+                    productos[p.id] = p
+        return int(meta.get("version", 0)), productos
+
     def guardar_en_archivo(self) -> Tuple[bool, str]:
-        """Guarda el inventario actual al archivo en modo atómico (temp + replace)."""
+        """
+        Guarda el inventario actual al archivo en modo atómico (temp + replace).
+        A diferencia de un cambio normal no fusiona: lo de memoria reemplaza lo
+        que haya en disco, como una nueva versión.
+        """
+        if self.solo_lectura:
+            return False, f"'{self.ruta_archivo}' está abierto en modo solo lectura (otro proceso usa el diario)."
         try:
-            lista = [asdict(p) for p in self.productos.values()]
-            self._guardar_lista_productos(lista)
+            with self._bloqueo.retener():
+                try:
+                    version = max(self.version, self._leer_version_disco())
+                except (FileNotFoundError, json.JSONDecodeError, FormatoColumnarInvalido, ValueError):
+                    version = self.version
+                self._guardar_lista_productos((p.a_dict() for p in self.productos.values()), version + 1)
+                self.version = version + 1
+                self._huella = self._huella_archivo()
             return True, f"Inventario guardado en '{self.ruta_archivo}'."
+        except BloqueoOcupado as e:
+            return False, f"No se guardó: {e}"
         except PermissionError:
             return False, f"Permiso denegado al escribir en '{self.ruta_archivo}'. Cierre el archivo si está abierto o cambie permisos."
         except OSError as e:
             return False, f"Error del sistema al guardar '{self.ruta_archivo}': {e}"
 
-    def _guardar_lista_productos(self, lista: List[Dict]) -> None:
+    def _guardar_lista_productos(self, lista: Iterable[Dict], version: int = 0) -> None:
         """Escritura atómica: escribe en archivo temporal y luego reemplaza."""
+        with self._bloqueo_instantanea:
+            self._escribir_instantanea(lista, version)
+
+    def _escribir_instantanea(self, lista: Iterable[Dict], version: int) -> None:
+        # `lista` puede ser un generador: se escribe por lotes directo al temporal
         tmp = f"{self.ruta_archivo}.tmp"
+        if self.formato == "columnar":
+            with open(tmp, "wb") as f:
+                escribir_columnar(f, ((d["id"], d["nombre"], d["cantidad"], d["precio"]) for d in lista), version)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.ruta_archivo)
+            return
         with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(lista, f, ensure_ascii=False, indent=2)
+            escribir_lista_json(f, lista, meta={"version": version})
             f.flush()
             os.fsync(f.fileno())
         os.replace(tmp, self.ruta_archivo)
 
-    def _respaldar_archivo_corrupto(self) -> str:
-        base, ext = os.path.splitext(self.ruta_archivo)
+    def _respaldar_archivo_corrupto(self, ruta: Optional[str] = None) -> str:
+        ruta = ruta or self.ruta_archivo
+        base, ext = os.path.splitext(ruta)
         marca = datetime.now().strftime("%Y%m%d-%H%M%S")
         backup = f"{base}.corrupto-{marca}{ext or '.json'}"
         try:
-            if os.path.exists(self.ruta_archivo):
-                os.replace(self.ruta_archivo, backup)
+            if os.path.exists(ruta):
+                os.replace(ruta, backup)
         except OSError:
             # Como último recurso, intentar copiar
             try:
                 from shutil import copyfile
-                copyfile(self.ruta_archivo, backup)
+                copyfile(ruta, backup)
             except Exception:
                 backup = "(no se pudo crear respaldo)"
         return backup
@@ -148,56 +644,296 @@ class Inventario:
         if producto.cantidad < 0 or producto.precio < 0:
             return False, "Cantidad y precio deben ser no negativos."
         self.productos[producto.id] = producto
-        ok, msg = self.guardar_en_archivo()
+        self._registrar_cambio(None, producto)
+        registro = {"op": "agregar", "producto": producto.a_dict()}
+        if self._tx is not None:
+            self._tx.anotar(registro, producto.id, None)
+            return True, f"Producto '{producto.nombre}' agregado (pendiente de confirmar)."
+        ok, msg = self._confirmar([registro])
         if ok:
             return True, f"Producto '{producto.nombre}' agregado y guardado correctamente."
         else:
             # revertir en memoria si guardar falla
-            self.productos.pop(producto.id, None)
+            self._restaurar(producto.id, None)
             return False, f"No se pudo guardar el producto. {msg}"
 
     def actualizar(self, id_: str, nombre: Optional[str] = None, cantidad: Optional[int] = None, precio: Optional[float] = None) -> Tuple[bool, str]:
         if id_ not in self.productos:
             return False, f"No existe producto con id '{id_}'."
+        # Validar todo antes de tocar el producto para no dejar cambios a medias
+        if cantidad is not None and cantidad < 0:
+            return False, "La cantidad no puede ser negativa."
+        if precio is not None and precio < 0:
+            return False, "El precio no puede ser negativo."
         p = self.productos[id_]
+        anterior = replace(p)
+        campos: Dict = {}
         if nombre is not None:
             p.nombre = nombre.strip()
+            campos["nombre"] = p.nombre
         if cantidad is not None:
-            if cantidad < 0:
-                return False, "La cantidad no puede ser negativa."
             p.cantidad = cantidad
+            campos["cantidad"] = cantidad
         if precio is not None:
-            if precio < 0:
-                return False, "El precio no puede ser negativo."
             p.precio = precio
-        ok, msg = self.guardar_en_archivo()
+            campos["precio"] = precio
+        self._registrar_cambio(anterior, p)
+        registro = {"op": "actualizar", "id": id_, "campos": campos}
+        if self._tx is not None:
+            self._tx.anotar(registro, id_, anterior)
+            return True, f"Producto '{id_}' actualizado (pendiente de confirmar)."
+        ok, msg = self._confirmar([registro])
         if ok:
             return True, f"Producto '{id_}' actualizado y guardado correctamente."
         else:
+            self._restaurar(id_, anterior)
             return False, f"No se pudo guardar el cambio. {msg}"
 
     def eliminar(self, id_: str) -> Tuple[bool, str]:
         if id_ not in self.productos:
             return False, f"No existe producto con id '{id_}'."
         p = self.productos.pop(id_)
-        ok, msg = self.guardar_en_archivo()
+        self._registrar_cambio(p, None)
+        registro = {"op": "eliminar", "id": id_}
+        if self._tx is not None:
+            self._tx.anotar(registro, id_, p)
+            return True, f"Producto '{p.nombre}' eliminado (pendiente de confirmar)."
+        ok, msg = self._confirmar([registro])
         if ok:
             return True, f"Producto '{p.nombre}' eliminado y cambios guardados."
         else:
             # si falló el guardado, intentar restaurar
-            self.productos[id_] = p
+            self._restaurar(id_, p)
             return False, f"No se pudo guardar la eliminación. {msg}"
 
+    def _restaurar(self, id_: str, anterior: Optional[Producto]) -> None:
+        """Deshace en memoria un cambio sobre `id_` dejando el estado `anterior`."""
+        actual = self.productos.get(id_)
+        if anterior is None:
+            if actual is not None:
+                del self.productos[id_]
+                self._registrar_cambio(actual, None)
+        elif actual is not None and actual is not anterior:
+            # Restaurar en el mismo objeto para no invalidar referencias existentes
+            antes = replace(actual)
+            actual.nombre, actual.cantidad, actual.precio = anterior.nombre, anterior.cantidad, anterior.precio
+            self._registrar_cambio(antes, actual)
+        elif actual is None:
+            self.productos[id_] = anterior
+            self._registrar_cambio(None, anterior)
+
+    # ---------------------- Índices ----------------------
+    def _registrar_cambio(self, antes: Optional[Producto], despues: Optional[Producto]) -> None:
+        """
+        Mantiene los índices derivados tras un cambio en memoria. `antes` debe ser
+        una copia del estado previo cuando el producto se modifica en sitio.
+        """
+        indice = self._indice_nombres
+        if indice is not None:
+            if despues is None:
+                indice.eliminar(antes.id)
+            elif antes is None:
+                indice.agregar(despues.id, despues.nombre)
+            elif antes.nombre != despues.nombre:
+                indice.renombrar(despues.id, despues.nombre)
+        if self._indices_ordenados is not None:
+            for ordenado in self._indices_ordenados.values():
+                if despues is None:
+                    ordenado.eliminar(antes)
+                elif antes is None:
+                    ordenado.agregar(despues)
+                else:
+                    ordenado.actualizar(antes, despues)
+        if self._estadisticas is not None:
+            self._estadisticas.aplicar(antes, despues)
+
+    def _invalidar_indices(self) -> None:
+        """Descarta los índices tras reemplazar `self.productos` por completo."""
+        self._indice_nombres = None
+        self._indices_ordenados = None
+        self._estadisticas = None
+
+    def _indice_de_nombres(self) -> IndiceTrigramas:
+        if self._indice_nombres is None:
+            indice = IndiceTrigramas()
+            for p in self.productos.values():
+                indice.agregar(p.id, p.nombre)
+            self._indice_nombres = indice
+        return self._indice_nombres
+
+    def _indice_ordenado(self, nombre: str) -> IndiceOrdenado:
+        if self._indices_ordenados is None:
+            productos = list(self.productos.values())
+            self._indices_ordenados = {
+                k: IndiceOrdenado.construir(clave, productos) for k, clave in CLAVES_INDICES.items()
+            }
+        return self._indices_ordenados[nombre]
+
+    def estadisticas(self) -> Estadisticas:
+        """Agregados del inventario; se calculan una vez y luego se ajustan en cada cambio."""
+        if self._estadisticas is None:
+            self._estadisticas = Estadisticas.construir(self.productos.values())
+        return self._estadisticas
+
+    def verificar_estadisticas(self) -> Tuple[bool, str]:
+        """Compara los agregados mantenidos con un recorrido completo; si difieren, los recalcula."""
+        diferencias = self.estadisticas().verificar(self.productos.values())
+        if not diferencias:
+            return True, "Las estadísticas coinciden con un recorrido completo."
+        self._estadisticas = None
+        return False, "Estadísticas desactualizadas (se recalcularon): " + "; ".join(diferencias)
+
+    # ---------------------- Transacciones ----------------------
+    @contextmanager
+    def transaccion(self) -> Iterator["Transaccion"]:
+        """
+        Agrupa varias operaciones en un solo guardado durable:
+
+            with inv.transaccion() as tx:
+                inv.agregar(...)
+                inv.actualizar(...)
+            print(tx.mensaje)
+
+        Las operaciones se aplican en memoria y se confirman juntas al salir del
+        bloque. Si el bloque lanza una excepción o el guardado falla, todos los
+        cambios se revierten (tx.ok queda en False).
+        """
+        if self._tx is not None:
+            raise RuntimeError("Ya hay una transacción en curso.")
+        tx = self._tx = Transaccion()
+        try:
+            yield tx
+        except BaseException:
+            self._tx = None
+            self._deshacer(tx)
+            tx.ok, tx.mensaje = False, "Transacción revertida por un error."
+            raise
+        self._tx = None
+        if tx.cancelada:
+            self._deshacer(tx)
+            tx.ok, tx.mensaje = False, "Transacción cancelada; no se guardaron cambios."
+            return
+        if not tx.registros:
+            tx.ok, tx.mensaje = True, "Transacción sin cambios."
+            return
+        ok, msg = self._confirmar(tx.registros)
+        if ok:
+            tx.ok, tx.mensaje = True, f"Transacción confirmada: {len(tx.registros)} cambios guardados."
+        else:
+            self._deshacer(tx)
+            tx.ok, tx.mensaje = False, f"No se pudo guardar la transacción; cambios revertidos. {msg}"
+
+    def _deshacer(self, tx: "Transaccion") -> None:
+        for id_, anterior in reversed(tx.deshacer):
+            self._restaurar(id_, anterior)
+
+    def aplicar_lote(self, operaciones: Iterable[Tuple]) -> Tuple[bool, str]:
+        """
+        Aplica un lote de operaciones con un único guardado. Cada operación es:
+          ("agregar", Producto)
+          ("actualizar", id, {"nombre": ..., "cantidad": ..., "precio": ...})
+          ("eliminar", id)
+        Si alguna operación es inválida no se guarda nada (todo o nada).
+        """
+        errores: List[str] = []
+        with self.transaccion() as tx:
+            for i, op in enumerate(operaciones, start=1):
+                tipo = op[0] if op else None
+                if tipo == "agregar":
+                    ok, msg = self.agregar(op[1])
+                elif tipo == "actualizar":
+                    campos = op[2] if len(op) > 2 else {}
+                    ok, msg = self.actualizar(op[1], **campos)
+                elif tipo == "eliminar":
+                    ok, msg = self.eliminar(op[1])
+                else:
+                    ok, msg = False, f"Operación desconocida: {tipo!r}."
+                if not ok:
+                    errores.append(f"#{i}: {msg}")
+            if errores:
+                tx.cancelar()
+        if errores:
+            muestra = " ".join(errores[:5])
+            extra = f" (y {len(errores) - 5} más)" if len(errores) > 5 else ""
+            return False, f"Lote rechazado, {len(errores)} operaciones inválidas: {muestra}{extra}"
+        return tx.ok, tx.mensaje
+
     def buscar_por_id(self, id_: str) -> Optional[Producto]:
         return self.productos.get(id_)
 
     def buscar_por_nombre(self, texto: str) -> List[Producto]:
-        t = texto.lower().strip()
-        return [p for p in self.productos.values() if t in p.nombre.lower()]
+        t = texto.strip()
+        return [self.productos[id_] for id_ in self._indice_de_nombres().buscar(t)]
+
+    def productos_con_cantidad_menor(self, umbral: int) -> List[Producto]:
+        """Productos con cantidad < umbral (bajo stock), de menor a mayor cantidad."""
+        return [self.productos[i] for i in self._indice_ordenado("cantidad").menores_que(umbral)]
+
+    def productos_en_rango_precio(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> List[Producto]:
+        """Productos con minimo <= precio <= maximo, de menor a mayor precio."""
+        return [self.productos[i] for i in self._indice_ordenado("precio").rango(minimo, maximo)]
+
+    def productos_en_rango_cantidad(self, minimo: Optional[int] = None, maximo: Optional[int] = None) -> List[Producto]:
+        """Productos con minimo <= cantidad <= maximo, de menor a mayor cantidad."""
+        return [self.productos[i] for i in self._indice_ordenado("cantidad").rango(minimo, maximo)]
+
+    def mas_valiosos(self, k: int = 10) -> List[Producto]:
+        """Los k productos con mayor valor de stock (cantidad * precio)."""
+        return [self.productos[i] for i in self._indice_ordenado("valor").mayores(k)]
 
     def listar(self) -> List[Producto]:
         return list(self.productos.values())
 
+    def importar(self, ruta: str, formato: Optional[str] = None, ruta_errores: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Importa productos nuevos desde CSV (encabezado id,nombre,cantidad,precio) o
+        JSONL (un objeto por línea). El archivo se procesa por lotes; las filas
+        inválidas (valores no numéricos, negativos, sin id o con id duplicado) se
+        anotan en `ruta_errores` sin detener la importación, y las válidas se
+        confirman juntas con un único guardado al final.
+        """
+        formato = formato or inferir_formato(ruta)
+        if formato not in FORMATOS_IMPORTACION:
+            return False, f"No se reconoce el formato de '{ruta}'. Use uno de: {', '.join(FORMATOS_IMPORTACION)}."
+        errores = RegistroErrores(ruta_errores or f"{ruta}.errores.csv")
+        importadas = 0
+        try:
+            with pausar_gc(), self.transaccion() as tx:
+                for lote in leer_lotes(ruta, formato):
+                    productos, errs = convertir_lote(lote, formato, Producto.desde_dict)
+                    for n, p in productos:
+                        if not p.id:
+                            errs.append((n, "Registro sin id."))
+                        elif p.cantidad < 0 or p.precio < 0:
+                            errs.append((n, "Cantidad y precio deben ser no negativos."))
+                        elif p.id in self.productos:
+                            # Las filas ya importadas están en self.productos (pendientes de confirmar)
+                            errs.append((n, f"Ya existe un producto con id '{p.id}' (en el inventario o antes en el archivo)."))
+                        else:
+                            self.agregar(p)
+                            importadas += 1
+                    errs.sort()
+                    errores.agregar(errs)
+        except FileNotFoundError:
+            return False, f"No existe el archivo '{ruta}'."
+        except PermissionError:
+            return False, f"Permiso denegado al leer '{ruta}' o escribir '{errores.ruta}'."
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            return False, f"Error al leer '{ruta}': {e}. No se importó nada."
+        finally:
+            errores.cerrar()
+        detalle = ""
+        if errores.total:
+            muestra = " ".join(f"línea {n}: {m}" for n, m in errores.muestra)
+            detalle = f" {errores.total} filas con errores (ver '{errores.ruta}'): {muestra}"
+        if not tx.ok:
+            return False, tx.mensaje + detalle
+        return True, f"Importación confirmada: {importadas} productos nuevos.{detalle}"
+
+    def exportar_csv(self, ruta: str = "inventario.csv", **opciones) -> Tuple[bool, str]:
+        """Exporta a CSV; ver exportacion.exportar_csv para fragmentos, gzip y procesos."""
+        return exportar_csv(self.productos.values(), ruta, **opciones)
+
     # ---------------------- Utilidades ----------------------
     def mensaje_inicio(self) -> str:
         """Mensaje informativo de la carga inicial."""
@@ -231,8 +967,20 @@ def mostrar_producto(p: Producto) -> None:
     print(f"- ID: {p.id} | Nombre: {p.nombre} | Cantidad: {p.cantidad} | Precio: {p.precio:.2f}")
 
 
-def menu() -> None:
-    inv = Inventario()
+def mostrar_estadisticas(est: Estadisticas) -> None:
+    if not est.productos:
+        print("ℹ No hay productos registrados.")
+        return
+    print(f"Productos: {est.productos} | Unidades: {est.unidades} | Valor total: {est.valor_total:.2f}")
+    print(f"Precio promedio: {est.precio_promedio:.2f} | Mínimo: {est.precio_minimo:.2f} | Máximo: {est.precio_maximo:.2f}")
+    print("Productos por tramo de precio:")
+    for tramo, n in est.histograma():
+        print(f"  {tramo:>10}: {n}")
+
+
+def menu(ruta_archivo: str = ARCHIVO_POR_DEFECTO, usar_diario: bool = False, formato: str = "json",
+         registrar_cambios: bool = False) -> None:
+    inv = Inventario(ruta_archivo, usar_diario=usar_diario, formato=formato, registrar_cambios=registrar_cambios)
     # Reportar estado de carga de archivo
     print(inv.mensaje_inicio())
 
@@ -244,28 +992,21 @@ def menu() -> None:
         "5": "Buscar por ID",
         "6": "Buscar por nombre",
         "7": "Exportar a CSV",
+        "8": "Productos con bajo stock",
+        "9": "Buscar por rango de precio",
+        "E": "Estadísticas del inventario",
         "0": "Salir"
     }
 
-    def exportar_csv(ruta: str = "inventario.csv") -> Tuple[bool, str]:
-        import csv
-        try:
-            with open(ruta, "w", encoding="utf-8", newline="") as f:
-                w = csv.writer(f)
-                w.writerow(["id", "nombre", "cantidad", "precio"])
-                for p in inv.listar():
-                    w.writerow([p.id, p.nombre, p.cantidad, f"{p.precio:.2f}"])
-            return True, f"Inventario exportado a '{ruta}'."
-        except PermissionError:
-            return False, f"Permiso denegado al escribir '{ruta}'. Cierre el archivo si está abierto o cambie permisos."
-        except OSError as e:
-            return False, f"Error del sistema al exportar CSV: {e}"
-
     while True:
         print("\n===== SISTEMA DE INVENTARIO =====")
         for k in sorted(opciones):
             print(f"{k}. {opciones[k]}")
         elec = input("Seleccione una opción: ").strip()
+        # Otro proceso pudo guardar mientras se esperaba la opción (solo cuesta un os.stat)
+        recargado, msg = inv.recargar_si_cambio()
+        if recargado or msg:
+            print(("ℹ " if recargado else "❌ ") + msg)
 
         if elec == "1":
             prods = inv.listar()
@@ -340,11 +1081,42 @@ def menu() -> None:
                     mostrar_producto(p)
 
         elif elec == "7":
-            ruta = input("Ruta del CSV (Enter para 'inventario.csv'): ").strip() or "inventario.csv"
-            ok, msg = exportar_csv(ruta)
+            ruta = input("Ruta del CSV (Enter para 'inventario.csv', termine en .gz para comprimir): ").strip() or "inventario.csv"
+            fragmentos_txt = input("Número de fragmentos (Enter para 1): ").strip()
+            try:
+                fragmentos = int(fragmentos_txt) if fragmentos_txt else 1
+            except ValueError:
+                print("❌ Número de fragmentos inválido. Operación cancelada.")
+                continue
+            ok, msg = inv.exportar_csv(ruta, fragmentos=fragmentos)
             print(("✅ " if ok else "❌ ") + msg)
 
+        elif elec == "8":
+            umbral = input_int("Mostrar productos con cantidad menor a: ")
+            res = inv.productos_con_cantidad_menor(umbral)
+            if not res:
+                print("ℹ No hay productos con bajo stock.")
+            else:
+                print(f"Productos con cantidad < {umbral}: {len(res)}")
+                for p in res:
+                    mostrar_producto(p)
+
+        elif elec == "9":
+            minimo = input_float("Precio mínimo: ")
+            maximo = input_float("Precio máximo: ")
+            res = inv.productos_en_rango_precio(minimo, maximo)
+            if not res:
+                print("ℹ No hay productos en ese rango de precio.")
+            else:
+                print(f"Productos con precio entre {minimo:.2f} y {maximo:.2f}: {len(res)}")
+                for p in res:
+                    mostrar_producto(p)
+
+        elif elec.upper() == "E":
+            mostrar_estadisticas(inv.estadisticas())
+
         elif elec == "0":
+            inv.cerrar()
             print("¡Hasta luego!")
             break
 
@@ -352,9 +1124,106 @@ def menu() -> None:
             print("⚠ Opción inválida. Intente de nuevo.")
 
 
+def convertir(origen: str, destino: str, a: str) -> Tuple[bool, str]:
+    """Convierte entre la lista JSON y el formato columnar."""
+    try:
+        if a == "columnar":
+            n = json_a_columnar(origen, destino)
+        else:
+            n = columnar_a_json(origen, destino)
+        return True, f"Se convirtieron {n} productos de '{origen}' a '{destino}' ({a})."
+    except FileNotFoundError:
+        return False, f"No existe el archivo '{origen}'."
+    except PermissionError:
+        return False, f"Permiso denegado al convertir '{origen}' a '{destino}'."
+    except (json.JSONDecodeError, FormatoColumnarInvalido) as e:
+        return False, f"El archivo '{origen}' no tiene un formato válido: {e}"
+    except OSError as e:
+        return False, f"Error del sistema al convertir: {e}"
+
+
+def seguir_cambios(ruta: str, ruta_control: Optional[str], tam_lote: int, seguir: bool) -> int:
+    """Escribe los eventos nuevos como JSONL en la salida estándar, confirmando el punto de control por lote."""
+    seguidor = SeguidorCambios(ruta, ruta_control, tam_lote)
+    try:
+        for lote in seguidor.lotes(seguir=seguir):
+            sys.stdout.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in lote))
+            sys.stdout.flush()
+            seguidor.confirmar()
+    except KeyboardInterrupt:
+        pass
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Inventarios")
+    parser.add_argument("--archivo", help="ruta del inventario (por defecto inventario.json o inventario.col)")
+    parser.add_argument("--formato", choices=FORMATOS, default="json",
+                        help="formato del archivo: lista JSON o columnar binario con mmap")
+    parser.add_argument("--diario", action="store_true",
+                        help="registrar cada cambio en un diario en lugar de reescribir todo el archivo")
+    parser.add_argument("--cambios", action="store_true",
+                        help="publicar cada cambio confirmado en <archivo>.cambios para otros procesos")
+    sub = parser.add_subparsers(dest="comando")
+    p_conv = sub.add_parser("convertir", help="convertir entre JSON y columnar")
+    p_conv.add_argument("origen")
+    p_conv.add_argument("destino")
+    p_conv.add_argument("--a", choices=FORMATOS, required=True, help="formato de destino")
+    p_imp = sub.add_parser("importar", help="importar productos desde CSV o JSONL")
+    p_imp.add_argument("origen")
+    p_imp.add_argument("--formato-origen", choices=FORMATOS_IMPORTACION, default=None,
+                       help="formato del archivo a importar (por defecto según la extensión)")
+    p_imp.add_argument("--errores", default=None, help="CSV donde anotar las filas rechazadas")
+    p_exp = sub.add_parser("exportar", help="exportar el inventario a CSV")
+    p_exp.add_argument("destino", nargs="?", default="inventario.csv")
+    p_exp.add_argument("--fragmentos", type=int, default=1, help="dividir en N archivos escritos en paralelo")
+    p_exp.add_argument("--gzip", action="store_true", help="comprimir con gzip")
+    p_exp.add_argument("--procesos", type=int, default=None, help="tamaño del pool de procesos")
+    p_est = sub.add_parser("estadisticas", help="mostrar los agregados del inventario")
+    p_est.add_argument("--verificar", action="store_true", help="compararlos con un recorrido completo")
+    p_seg = sub.add_parser("seguir-cambios", help="escribir en la salida (JSONL) los cambios de <archivo>.cambios")
+    p_seg.add_argument("--control", default=None, help="archivo de punto de control para retomar donde se quedó")
+    p_seg.add_argument("--lote", type=int, default=1000, help="eventos por lote")
+    p_seg.add_argument("--una-vez", action="store_true", help="terminar al llegar al final en lugar de esperar más")
+    return parser
+
+
 if __name__ == "__main__":
+    args = crear_parser().parse_args()
+    if args.comando == "convertir":
+        ok, msg = convertir(args.origen, args.destino, args.a)
+        print(("✅ " if ok else "❌ ") + msg)
+        sys.exit(0 if ok else 1)
+    ruta = args.archivo or (ARCHIVO_COLUMNAR_POR_DEFECTO if args.formato == "columnar" else ARCHIVO_POR_DEFECTO)
+    if args.comando == "seguir-cambios":
+        sys.exit(seguir_cambios(f"{ruta}.cambios", args.control, args.lote, not args.una_vez))
+    if args.comando == "importar":
+        inv = Inventario(ruta, usar_diario=args.diario, formato=args.formato, registrar_cambios=args.cambios)
+        ok, msg = inv.importar(args.origen, args.formato_origen, args.errores)
+        inv.cerrar()
+        print(("✅ " if ok else "❌ ") + msg)
+        sys.exit(0 if ok else 1)
+    if args.comando == "exportar":
+        inv = Inventario(ruta, usar_diario=args.diario, formato=args.formato)
+        ok, msg = inv.exportar_csv(args.destino, fragmentos=args.fragmentos,
+                                   comprimir=args.gzip or None, procesos=args.procesos)
+        inv.cerrar()
+        print(("✅ " if ok else "❌ ") + msg)
+        sys.exit(0 if ok else 1)
+    if args.comando == "estadisticas":
+        inv = Inventario(ruta, usar_diario=args.diario, formato=args.formato)
+        mostrar_estadisticas(inv.estadisticas())
+        ok = True
+        if args.verificar:
+            ok, msg = inv.verificar_estadisticas()
+            print(("✅ " if ok else "❌ ") + msg)
+        inv.cerrar()
+        sys.exit(0 if ok else 1)
     try:
-        menu()
+        menu(ruta, usar_diario=args.diario, formato=args.formato, registrar_cambios=args.cambios)
     except KeyboardInterrupt:
         print("\nInterrupción por teclado. Saliendo...")
         sys.exit(130)
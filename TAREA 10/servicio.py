@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servicio local del inventario (asyncio, JSON por líneas)
+--------------------------------------------------------
+Atiende a muchos clientes a la vez sobre TCP o un socket Unix. Cada petición es
+una línea JSON y cada respuesta otra, con el mismo "id" de la petición:
+
+    {"id": 1, "op": "agregar", "producto": {"id": "A1", "nombre": "Lapiz", "cantidad": 5, "precio": 0.5}}
+    {"id": 1, "ok": true, "mensaje": "Producto 'Lapiz' agregado (confirmado)."}
+
+Operaciones:
+- escritura: agregar (producto), actualizar (id_producto + nombre/cantidad/precio), eliminar (id_producto);
+- lectura: buscar_id (id_producto), buscar_nombre (texto, limite), listar (desde, limite), estadisticas, ping.
+  buscar_nombre y listar devuelven como mucho LIMITE_LISTAR productos y el total de coincidencias.
+
+Diseño:
+- Las escrituras van a una cola que atiende una única tarea escritora: toma
+  todas las pendientes (hasta TAM_LOTE_MAX) y las confirma juntas con una sola
+  transacción del Inventario, en un hilo aparte para no frenar el bucle.
+  Mientras un lote se guarda, los siguientes se acumulan (confirmación agrupada).
+- Las lecturas se responden desde una instantánea que vive en el bucle de
+  eventos: copias de los productos ya confirmados más su índice de trigramas y
+  sus estadísticas. La tarea escritora le aplica los cambios de cada lote al
+  confirmarse, así que una lectura nunca ve cambios sin guardar ni compite con
+  el hilo que escribe.
+- El inventario se abre en modo diario: cada lote es un agregado al diario
+  (un fsync) y el bloqueo del diario garantiza que el servicio sea el único escritor.
+- Un cliente puede enviar varias peticiones sin esperar respuesta (hasta
+  MAX_EN_VUELO); las respuestas pueden llegar en otro orden y se asocian por "id".
+
+Uso:
+- python servicio.py                          (TCP en 127.0.0.1:8765)
+- python servicio.py --unix /tmp/inventario.sock
+- python carga_servicio.py --clientes 50      (generador de carga)
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from estadisticas import Estadisticas
+from indice_nombres import IndiceTrigramas
+from inventario import ARCHIVO_POR_DEFECTO, FORMATOS, Inventario, Producto
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+TAM_LOTE_MAX = 1000
+MAX_EN_VUELO = 128
+LIMITE_LISTAR = 1000
+LIMITE_LINEA = 1 << 20
+
+OPERACIONES_ESCRITURA = ("agregar", "actualizar", "eliminar")
+
+
+class Instantanea:
+    """Estado confirmado para las lecturas. Solo lo toca el bucle de eventos."""
+
+    def __init__(self, productos: Dict[str, Producto]) -> None:
+        self.productos = productos
+        self.nombres = IndiceTrigramas()
+        for p in productos.values():
+            self.nombres.agregar(p.id, p.nombre)
+        self.estadisticas = Estadisticas.construir(productos.values())
+
+    def aplicar(self, id_: str, despues: Optional[Producto]) -> None:
+        antes = self.productos.get(id_)
+        self.estadisticas.aplicar(antes, despues)
+        if despues is None:
+            if antes is not None:
+                del self.productos[id_]
+                self.nombres.eliminar(id_)
+            return
+        self.productos[id_] = despues
+        if antes is None:
+            self.nombres.agregar(id_, despues.nombre)
+        elif antes.nombre != despues.nombre:
+            self.nombres.renombrar(id_, despues.nombre)
+
+
+class ServicioInventario:
+    def __init__(self, ruta_archivo: str, formato: str = "json", tam_lote_max: int = TAM_LOTE_MAX) -> None:
+        self.ruta_archivo = ruta_archivo
+        self.formato = formato
+        self.inv: Optional[Inventario] = None
+        self.tam_lote_max = tam_lote_max
+        # Todo acceso al Inventario ocurre en este único hilo: las transacciones nunca
+        # corren en paralelo y el bloqueo del diario se toma y se suelta en el mismo hilo
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inventario-escritor")
+        self._cola: "asyncio.Queue[Tuple[Dict, asyncio.Future]]" = asyncio.Queue()
+        self._instantanea: Optional[Instantanea] = None
+        self._escritor: Optional[asyncio.Task] = None
+        self.lotes = 0
+        self.escrituras = 0
+
+    async def iniciar(self) -> Tuple[bool, str]:
+        """Abre el inventario en modo diario; falla si otro proceso ya es el escritor."""
+        loop = asyncio.get_running_loop()
+        self.inv = await loop.run_in_executor(
+            self._ejecutor, lambda: Inventario(self.ruta_archivo, usar_diario=True, formato=self.formato)
+        )
+        mensaje = self.inv.mensaje_inicio()
+        if self.inv.solo_lectura:
+            await self.detener()
+            return False, f"{mensaje}\nOtro proceso escribe en '{self.ruta_archivo}'; el servicio necesita ser el único escritor."
+        copias = await loop.run_in_executor(
+            self._ejecutor, lambda: {id_: replace(p) for id_, p in self.inv.productos.items()}
+        )
+        self._instantanea = Instantanea(copias)
+        self._escritor = asyncio.create_task(self._bucle_escritor())
+        return True, mensaje
+
+    async def detener(self) -> None:
+        """Espera a que se confirmen las escrituras encoladas y cierra el inventario."""
+        await self._cola.join()
+        if self._escritor is not None:
+            self._escritor.cancel()
+        if self.inv is not None:
+            await asyncio.get_running_loop().run_in_executor(self._ejecutor, self.inv.cerrar)
+        self._ejecutor.shutdown()
+
+    # ---------------------- Peticiones ----------------------
+    async def atender(self, peticion: Dict) -> Dict:
+        op = peticion.get("op")
+        if op in OPERACIONES_ESCRITURA:
+            futuro = asyncio.get_running_loop().create_future()
+            await self._cola.put((peticion, futuro))
+            ok, mensaje = await futuro
+            return {"ok": ok, "mensaje": mensaje}
+        return self._leer(op, peticion)
+
+    def _leer(self, op: Any, peticion: Dict) -> Dict:
+        inst = self._instantanea
+        if op == "buscar_id":
+            p = inst.productos.get(str(peticion.get("id_producto", "")))
+            if p is None:
+                return {"ok": False, "mensaje": "No se encontró producto con ese ID."}
+            return {"ok": True, "resultado": p.a_dict()}
+        limite = min(max(0, int(peticion.get("limite", LIMITE_LISTAR))), LIMITE_LISTAR)
+        if op == "buscar_nombre":
+            ids = inst.nombres.buscar(str(peticion.get("texto", "")).strip())
+            return {"ok": True, "total": len(ids), "resultado": [inst.productos[i].a_dict() for i in ids[:limite]]}
+        if op == "listar":
+            desde = max(0, int(peticion.get("desde", 0)))
+            pagina = islice(inst.productos.values(), desde, desde + limite)
+            return {"ok": True, "total": len(inst.productos), "resultado": [p.a_dict() for p in pagina]}
+        if op == "estadisticas":
+            return {"ok": True, "resultado": inst.estadisticas.resumen()}
+        if op == "ping":
+            return {"ok": True, "resultado": {"lotes": self.lotes, "escrituras": self.escrituras}}
+        return {"ok": False, "mensaje": f"Operación desconocida: {op!r}."}
+
+    # ---------------------- Escritor ----------------------
+    async def _bucle_escritor(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            while len(lote) < self.tam_lote_max and not self._cola.empty():
+                lote.append(self._cola.get_nowait())
+            try:
+                resultados, cambios = await loop.run_in_executor(
+                    self._ejecutor, self._confirmar_lote, [peticion for peticion, _ in lote]
+                )
+            except Exception as e:  # error inesperado: la transacción ya se revirtió
+                resultados = [(False, f"Error interno: {e}")] * len(lote)
+                cambios = []
+            for id_, despues in cambios:
+                self._instantanea.aplicar(id_, despues)
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+                self._cola.task_done()
+            self.lotes += 1
+            self.escrituras += len(lote)
+
+    def _confirmar_lote(self, peticiones: List[Dict]) -> Tuple[List[Tuple[bool, str]], List[Tuple[str, Optional[Producto]]]]:
+        """
+        Corre en el hilo escritor: aplica el lote en una transacción y devuelve el
+        resultado de cada petición y el estado final (copia o None) de cada id tocado.
+        """
+        resultados: List[Tuple[bool, str]] = []
+        tocados: Dict[str, None] = {}
+        with self.inv.transaccion() as tx:
+            for peticion in peticiones:
+                ok, mensaje, id_ = self._aplicar(peticion)
+                resultados.append((ok, mensaje))
+                if ok:
+                    tocados[id_] = None
+        if not tx.ok:
+            return [(False, tx.mensaje) if ok else (ok, msg) for ok, msg in resultados], []
+        # Al responder el lote ya está guardado
+        resultados = [(ok, msg.replace("pendiente de confirmar", "confirmado")) for ok, msg in resultados]
+        cambios = []
+        for id_ in tocados:
+            p = self.inv.productos.get(id_)
+            cambios.append((id_, None if p is None else replace(p)))
+        return resultados, cambios
+
+    def _aplicar(self, peticion: Dict) -> Tuple[bool, str, str]:
+        op = peticion.get("op")
+        try:
+            if op == "agregar":
+                producto = Producto.desde_dict(peticion.get("producto") or {})
+                if not producto.id or not producto.nombre:
+                    return False, "El producto necesita id y nombre.", ""
+                ok, mensaje = self.inv.agregar(producto)
+                return ok, mensaje, producto.id
+            id_ = str(peticion.get("id_producto", ""))
+            if op == "actualizar":
+                nombre = peticion.get("nombre")
+                cantidad = peticion.get("cantidad")
+                precio = peticion.get("precio")
+                ok, mensaje = self.inv.actualizar(
+                    id_,
+                    nombre=None if nombre is None else str(nombre),
+                    cantidad=None if cantidad is None else int(cantidad),
+                    precio=None if precio is None else float(precio),
+                )
+                return ok, mensaje, id_
+            ok, mensaje = self.inv.eliminar(id_)
+            return ok, mensaje, id_
+        except (TypeError, ValueError, AttributeError) as e:
+            return False, f"Petición inválida: {e}", ""
+
+    # ---------------------- Conexiones ----------------------
+    async def conexion(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        en_vuelo = asyncio.Semaphore(MAX_EN_VUELO)
+        bloqueo_escritura = asyncio.Lock()
+        tareas = set()
+
+        async def responder(linea: bytes) -> None:
+            try:
+                try:
+                    peticion = json.loads(linea)
+                    if not isinstance(peticion, dict):
+                        raise ValueError("se esperaba un objeto JSON")
+                except ValueError as e:
+                    respuesta = {"id": None, "ok": False, "mensaje": f"JSON inválido: {e}"}
+                else:
+                    try:
+                        respuesta = await self.atender(peticion)
+                    except (TypeError, ValueError) as e:
+                        respuesta = {"ok": False, "mensaje": f"Petición inválida: {e}"}
+                    respuesta["id"] = peticion.get("id")
+                datos = json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n"
+                async with bloqueo_escritura:
+                    escritor.write(datos)
+                    await escritor.drain()
+            except ConnectionError:
+                pass
+            finally:
+                en_vuelo.release()
+
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:  # línea más larga que LIMITE_LINEA
+                    break
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                await en_vuelo.acquire()
+                tarea = asyncio.create_task(responder(linea))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+
+async def servir(ruta_archivo: str, formato: str, host: str, puerto: int, unix: Optional[str]) -> int:
+    servicio = ServicioInventario(ruta_archivo, formato)
+    ok, msg = await servicio.iniciar()
+    print(("" if ok else "❌ ") + msg)
+    if not ok:
+        return 1
+    if unix:
+        servidor = await asyncio.start_unix_server(servicio.conexion, path=unix, limit=LIMITE_LINEA)
+        print(f"✅ Servicio escuchando en {unix}")
+    else:
+        servidor = await asyncio.start_server(servicio.conexion, host, puerto, limit=LIMITE_LINEA)
+        print(f"✅ Servicio escuchando en {host}:{puerto}")
+    tarea = asyncio.current_task()
+    try:
+        # SIGTERM detiene el servicio igual que Ctrl+C: se confirman las escrituras encoladas
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, tarea.cancel)
+    except (NotImplementedError, AttributeError):  # Windows
+        pass
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await servicio.detener()
+        print(f"ℹ Servicio detenido ({servicio.escrituras} escrituras en {servicio.lotes} lotes).")
+    return 0
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Servicio local del inventario (JSON por líneas)")
+    parser.add_argument("--archivo", default=ARCHIVO_POR_DEFECTO, help="ruta del inventario")
+    parser.add_argument("--formato", choices=FORMATOS, default="json")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--unix", default=None, help="escuchar en un socket Unix en lugar de TCP")
+    return parser
+
+
+if __name__ == "__main__":
+    args = crear_parser().parse_args()
+    try:
+        sys.exit(asyncio.run(servir(args.archivo, args.formato, args.host, args.puerto, args.unix)))
+    except KeyboardInterrupt:
+        print("\nInterrupción por teclado. Servicio detenido.")
+        sys.exit(130)
@@ -0,0 +1,360 @@
+"""
+Almacenamiento segmentado del inventario.
+
+En lugar de un único pickle con todo el diccionario de productos, el archivo
+elegido por el usuario guarda un manifiesto pequeño y los productos se reparten
+en NUM_SEGMENTOS archivos según un hash de su ID:
+
+    inventario.pkl               manifiesto {segmento: archivo}
+    inventario.pkl.segmentos/    07-12.pkl, 31-12.pkl, ... (segmento-generación)
+
+Cada segmento empieza con un índice {ID: (desplazamiento, nombre)} seguido de
+los productos serializados uno por uno como tuplas (id, nombre, cantidad,
+precio), así que se puede leer un producto sin leer el resto (ver
+ProductosPerezosos). Las tuplas se deserializan bastante más rápido que los
+objetos; `fabrica` (la clase Producto) los vuelve a construir.
+
+El inventario avisa qué IDs cambian y al guardar solo se reescriben los
+segmentos modificados. Cada guardado escribe archivos nuevos (otra generación)
+y al final reemplaza el manifiesto de forma atómica, así que un corte a mitad
+de camino deja el inventario anterior intacto.
+
+Los archivos antiguos (un solo pickle con el diccionario completo) se siguen
+pudiendo cargar; el primer guardado los convierte al formato segmentado.
+"""
+
+import os
+import pickle
+import zlib
+from collections import OrderedDict
+
+NUM_SEGMENTOS = 64
+FORMATO = "inventario-segmentado"
+VERSION_SEGMENTOS = 2  # 1: cada segmento era un pickle con el diccionario {ID: Producto}
+LIMITE_RESIDENTES = 10000
+
+
+def segmento_de(id_producto, num_segmentos=NUM_SEGMENTOS):
+    # crc32 y no hash(): hash() de str cambia entre ejecuciones
+    return zlib.crc32(id_producto.encode("utf-8")) % num_segmentos
+
+
+def _escribir_atomico(ruta, partes):
+    tmp = ruta + ".tmp"
+    with open(tmp, "wb") as f:
+        for parte in partes:
+            f.write(parte)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, ruta)
+
+
+def _serializar_segmento(productos):
+    """(partes a escribir, largo de la cabecera, índice {ID: (desplazamiento, nombre)})."""
+    cuerpos = []
+    indice = {}
+    desplazamiento = 0
+    for id_producto, producto in productos.items():
+        fila = (id_producto, producto.obtener_nombre(), producto.obtener_cantidad(), producto.obtener_precio())
+        datos = pickle.dumps(fila, protocol=pickle.HIGHEST_PROTOCOL)
+        indice[id_producto] = (desplazamiento, producto.obtener_nombre())
+        cuerpos.append(datos)
+        desplazamiento += len(datos)
+    cabecera = pickle.dumps(indice, protocol=pickle.HIGHEST_PROTOCOL)
+    return [cabecera] + cuerpos, len(cabecera), indice
+
+
+def _leer_segmento(ruta, version, fabrica):
+    """Diccionario {ID: Producto} completo de un segmento."""
+    with open(ruta, "rb") as f:
+        if version < 2:
+            return pickle.load(f)
+        indice = pickle.load(f)
+        cuerpos = memoryview(f.read())
+    # Un solo read y loads sobre vistas: mucho más rápido que pickle.load por producto
+    loads = pickle.loads
+    return {id_producto: fabrica(*loads(cuerpos[desplazamiento:])) for id_producto, (desplazamiento, _) in indice.items()}
+
+
+class ProductosPerezosos:
+    """
+    Diccionario {ID: Producto} que al cargar solo lee los índices de los
+    segmentos. Un producto se deserializa la primera vez que se pide y queda en
+    una caché LRU de a lo sumo `limite` productos sin cambios; los productos
+    nuevos o modificados se conservan en memoria hasta guardarlos.
+    """
+
+    def __init__(self, fabrica, limite=LIMITE_RESIDENTES):
+        self._fabrica = fabrica
+        self.limite = limite
+        self._indice = {}                 # {ID: (segmento, desplazamiento, nombre)} de lo que está en disco
+        self._rutas = {}                  # {segmento: archivo del que se leen sus productos}
+        self._bases = {}                  # {segmento: largo de su cabecera}
+        self._residentes = OrderedDict()  # LRU de productos sin cambios
+        self._modificados = {}            # productos nuevos o modificados: no se descartan
+
+    def _leer_indices(self, directorio, manifiesto):
+        for k, nombre in manifiesto.items():
+            self._rutas[k] = os.path.join(directorio, nombre)
+            with open(self._rutas[k], "rb") as f:
+                indice = pickle.load(f)
+                self._bases[k] = f.tell()
+            for id_producto, (desplazamiento, nombre_producto) in indice.items():
+                self._indice[id_producto] = (k, desplazamiento, nombre_producto)
+
+    def _materializar(self, id_producto):
+        k, desplazamiento, _ = self._indice[id_producto]
+        with open(self._rutas[k], "rb") as f:
+            f.seek(self._bases[k] + desplazamiento)
+            producto = self._fabrica(*pickle.load(f))
+        self._residentes[id_producto] = producto
+        if len(self._residentes) > self.limite:
+            self._residentes.popitem(last=False)
+        return producto
+
+    def fijar(self, id_producto):
+        """Marca un producto como modificado para que no salga de memoria antes de guardarlo."""
+        producto = self._residentes.pop(id_producto, None)
+        if producto is not None:
+            self._modificados[id_producto] = producto
+
+    def confirmar_segmento(self, k, ruta, base, indice):
+        """Tras guardar el segmento `k`, sus productos vuelven a leerse del archivo nuevo."""
+        self._rutas[k] = ruta
+        self._bases[k] = base
+        for id_producto, (desplazamiento, nombre) in indice.items():
+            self._indice[id_producto] = (k, desplazamiento, nombre)
+            producto = self._modificados.pop(id_producto, None)
+            if producto is not None:
+                self._residentes[id_producto] = producto
+        while len(self._residentes) > self.limite:
+            self._residentes.popitem(last=False)
+
+    def __len__(self):
+        return len(self._indice) + sum(1 for i in self._modificados if i not in self._indice)
+
+    def __contains__(self, id_producto):
+        return id_producto in self._modificados or id_producto in self._indice
+
+    def __getitem__(self, id_producto):
+        producto = self._modificados.get(id_producto)
+        if producto is not None:
+            return producto
+        producto = self._residentes.get(id_producto)
+        if producto is not None:
+            self._residentes.move_to_end(id_producto)
+            return producto
+        if id_producto not in self._indice:
+            raise KeyError(id_producto)
+        return self._materializar(id_producto)
+
+    def get(self, id_producto, defecto=None):
+        return self[id_producto] if id_producto in self else defecto
+
+    def __setitem__(self, id_producto, producto):
+        self._residentes.pop(id_producto, None)
+        self._modificados[id_producto] = producto
+
+    def __delitem__(self, id_producto):
+        if id_producto not in self:
+            raise KeyError(id_producto)
+        self._indice.pop(id_producto, None)
+        self._residentes.pop(id_producto, None)
+        self._modificados.pop(id_producto, None)
+
+    def __iter__(self):
+        yield from list(self._indice)
+        yield from [i for i in self._modificados if i not in self._indice]
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        for id_producto in self:
+            yield self[id_producto]
+
+    def items(self):
+        for id_producto in self:
+            yield id_producto, self[id_producto]
+
+    def nombres(self):
+        """Pares (ID, nombre) de todos los productos sin deserializarlos."""
+        for id_producto, (_, _, nombre) in self._indice.items():
+            if id_producto not in self._modificados:
+                yield id_producto, nombre
+        for id_producto, producto in self._modificados.items():
+            yield id_producto, producto.obtener_nombre()
+
+
+class AlmacenSegmentado:
+    def __init__(self, fabrica, num_segmentos=NUM_SEGMENTOS):
+        self.fabrica = fabrica        # construye un producto a partir de (id, nombre, cantidad, precio)
+        self.num_segmentos = num_segmentos
+        self.archivo = None           # archivo al que corresponde el estado de abajo
+        self.generacion = 0
+        self.version = VERSION_SEGMENTOS
+        self.manifiesto = {}          # {segmento: nombre de archivo}
+        self.ids_por_segmento = None  # [set de IDs] por segmento; None = desconocido
+        self.sucios = set()
+        self.perezosos = None         # ProductosPerezosos de la última carga perezosa
+
+    # ---------- Seguimiento de cambios ----------
+    def agregado(self, id_producto):
+        k = segmento_de(id_producto, self.num_segmentos)
+        if self.ids_por_segmento is not None:
+            self.ids_por_segmento[k].add(id_producto)
+        self.sucios.add(k)
+
+    def modificado(self, id_producto):
+        if self.perezosos is not None:
+            self.perezosos.fijar(id_producto)
+        self.sucios.add(segmento_de(id_producto, self.num_segmentos))
+
+    def eliminado(self, id_producto):
+        k = segmento_de(id_producto, self.num_segmentos)
+        if self.ids_por_segmento is not None:
+            self.ids_por_segmento[k].discard(id_producto)
+        self.sucios.add(k)
+
+    # ---------- Carga ----------
+    @staticmethod
+    def directorio_de(archivo):
+        return archivo + ".segmentos"
+
+    @staticmethod
+    def es_manifiesto(datos):
+        return isinstance(datos, dict) and datos.get("formato") == FORMATO
+
+    def _olvidar(self):
+        self.archivo = None
+        self.manifiesto = {}
+        self.ids_por_segmento = None
+        self.sucios = set()
+        self.perezosos = None
+
+    def _leer_manifiesto(self, archivo):
+        """El manifiesto, o None si `archivo` es un pickle antiguo (que se devuelve aparte)."""
+        with open(archivo, "rb") as f:
+            datos = pickle.load(f)
+        if not self.es_manifiesto(datos):
+            return None, datos
+        return datos, None
+
+    def _adoptar(self, archivo, manifiesto, ids_por_segmento, perezosos=None):
+        """
+        Pasa a corresponder a `archivo`. Se llama recién cuando todos sus segmentos
+        se leyeron: si la carga falla, el estado sigue siendo el de la carga o
+        guardado anterior y el próximo guardado no mezcla los dos archivos.
+        """
+        self.archivo = archivo
+        self.num_segmentos = manifiesto["num_segmentos"]
+        self.generacion = manifiesto["generacion"]
+        self.version = manifiesto.get("version", 1)
+        self.manifiesto = dict(manifiesto["segmentos"])
+        self.ids_por_segmento = ids_por_segmento
+        self.sucios = set()
+        self.perezosos = perezosos
+
+    def cargar(self, archivo):
+        """Devuelve el diccionario {ID: Producto}. Lanza FileNotFoundError si no existe."""
+        manifiesto, antiguo = self._leer_manifiesto(archivo)
+        if manifiesto is None:
+            # Formato antiguo: todo el diccionario en un solo pickle
+            self._olvidar()
+            return antiguo
+        directorio = self.directorio_de(archivo)
+        version = manifiesto.get("version", 1)
+        productos = {}
+        ids_por_segmento = [set() for _ in range(manifiesto["num_segmentos"])]
+        for k, nombre in manifiesto["segmentos"].items():
+            segmento = _leer_segmento(os.path.join(directorio, nombre), version, self.fabrica)
+            productos.update(segmento)
+            ids_por_segmento[k].update(segmento)
+        self._adoptar(archivo, manifiesto, ids_por_segmento)
+        return productos
+
+    def cargar_perezoso(self, archivo, limite=LIMITE_RESIDENTES):
+        """
+        Como `cargar`, pero solo lee los índices de los segmentos y devuelve un
+        ProductosPerezosos. Los pickles antiguos y los segmentos sin índice se
+        cargan completos (devuelve un dict normal).
+        """
+        manifiesto, antiguo = self._leer_manifiesto(archivo)
+        if manifiesto is None:
+            self._olvidar()
+            return antiguo
+        if manifiesto.get("version", 1) < 2:
+            return self.cargar(archivo)
+        perezosos = ProductosPerezosos(self.fabrica, limite)
+        perezosos._leer_indices(self.directorio_de(archivo), manifiesto["segmentos"])
+        ids_por_segmento = [set() for _ in range(manifiesto["num_segmentos"])]
+        for id_producto, (k, _, _) in perezosos._indice.items():
+            ids_por_segmento[k].add(id_producto)
+        self._adoptar(archivo, manifiesto, ids_por_segmento, perezosos)
+        return perezosos
+
+    # ---------- Guardado ----------
+    def guardar(self, productos, archivo):
+        """
+        Escribe los segmentos modificados y luego el manifiesto. Si `archivo` no
+        es el último cargado o guardado, se escriben todos los segmentos.
+        Devuelve cuántos segmentos se reescribieron.
+        """
+        directorio = self.directorio_de(archivo)
+        os.makedirs(directorio, exist_ok=True)
+        if archivo != self.archivo or self.ids_por_segmento is None or self.version < VERSION_SEGMENTOS:
+            self._reiniciar(productos, archivo)
+        generacion = self.generacion + 1
+        manifiesto = dict(self.manifiesto)
+        escritos = {}
+        for k in sorted(self.sucios):
+            ids = self.ids_por_segmento[k]
+            if not ids:
+                manifiesto.pop(k, None)
+                continue
+            nombre = f"{k:02d}-{generacion}.pkl"
+            partes, base, indice = _serializar_segmento({i: productos[i] for i in ids})
+            _escribir_atomico(os.path.join(directorio, nombre), partes)
+            manifiesto[k] = nombre
+            escritos[k] = (os.path.join(directorio, nombre), base, indice)
+        _escribir_atomico(archivo, [pickle.dumps({
+            "formato": FORMATO,
+            "version": VERSION_SEGMENTOS,
+            "num_segmentos": self.num_segmentos,
+            "generacion": generacion,
+            "segmentos": manifiesto,
+        }, protocol=pickle.HIGHEST_PROTOCOL)])
+        # El manifiesto nuevo ya es el vigente: borrar los segmentos que dejó de usar
+        en_uso = set(manifiesto.values())
+        for nombre in os.listdir(directorio):
+            if nombre not in en_uso:
+                try:
+                    os.remove(os.path.join(directorio, nombre))
+                except OSError:
+                    pass  # se reintenta en el próximo guardado
+        self.archivo = archivo
+        self.generacion = generacion
+        self.version = VERSION_SEGMENTOS
+        self.manifiesto = manifiesto
+        self.sucios = set()
+        if self.perezosos is not None and productos is self.perezosos:
+            for k, (ruta, base, indice) in escritos.items():
+                self.perezosos.confirmar_segmento(k, ruta, base, indice)
+        return len(escritos)
+
+    def _reiniciar(self, productos, archivo):
+        """Prepara un guardado completo en `archivo` (otro destino o datos sin segmentar)."""
+        self.ids_por_segmento = [set() for _ in range(self.num_segmentos)]
+        for id_producto in productos:
+            self.ids_por_segmento[segmento_de(id_producto, self.num_segmentos)].add(id_producto)
+        self.sucios = set(range(self.num_segmentos))
+        self.manifiesto = {}
+        # Continuar la numeración del destino para no pisar archivos que su manifiesto aún usa
+        self.generacion = 0
+        try:
+            with open(archivo, "rb") as f:
+                datos = pickle.load(f)
+            if self.es_manifiesto(datos):
+                self.generacion = datos["generacion"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
@@ -0,0 +1,102 @@
+"""
+Estadísticas del inventario actualizadas en cada cambio.
+
+La primera consulta recorre los productos una vez (con carga perezosa eso lee
+cada producto del archivo, pero la caché LRU sigue limitando la memoria). Desde
+ahí el inventario llama a `agregar` y `quitar` en cada alta, baja o
+actualización, y los totales se ajustan en O(1):
+
+    productos, unidades, valor total, precio promedio, productos por tramo
+
+Los precios se guardan también en una lista ordenada (bisect), así el mínimo y
+el máximo son el primer y el último elemento.
+"""
+
+import math
+from bisect import bisect_left, bisect_right, insort
+
+TRAMOS_PRECIO = (1, 5, 10, 50, 100, 500, 1000)
+
+
+class Estadisticas:
+    def __init__(self):
+        self.productos = 0
+        self.unidades = 0
+        self.valor_total = 0.0
+        self._suma_precios = 0.0
+        self._precios = []  # ordenados, con repetidos
+        self._por_tramo = [0] * (len(TRAMOS_PRECIO) + 1)
+
+    @classmethod
+    def construir(cls, productos):
+        est = cls()
+        for producto in productos:
+            est.agregar(producto)
+        return est
+
+    def agregar(self, producto):
+        self._sumar(producto, 1)
+        insort(self._precios, producto.obtener_precio())
+
+    def quitar(self, producto):
+        self._sumar(producto, -1)
+        del self._precios[bisect_left(self._precios, producto.obtener_precio())]
+
+    def _sumar(self, producto, signo):
+        cantidad, precio = producto.obtener_cantidad(), producto.obtener_precio()
+        self.productos += signo
+        self.unidades += signo * cantidad
+        self.valor_total += signo * cantidad * precio
+        self._suma_precios += signo * precio
+        self._por_tramo[bisect_right(TRAMOS_PRECIO, precio)] += signo
+
+    def precio_promedio(self):
+        return self._suma_precios / self.productos if self.productos else None
+
+    def precio_minimo(self):
+        return self._precios[0] if self._precios else None
+
+    def precio_maximo(self):
+        return self._precios[-1] if self._precios else None
+
+    def por_tramo(self):
+        """Pares (tramo de precio, productos), p. ej. ('10-50', 42)."""
+        etiquetas = [f"<{TRAMOS_PRECIO[0]}"]
+        etiquetas += [f"{a}-{b}" for a, b in zip(TRAMOS_PRECIO, TRAMOS_PRECIO[1:])]
+        etiquetas.append(f">={TRAMOS_PRECIO[-1]}")
+        return list(zip(etiquetas, self._por_tramo))
+
+    def resumen(self):
+        return {
+            "productos": self.productos,
+            "unidades": self.unidades,
+            "valor_total": self.valor_total,
+            "precio_promedio": self.precio_promedio(),
+            "precio_minimo": self.precio_minimo(),
+            "precio_maximo": self.precio_maximo(),
+            "por_tramo": self.por_tramo(),
+        }
+
+    def diferencias(self, productos):
+        """Recalcula todo recorriendo `productos` y describe cada total que no coincide."""
+        esperado = Estadisticas.construir(productos).resumen()
+        diferencias = []
+        for clave, actual in self.resumen().items():
+            valor = esperado[clave]
+            if isinstance(valor, float) and isinstance(actual, float):
+                iguales = math.isclose(valor, actual, rel_tol=1e-9, abs_tol=1e-6)
+            else:
+                iguales = valor == actual
+            if not iguales:
+                diferencias.append(f"{clave}: se esperaba {valor}, hay {actual}")
+        return diferencias
+
+    def mostrar(self):
+        if not self.productos:
+            print("📦 El inventario está vacío.")
+            return
+        print(f"📊 Productos: {self.productos} | Unidades: {self.unidades} | Valor total: {self.valor_total:.2f}")
+        print(f"   Precio promedio: {self.precio_promedio():.2f} | "
+              f"Mínimo: {self.precio_minimo():.2f} | Máximo: {self.precio_maximo():.2f}")
+        for tramo, n in self.por_tramo():
+            print(f"   {tramo:>10}: {n}")
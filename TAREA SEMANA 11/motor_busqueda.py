@@ -0,0 +1,198 @@
+"""
+Motor de búsqueda por nombre para el inventario.
+
+- Índice invertido palabra -> IDs, construido una vez y actualizado en cada
+  alta o baja (no se recorre todo el inventario en cada búsqueda).
+- Vocabulario ordenado para buscar por prefijo ("tecl" encuentra "teclado").
+- BK-tree sobre el vocabulario para tolerar errores de tipeo (distancia de
+  edición de hasta 1 o 2 según el largo de la palabra buscada).
+- Como la búsqueda anterior, el texto también se busca dentro del nombre
+  completo ("riol" encuentra "Cuaderno Ferriol") y una búsqueda vacía lista
+  todo; esas coincidencias van al final.
+- Resultados ordenados por relevancia: palabra exacta > prefijo > parecida > subcadena.
+- Caché LRU de consultas recientes, que se vacía cuando cambia el índice.
+- Paginación: solo se ordenan y devuelven los resultados de la página pedida.
+"""
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict, namedtuple
+
+TAM_CACHE = 256
+POR_PAGINA = 20
+
+PUNTAJE_EXACTO = 1.0
+PUNTAJE_PREFIJO = 0.8
+PUNTAJE_PARECIDO = {1: 0.6, 2: 0.4}
+PUNTAJE_SUBCADENA = 0.2
+
+PaginaResultados = namedtuple("PaginaResultados", "resultados total pagina por_pagina")
+
+_SEPARADORES = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes: 'Café Molido' -> 'cafe molido'."""
+    if texto.isascii():
+        return texto.lower()
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def palabras(texto):
+    return [p for p in _SEPARADORES.split(normalizar(texto)) if p]
+
+
+def distancia_maxima(palabra):
+    if len(palabra) <= 2:
+        return 0
+    return 1 if len(palabra) <= 5 else 2
+
+
+def distancia_edicion(a, b, maximo):
+    """Distancia de Levenshtein entre a y b, o maximo + 1 si la supera."""
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior = actual
+    return anterior[-1]
+
+
+class ArbolBK:
+    """BK-tree: encuentra las palabras a distancia <= k sin compararlas todas."""
+
+    def __init__(self):
+        self._raiz = None  # [palabra, {distancia: nodo hijo}]
+
+    def agregar(self, palabra):
+        if self._raiz is None:
+            self._raiz = [palabra, {}]
+            return
+        nodo = self._raiz
+        while True:
+            d = distancia_edicion(palabra, nodo[0], max(len(palabra), len(nodo[0])))
+            if d == 0:
+                return
+            hijo = nodo[1].get(d)
+            if hijo is None:
+                nodo[1][d] = [palabra, {}]
+                return
+            nodo = hijo
+
+    def buscar(self, palabra, k):
+        """Pares (palabra, distancia) con distancia <= k."""
+        if self._raiz is None:
+            return []
+        encontradas = []
+        pendientes = [self._raiz]
+        while pendientes:
+            texto, hijos = pendientes.pop()
+            d = distancia_edicion(palabra, texto, max(len(palabra), len(texto)))
+            if d <= k:
+                encontradas.append((texto, d))
+            # Desigualdad triangular: solo los hijos a distancia d-k..d+k pueden servir
+            for dist_hijo, hijo in hijos.items():
+                if d - k <= dist_hijo <= d + k:
+                    pendientes.append(hijo)
+        return encontradas
+
+
+class MotorBusqueda:
+    def __init__(self, tam_cache=TAM_CACHE):
+        self._ids_por_palabra = {}   # palabra -> set de IDs
+        self._vocabulario = []       # palabras ordenadas (para prefijos)
+        self._arbol = ArbolBK()
+        self._nombres = {}           # ID -> nombre normalizado (para subcadenas)
+        self._cache = OrderedDict()
+        self.tam_cache = tam_cache
+
+    @classmethod
+    def construir(cls, pares_id_nombre):
+        motor = cls()
+        for id_producto, nombre in pares_id_nombre:
+            motor.agregar(id_producto, nombre)
+        return motor
+
+    # ---------- Mantenimiento ----------
+    def agregar(self, id_producto, nombre):
+        self._nombres[id_producto] = normalizar(nombre)
+        for palabra in set(palabras(nombre)):
+            ids = self._ids_por_palabra.get(palabra)
+            if ids is None:
+                ids = self._ids_por_palabra[palabra] = set()
+                insort(self._vocabulario, palabra)
+                self._arbol.agregar(palabra)
+            ids.add(id_producto)
+        self._cache.clear()
+
+    def eliminar(self, id_producto, nombre):
+        # Las palabras sin IDs quedan en el vocabulario y el árbol; se ignoran al buscar
+        self._nombres.pop(id_producto, None)
+        for palabra in set(palabras(nombre)):
+            ids = self._ids_por_palabra.get(palabra)
+            if ids is not None:
+                ids.discard(id_producto)
+        self._cache.clear()
+
+    # ---------- Consulta ----------
+    def _candidatas(self, consulta):
+        """{palabra del vocabulario: puntaje} para una palabra de la consulta."""
+        puntajes = {}
+        i = bisect_left(self._vocabulario, consulta)
+        while i < len(self._vocabulario) and self._vocabulario[i].startswith(consulta):
+            palabra = self._vocabulario[i]
+            puntajes[palabra] = PUNTAJE_EXACTO if palabra == consulta else PUNTAJE_PREFIJO
+            i += 1
+        k = distancia_maxima(consulta)
+        if k:
+            for palabra, d in self._arbol.buscar(consulta, k):
+                if d > 0 and palabra not in puntajes:
+                    puntajes[palabra] = PUNTAJE_PARECIDO[d]
+        return puntajes
+
+    def _puntajes(self, texto):
+        """{ID: puntaje}: por cada palabra buscada suma la mejor coincidencia del producto."""
+        total = {}
+        for consulta in set(palabras(texto)):
+            mejor = {}
+            for palabra, puntaje in self._candidatas(consulta).items():
+                for id_producto in self._ids_por_palabra.get(palabra, ()):
+                    if puntaje > mejor.get(id_producto, 0.0):
+                        mejor[id_producto] = puntaje
+            for id_producto, puntaje in mejor.items():
+                total[id_producto] = total.get(id_producto, 0.0) + puntaje
+        # Subcadena del nombre completo: recorre los nombres, pero la caché evita repetirlo
+        subcadena = normalizar(texto).strip()
+        for id_producto, nombre in self._nombres.items():
+            if id_producto not in total and subcadena in nombre:
+                total[id_producto] = PUNTAJE_SUBCADENA
+        return total
+
+    def buscar(self, texto, pagina=1, por_pagina=POR_PAGINA):
+        """
+        PaginaResultados con los IDs de la página pedida (la primera es 1),
+        ordenados por relevancia y luego por ID, y el total de coincidencias.
+        """
+        pagina = max(1, pagina)
+        clave = (normalizar(texto).strip(), pagina, por_pagina)
+        resultado = self._cache.get(clave)
+        if resultado is not None:
+            self._cache.move_to_end(clave)
+            return resultado
+        puntajes = self._puntajes(texto)
+        # nsmallest ordena solo hasta el final de la página, no todas las coincidencias
+        primeros = heapq.nsmallest(pagina * por_pagina, puntajes.items(), key=lambda par: (-par[1], par[0]))
+        ids = [id_producto for id_producto, _ in primeros[(pagina - 1) * por_pagina:]]
+        resultado = PaginaResultados(ids, len(puntajes), pagina, por_pagina)
+        self._cache[clave] = resultado
+        if len(self._cache) > self.tam_cache:
+            self._cache.popitem(last=False)
+        return resultado
@@ -1,5 +1,9 @@
 import pickle
 
+from almacen_segmentado import LIMITE_RESIDENTES, AlmacenSegmentado, ProductosPerezosos
+from estadisticas import Estadisticas
+from motor_busqueda import POR_PAGINA, MotorBusqueda
+
 class Producto:
     def __init__(self, id_producto, nombre, cantidad, precio):
         self.id_producto = str(id_producto)  # ahora siempre será texto
@@ -32,16 +36,32 @@ class Producto:
 class Inventario:
     def __init__(self):
         self.productos = {}  # Diccionario {ID: Producto}
+        # Guarda solo los segmentos con cambios (ver almacen_segmentado.py)
+        self._almacen = AlmacenSegmentado(Producto)
+        # Índice de búsqueda por nombre: se construye en la primera búsqueda
+        self._motor = None
+        # Totales: se calculan en la primera consulta y luego se ajustan
+        self._estadisticas = None
 
     def agregar_producto(self, producto):
         if producto.obtener_id() not in self.productos:
             self.productos[producto.obtener_id()] = producto
+            self._almacen.agregado(producto.obtener_id())
+            if self._motor is not None:
+                self._motor.agregar(producto.obtener_id(), producto.obtener_nombre())
+            if self._estadisticas is not None:
+                self._estadisticas.agregar(producto)
         else:
             print(f"⚠️ Producto con ID '{producto.obtener_id()}' ya existe.")
 
     def eliminar_producto(self, id_producto):
         if id_producto in self.productos:
+            if self._motor is not None:
+                self._motor.eliminar(id_producto, self.productos[id_producto].obtener_nombre())
+            if self._estadisticas is not None:
+                self._estadisticas.quitar(self.productos[id_producto])
             del self.productos[id_producto]
+            self._almacen.eliminado(id_producto)
             print(f"✅ Producto '{id_producto}' eliminado.")
         else:
             print(f"⚠️ Producto con ID '{id_producto}' no encontrado.")
@@ -49,19 +69,58 @@ class Inventario:
     def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None):
         if id_producto in self.productos:
             producto = self.productos[id_producto]
+            if self._estadisticas is not None:
+                self._estadisticas.quitar(producto)
             if nueva_cantidad is not None:
                 producto.establecer_cantidad(nueva_cantidad)
             if nuevo_precio is not None:
                 producto.establecer_precio(nuevo_precio)
+            if self._estadisticas is not None:
+                self._estadisticas.agregar(producto)
+            self._almacen.modificado(id_producto)
             print(f"✅ Producto '{id_producto}' actualizado.")
         else:
             print(f"⚠️ Producto con ID '{id_producto}' no encontrado.")
 
+    def estadisticas(self):
+        """Totales del inventario (ver estadisticas.py); se calculan en la primera consulta."""
+        if self._estadisticas is None:
+            self._estadisticas = Estadisticas.construir(self.productos.values())
+        return self._estadisticas
+
+    def verificar_estadisticas(self):
+        """Compara con un recorrido completo; si algo no coincide, se recalculan."""
+        diferencias = self.estadisticas().diferencias(self.productos.values())
+        if diferencias:
+            self._estadisticas = None
+        return diferencias
+
+    def _motor_busqueda(self):
+        if self._motor is None:
+            if isinstance(self.productos, ProductosPerezosos):
+                # Con carga perezosa los nombres salen del índice, sin leer los productos
+                pares = self.productos.nombres()
+            else:
+                pares = ((id_producto, p.obtener_nombre()) for id_producto, p in self.productos.items())
+            self._motor = MotorBusqueda.construir(pares)
+        return self._motor
+
+    def buscar(self, texto, pagina=1, por_pagina=POR_PAGINA):
+        """
+        Busca por palabras del nombre, por prefijo, con tolerancia a errores de
+        tipeo y como texto dentro del nombre (vacío: todos). Devuelve una PaginaResultados con los productos de la página
+        pedida ordenados por relevancia y el total de coincidencias.
+        """
+        encontrados = self._motor_busqueda().buscar(texto, pagina, por_pagina)
+        return encontrados._replace(resultados=[self.productos[i] for i in encontrados.resultados])
+
     def buscar_producto(self, nombre):
-        resultados = [producto for producto in self.productos.values() if nombre.lower() in producto.obtener_nombre().lower()]
-        if resultados:
-            for producto in resultados:
+        pagina = self.buscar(nombre)
+        if pagina.resultados:
+            for producto in pagina.resultados:
                 print(producto)
+            if pagina.total > len(pagina.resultados):
+                print(f"... y {pagina.total - len(pagina.resultados)} coincidencias más.")
         else:
             print("⚠️ No se encontraron productos con ese nombre.")
 
@@ -73,17 +132,29 @@ class Inventario:
             print("📦 El inventario está vacío.")
 
     def guardar_inventario(self, archivo):
-        with open(archivo, 'wb') as f:
-            pickle.dump(self.productos, f)
-        print(f"💾 Inventario guardado en '{archivo}'.")
-
-    def cargar_inventario(self, archivo):
+        # Solo se reescriben los segmentos que cambiaron desde la última carga o guardado
+        escritos = self._almacen.guardar(self.productos, archivo)
+        print(f"💾 Inventario guardado en '{archivo}' ({escritos} de {self._almacen.num_segmentos} segmentos reescritos).")
+
+    def cargar_inventario(self, archivo, perezoso=False, limite=LIMITE_RESIDENTES):
+        """
+        Con perezoso=True solo se leen los índices de los segmentos: cada producto
+        se lee del archivo al consultarlo, y en memoria quedan a lo sumo `limite`
+        productos sin cambios más los modificados pendientes de guardar.
+        """
         try:
-            with open(archivo, 'rb') as f:
-                self.productos = pickle.load(f)
+            # Acepta también el formato antiguo de un solo pickle
+            if perezoso:
+                self.productos = self._almacen.cargar_perezoso(archivo, limite)
+            else:
+                self.productos = self._almacen.cargar(archivo)
+            self._motor = None
+            self._estadisticas = None
             print(f"📂 Inventario cargado desde '{archivo}'.")
         except FileNotFoundError:
             print(f"⚠️ El archivo '{archivo}' no existe.")
+        except (pickle.UnpicklingError, EOFError, KeyError) as e:
+            print(f"⚠️ El archivo '{archivo}' está dañado o incompleto: {e}")
 
 
 def mostrar_menu():
@@ -95,6 +166,7 @@ def mostrar_menu():
     print("5. Mostrar inventario")
     print("6. Guardar inventario")
     print("7. Cargar inventario")
+    print("E. Estadísticas")
     print("8. Salir")
 
 
@@ -146,7 +218,11 @@ def menu():
 
         elif opcion == "7":
             archivo = input("Nombre del archivo para cargar el inventario: ")
-            inventario.cargar_inventario(archivo)
+            perezoso = input("¿Cargar solo el índice y leer los productos al usarlos? (s/N): ").strip().lower() == "s"
+            inventario.cargar_inventario(archivo, perezoso)
+
+        elif opcion.strip().upper() == "E":
+            inventario.estadisticas().mostrar()
 
         elif opcion == "8":
             print("👋 Saliendo...")
@@ -0,0 +1,27 @@
+"""
+Esta carpeta usa el código de InventarioApp en lugar de una copia.
+
+`cargar(nombre)` importa `InventarioApp/<nombre>.py` con el nombre
+"InventarioApp.<nombre>", para que no choque con los módulos de igual nombre
+de esta carpeta (inventario.py, producto.py, interfaz.py), que solo reexportan
+lo que cargan. Los módulos que existen solo allá (guardado, tabla_virtual...)
+se importan directamente porque la carpeta queda en sys.path.
+"""
+import importlib.util
+import os
+import sys
+
+CARPETA = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "InventarioApp"))
+if CARPETA not in sys.path:
+    sys.path.append(CARPETA)
+
+
+def cargar(nombre):
+    completo = f"InventarioApp.{nombre}"
+    modulo = sys.modules.get(completo)
+    if modulo is None:
+        spec = importlib.util.spec_from_file_location(completo, os.path.join(CARPETA, f"{nombre}.py"))
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules[completo] = modulo
+        spec.loader.exec_module(modulo)
+    return modulo
@@ -1,22 +1,4 @@
-# Clase que representa un producto del inventario
-class Producto:
-    def __init__(self, id_producto, nombre, cantidad, precio):
-        self.id_producto = id_producto
-        self.nombre = nombre
-        self.cantidad = cantidad
-        self.precio = precio
+# El Producto es el de InventarioApp (ver compartido.py)
+from compartido import cargar
 
-    def __str__(self):
-        return f"{self.id_producto} - {self.nombre} | Cantidad: {self.cantidad} | Precio: ${self.precio:.2f}"
-
-    def get_id(self):
-        return self.id_producto
-
-    def set_nombre(self, nombre):
-        self.nombre = nombre
-
-    def set_cantidad(self, cantidad):
-        self.cantidad = cantidad
-
-    def set_precio(self, precio):
-        self.precio = precio
+Producto = cargar("producto").Producto
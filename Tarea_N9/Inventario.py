@@ -1,6 +1,16 @@
 # inventario.py
-from dataclasses import dataclass
-from typing import List, Optional
+import argparse
+from dataclasses import dataclass, replace
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional
+
+from estadisticas import Estadisticas
+
+TAM_PAGINA = 20
+CAMPOS_ORDEN = ("id", "nombre", "cantidad", "precio")
+
+# Formato de una fila, compilado una sola vez y reutilizado en cada listado
+formatear_fila = "ID: {} | Nombre: {} | Cantidad: {} | Precio: {:.2f}".format
 
 # ===========================
 # Clase Producto
@@ -13,57 +23,139 @@ class Producto:
     precio: float
 
     def __str__(self) -> str:
-        return f"ID: {self.id} | Nombre: {self.nombre} | Cantidad: {self.cantidad} | Precio: {self.precio:.2f}"
+        return formatear_fila(self.id, self.nombre, self.cantidad, self.precio)
 
 
 # ===========================
 # Clase Inventario
 # ===========================
 class Inventario:
+    # Compactar la lista cuando los huecos superan esta fracción (y este mínimo)
+    FRACCION_COMPACTAR = 0.5
+    MINIMO_COMPACTAR = 64
+
     def __init__(self) -> None:
-        self._productos: List[Producto] = []
+        # Orden de inserción; un producto eliminado deja un hueco (None) hasta compactar
+        self._productos: List[Optional[Producto]] = []
+        # ID en minúsculas -> posición en la lista
+        self._indice: Dict[str, int] = {}
+        self._huecos = 0
+        # Campo (None = orden de alta) -> productos vivos en ese orden; se arma al paginar
+        # y se descarta con los cambios que lo alteran, así cada página solo recorta
+        self._vistas: Dict[Optional[str], List[Producto]] = {}
+        # Totales (ver estadisticas.py): se calculan en la primera consulta y luego se ajustan
+        self._estadisticas: Optional[Estadisticas] = None
 
     # Asegura ID único
     def agregar_producto(self, p: Producto) -> bool:
-        if self._buscar_por_id(p.id) is not None:
+        clave = self._clave(p.id)
+        if clave in self._indice:
             return False
+        self._indice[clave] = len(self._productos)
         self._productos.append(p)
+        self._ajustar_estadisticas(None, p)
+        self._vistas.clear()
         return True
 
     def eliminar_por_id(self, id_: str) -> bool:
-        p = self._buscar_por_id(id_)
-        if p is None:
+        pos = self._indice.pop(self._clave(id_), None)
+        if pos is None:
             return False
-        self._productos.remove(p)
+        self._ajustar_estadisticas(self._productos[pos], None)
+        self._productos[pos] = None
+        self._huecos += 1
+        self._vistas.clear()
+        if self._huecos >= self.MINIMO_COMPACTAR and self._huecos > len(self._productos) * self.FRACCION_COMPACTAR:
+            self._compactar()
         return True
 
     def actualizar_cantidad(self, id_: str, nueva_cantidad: int) -> bool:
         p = self._buscar_por_id(id_)
         if p is None:
             return False
+        if self._estadisticas is not None:
+            self._ajustar_estadisticas(p, replace(p, cantidad=nueva_cantidad))
         p.cantidad = nueva_cantidad
+        self._vistas.pop("cantidad", None)
         return True
 
     def actualizar_precio(self, id_: str, nuevo_precio: float) -> bool:
         p = self._buscar_por_id(id_)
         if p is None:
             return False
+        if self._estadisticas is not None:
+            self._ajustar_estadisticas(p, replace(p, precio=nuevo_precio))
         p.precio = nuevo_precio
+        self._vistas.pop("precio", None)
         return True
 
     def buscar_por_nombre(self, texto: str) -> List[Producto]:
         needle = texto.strip().lower()
-        return [p for p in self._productos if needle in p.nombre.lower()]
+        return [p for p in self._productos if p is not None and needle in p.nombre.lower()]
 
     def listar_todos(self) -> List[Producto]:
-        return list(self._productos)
+        return [p for p in self._productos if p is not None]
+
+    def iterar(self, ordenar_por: Optional[str] = None, desde: int = 0) -> Iterator[Producto]:
+        """Recorre los productos desde la posición `desde` (en orden de alta si no se ordena)."""
+        vista = self._vista(ordenar_por)
+        return (vista[i] for i in range(desde, len(vista)))
+
+    def pagina(self, desde: int = 0, tam: int = TAM_PAGINA, ordenar_por: Optional[str] = None) -> List[Producto]:
+        """Los `tam` productos a partir de la posición `desde`."""
+        return self._vista(ordenar_por)[desde:desde + tam]
+
+    def estadisticas(self) -> Estadisticas:
+        if self._estadisticas is None:
+            self._estadisticas = Estadisticas.construir(self.iterar())
+        return self._estadisticas
+
+    def verificar_estadisticas(self) -> List[str]:
+        """Compara los totales con un recorrido completo; si algo no coincide, se recalculan."""
+        diferencias = self.estadisticas().diferencias(self.iterar())
+        if diferencias:
+            self._estadisticas = None
+        return diferencias
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    # --- helpers privados ---
+    @staticmethod
+    def _clave_orden(campo: str) -> attrgetter:
+        if campo not in CAMPOS_ORDEN:
+            raise ValueError(f"No se puede ordenar por {campo!r}; opciones: {', '.join(CAMPOS_ORDEN)}")
+        return attrgetter(campo)
+
+    @staticmethod
+    def _clave(id_: str) -> str:
+        # Los IDs no distinguen mayúsculas de minúsculas
+        return id_.lower()
 
-    # --- helper privado ---
     def _buscar_por_id(self, id_: str) -> Optional[Producto]:
-        for p in self._productos:
-            if p.id.lower() == id_.lower():
-                return p
-        return None
+        pos = self._indice.get(self._clave(id_))
+        return None if pos is None else self._productos[pos]
+
+    def _vista(self, campo: Optional[str]) -> List[Producto]:
+        """Productos vivos en el orden pedido; se ordena una vez por campo y se reutiliza."""
+        if campo is None and not self._huecos:
+            return self._productos  # sin huecos, la lista ya está en orden de alta
+        vista = self._vistas.get(campo)
+        if vista is None:
+            vivos = (p for p in self._productos if p is not None)
+            vista = list(vivos) if campo is None else sorted(vivos, key=self._clave_orden(campo))
+            self._vistas[campo] = vista
+        return vista
+
+    def _ajustar_estadisticas(self, antes: Optional[Producto], despues: Optional[Producto]) -> None:
+        if self._estadisticas is not None:
+            self._estadisticas.aplicar(antes, despues)
+
+    def _compactar(self) -> None:
+        """Quita los huecos conservando el orden y recalcula las posiciones del índice."""
+        self._productos = [p for p in self._productos if p is not None]
+        self._indice = {self._clave(p.id): i for i, p in enumerate(self._productos)}
+        self._huecos = 0
 
 
 # ===========================
@@ -98,6 +190,7 @@ def mostrar_menu() -> None:
     print("4) Actualizar PRECIO por ID")
     print("5) Buscar producto(s) por NOMBRE")
     print("6) Mostrar todos los productos")
+    print("7) Estadísticas del inventario")
     print("0) Salir")
 
 def opcion_agregar(inv: Inventario) -> None:
@@ -139,15 +232,58 @@ def opcion_buscar_nombre(inv: Inventario) -> None:
 
 def opcion_listar_todos(inv: Inventario) -> None:
     print("-- Listado de productos --")
-    lista = inv.listar_todos()
-    if not lista:
+    total = len(inv)
+    if not total:
         print("Inventario vacío.")
-    else:
-        for p in lista:
-            print(p)
+        return
+    campo = input(f"Ordenar por ({'/'.join(CAMPOS_ORDEN)}; Enter = orden de alta): ").strip().lower() or None
+    if campo is not None and campo not in CAMPOS_ORDEN:
+        print("Campo no válido; se lista en orden de alta.")
+        campo = None
+    desde = 0
+    while True:
+        # Solo se formatea la página visible
+        productos = inv.pagina(desde, TAM_PAGINA, campo)
+        print("\n".join(formatear_fila(p.id, p.nombre, p.cantidad, p.precio) for p in productos))
+        print(f"Mostrando {desde + 1}-{desde + len(productos)} de {total}")
+        if desde + len(productos) >= total:
+            break
+        r = input("Enter = siguiente página, número = ir a esa posición, q = volver: ").strip().lower()
+        if r == "q":
+            break
+        if r.isdigit():
+            desde = min(max(int(r), 1), total) - 1
+        else:
+            desde += len(productos)
+
+def opcion_estadisticas(inv: Inventario) -> None:
+    print("-- Estadísticas --")
+    est = inv.estadisticas()
+    if not est.productos:
+        print("Inventario vacío.")
+        return
+    print(f"Productos: {est.productos} | Unidades: {est.unidades} | Valor total: {est.valor_total:.2f}")
+    print(f"Precio promedio: {est.precio_promedio:.2f} | Mínimo: {est.precio_minimo:.2f} | Máximo: {est.precio_maximo:.2f}")
+    for tramo, n in est.por_tramo():
+        print(f"  {tramo:>10}: {n}")
 
 def main() -> None:
-    inv = Inventario()
+    parser = argparse.ArgumentParser(description="Sistema de inventarios")
+    parser.add_argument("--db", metavar="RUTA",
+                        help="guardar el inventario en una base SQLite (por defecto solo en memoria)")
+    args = parser.parse_args()
+    if args.db:
+        from almacen_sqlite import InventarioSQLite
+        inv: Inventario = InventarioSQLite(args.db)
+    else:
+        inv = Inventario()
+    try:
+        menu(inv)
+    finally:
+        if args.db:
+            inv.cerrar()
+
+def menu(inv: Inventario) -> None:
     while True:
         mostrar_menu()
         op = leer_entero("Elige una opción: ")
@@ -163,6 +299,8 @@ def main() -> None:
             opcion_buscar_nombre(inv)
         elif op == 6:
             opcion_listar_todos(inv)
+        elif op == 7:
+            opcion_estadisticas(inv)
         elif op == 0:
             print("¡Hasta luego!")
             break
@@ -0,0 +1,180 @@
+# almacen_sqlite.py
+"""
+Inventario persistente en SQLite (módulo estándar sqlite3).
+
+- Misma interfaz pública que Inventario, pero los productos viven en el archivo
+  y no en memoria: sirve para catálogos más grandes que la RAM.
+- Modo WAL: las lecturas no bloquean a la escritura y cada cambio confirma
+  sin reescribir la base.
+- Columna `clave` = id.lower() con índice UNIQUE: misma semántica que
+  Inventario._buscar_por_id (los IDs no distinguen mayúsculas).
+- El orden de inserción lo da la columna `orden` (rowid), así listar_todos
+  devuelve lo mismo que la versión en memoria.
+- buscar_por_nombre usa un índice FTS5 con tokenizador trigram sobre el
+  nombre en minúsculas (búsqueda por subcadena); las consultas de menos de
+  3 caracteres, o una SQLite sin FTS5, recorren la tabla con instr().
+- estadisticas() es la heredada: se calcula recorriendo la tabla la primera
+  vez y luego cada cambio la ajusta con la fila anterior y la nueva.
+- Las sentencias SQL son constantes del módulo: sqlite3 las prepara una vez y
+  las reutiliza desde su caché de sentencias.
+"""
+import sqlite3
+from dataclasses import replace
+from typing import Iterable, Iterator, List, Optional
+
+from Inventario import TAM_PAGINA, Inventario, Producto
+
+MIN_TRIGRAMA = 3
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    orden      INTEGER PRIMARY KEY,
+    clave      TEXT NOT NULL UNIQUE,
+    id         TEXT NOT NULL,
+    nombre     TEXT NOT NULL,
+    nombre_min TEXT NOT NULL,
+    cantidad   INTEGER NOT NULL,
+    precio     REAL NOT NULL
+);
+"""
+
+_ESQUEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+    nombre_min, content='productos', content_rowid='orden',
+    tokenize='trigram case_sensitive 1'
+);
+CREATE TRIGGER IF NOT EXISTS productos_ai AFTER INSERT ON productos BEGIN
+    INSERT INTO productos_fts(rowid, nombre_min) VALUES (new.orden, new.nombre_min);
+END;
+CREATE TRIGGER IF NOT EXISTS productos_ad AFTER DELETE ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, nombre_min) VALUES ('delete', old.orden, old.nombre_min);
+END;
+CREATE TRIGGER IF NOT EXISTS productos_au AFTER UPDATE OF nombre_min ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, nombre_min) VALUES ('delete', old.orden, old.nombre_min);
+    INSERT INTO productos_fts(rowid, nombre_min) VALUES (new.orden, new.nombre_min);
+END;
+"""
+
+_COLUMNAS = "id, nombre, cantidad, precio"
+_SQL_INSERTAR = "INSERT INTO productos (clave, id, nombre, nombre_min, cantidad, precio) VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_INSERTAR_VARIOS = _SQL_INSERTAR.replace("INSERT", "INSERT OR IGNORE", 1)
+_SQL_ELIMINAR = "DELETE FROM productos WHERE clave = ?"
+_SQL_CANTIDAD = "UPDATE productos SET cantidad = ? WHERE clave = ?"
+_SQL_PRECIO = "UPDATE productos SET precio = ? WHERE clave = ?"
+_SQL_POR_ID = f"SELECT {_COLUMNAS} FROM productos WHERE clave = ?"
+_SQL_TODOS = f"SELECT {_COLUMNAS} FROM productos ORDER BY orden"
+_SQL_PAGINA = f"SELECT {_COLUMNAS} FROM productos ORDER BY {{}} LIMIT ? OFFSET ?"
+_SQL_CONTAR = "SELECT count(*) FROM productos"
+_SQL_BUSCAR_FTS = (f"SELECT {_COLUMNAS} FROM productos WHERE orden IN "
+                   "(SELECT rowid FROM productos_fts WHERE productos_fts MATCH ?) ORDER BY orden")
+_SQL_BUSCAR_RECORRIDO = f"SELECT {_COLUMNAS} FROM productos WHERE instr(nombre_min, ?) > 0 ORDER BY orden"
+
+
+def _fila(p: Producto) -> tuple:
+    return (Inventario._clave(p.id), p.id, p.nombre, p.nombre.lower(), p.cantidad, p.precio)
+
+
+class InventarioSQLite(Inventario):
+    """Inventario guardado en un archivo SQLite; cada operación se confirma al terminar."""
+
+    def __init__(self, ruta: str = "inventario.db") -> None:
+        # El estado en memoria de la base queda vacío, pero existe para lo heredado que lo consulte
+        super().__init__()
+        self.ruta = ruta
+        self._con = sqlite3.connect(ruta)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        # En WAL, NORMAL no pierde consistencia ante un corte; solo las últimas confirmaciones
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(_ESQUEMA)
+        try:
+            self._con.executescript(_ESQUEMA_FTS)
+            self.con_fts = True
+        except sqlite3.OperationalError:
+            # SQLite compilada sin FTS5 o sin el tokenizador trigram (anterior a 3.34)
+            self.con_fts = False
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+    def __enter__(self) -> "InventarioSQLite":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # --- operaciones ---
+    def agregar_producto(self, p: Producto) -> bool:
+        try:
+            with self._con:
+                self._con.execute(_SQL_INSERTAR, _fila(p))
+        except sqlite3.IntegrityError:
+            return False
+        self._ajustar_estadisticas(None, p)
+        return True
+
+    def agregar_varios(self, productos: Iterable[Producto]) -> int:
+        """Alta masiva en una sola transacción; omite los IDs repetidos y devuelve cuántos agregó."""
+        self._estadisticas = None  # se recalculan en la próxima consulta
+        with self._con:
+            # rowcount no cuenta las filas que escriben los triggers del índice FTS
+            return self._con.executemany(_SQL_INSERTAR_VARIOS, (_fila(p) for p in productos)).rowcount
+
+    def eliminar_por_id(self, id_: str) -> bool:
+        antes = self._antes_de_cambiar(id_)
+        with self._con:
+            ok = self._con.execute(_SQL_ELIMINAR, (self._clave(id_),)).rowcount > 0
+        if ok and antes is not None:
+            self._ajustar_estadisticas(antes, None)
+        return ok
+
+    def actualizar_cantidad(self, id_: str, nueva_cantidad: int) -> bool:
+        antes = self._antes_de_cambiar(id_)
+        with self._con:
+            ok = self._con.execute(_SQL_CANTIDAD, (nueva_cantidad, self._clave(id_))).rowcount > 0
+        if ok and antes is not None:
+            self._ajustar_estadisticas(antes, replace(antes, cantidad=nueva_cantidad))
+        return ok
+
+    def actualizar_precio(self, id_: str, nuevo_precio: float) -> bool:
+        antes = self._antes_de_cambiar(id_)
+        with self._con:
+            ok = self._con.execute(_SQL_PRECIO, (nuevo_precio, self._clave(id_))).rowcount > 0
+        if ok and antes is not None:
+            self._ajustar_estadisticas(antes, replace(antes, precio=nuevo_precio))
+        return ok
+
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        needle = texto.strip().lower()
+        if self.con_fts and len(needle) >= MIN_TRIGRAMA:
+            # Entre comillas es una frase: trigram la resuelve como subcadena
+            filas = self._con.execute(_SQL_BUSCAR_FTS, ('"' + needle.replace('"', '""') + '"',))
+        else:
+            filas = self._con.execute(_SQL_BUSCAR_RECORRIDO, (needle,))
+        return [Producto(*f) for f in filas]
+
+    def listar_todos(self) -> List[Producto]:
+        return [Producto(*f) for f in self._con.execute(_SQL_TODOS)]
+
+    def iterar(self, ordenar_por: Optional[str] = None, desde: int = 0) -> Iterator[Producto]:
+        return (Producto(*f) for f in self._pagina(desde, -1, ordenar_por))
+
+    def pagina(self, desde: int = 0, tam: int = TAM_PAGINA, ordenar_por: Optional[str] = None) -> List[Producto]:
+        return [Producto(*f) for f in self._pagina(desde, tam, ordenar_por)]
+
+    def __len__(self) -> int:
+        return self._con.execute(_SQL_CONTAR).fetchone()[0]
+
+    def _pagina(self, desde: int, tam: int, ordenar_por: Optional[str]) -> sqlite3.Cursor:
+        orden = "orden"
+        if ordenar_por is not None:
+            self._clave_orden(ordenar_por)  # valida el campo contra CAMPOS_ORDEN antes de ponerlo en el SQL
+            orden = f"{ordenar_por}, orden"  # `orden` desempata como el ordenamiento estable en memoria
+        return self._con.execute(_SQL_PAGINA.format(orden), (tam, desde))
+
+    def _buscar_por_id(self, id_: str) -> Optional[Producto]:
+        fila = self._con.execute(_SQL_POR_ID, (self._clave(id_),)).fetchone()
+        return None if fila is None else Producto(*fila)
+
+    def _antes_de_cambiar(self, id_: str) -> Optional[Producto]:
+        """La fila actual, solo si hay totales que ajustar (si no, se ahorra la consulta)."""
+        return None if self._estadisticas is None else self._buscar_por_id(id_)
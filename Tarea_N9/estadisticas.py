@@ -0,0 +1,87 @@
+# estadisticas.py
+"""
+Totales del inventario mantenidos con cada cambio.
+
+Inventario (y InventarioSQLite) avisa cada alta, baja o modificación con el
+producto de antes y el de después, así que productos, unidades, valor en stock
+y el conteo por tramo de precio se ajustan en O(1) sin recorrer el catálogo.
+Los precios se guardan además en una lista ordenada (bisect): el mínimo y el
+máximo son su primer y último elemento.
+"""
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from Inventario import Producto
+
+TRAMOS_PRECIO: Tuple[float, ...] = (1, 5, 10, 50, 100, 500, 1000)
+
+
+class Estadisticas:
+    def __init__(self) -> None:
+        self.productos = 0
+        self.unidades = 0
+        self.valor_total = 0.0
+        self._suma_precios = 0.0
+        self._precios: List[float] = []  # ordenados, con repetidos
+        self._por_tramo = [0] * (len(TRAMOS_PRECIO) + 1)
+
+    @classmethod
+    def construir(cls, productos: Iterable["Producto"]) -> "Estadisticas":
+        est = cls()
+        for p in productos:
+            est.aplicar(None, p)
+        return est
+
+    def aplicar(self, antes: Optional["Producto"], despues: Optional["Producto"]) -> None:
+        """Alta (antes=None), baja (despues=None) o modificación."""
+        if antes is not None:
+            self._sumar(antes, -1)
+            del self._precios[bisect_left(self._precios, antes.precio)]
+        if despues is not None:
+            self._sumar(despues, 1)
+            insort(self._precios, despues.precio)
+
+    def _sumar(self, p: "Producto", signo: int) -> None:
+        self.productos += signo
+        self.unidades += signo * p.cantidad
+        self.valor_total += signo * p.cantidad * p.precio
+        self._suma_precios += signo * p.precio
+        self._por_tramo[bisect_right(TRAMOS_PRECIO, p.precio)] += signo
+
+    # --- consultas ---
+    @property
+    def precio_promedio(self) -> Optional[float]:
+        return self._suma_precios / self.productos if self.productos else None
+
+    @property
+    def precio_minimo(self) -> Optional[float]:
+        return self._precios[0] if self._precios else None
+
+    @property
+    def precio_maximo(self) -> Optional[float]:
+        return self._precios[-1] if self._precios else None
+
+    def por_tramo(self) -> List[Tuple[str, int]]:
+        """Pares (tramo de precio, productos), p. ej. ('10-50', 42)."""
+        etiquetas = [f"<{TRAMOS_PRECIO[0]:g}"]
+        etiquetas += [f"{a:g}-{b:g}" for a, b in zip(TRAMOS_PRECIO, TRAMOS_PRECIO[1:])]
+        etiquetas.append(f">={TRAMOS_PRECIO[-1]:g}")
+        return list(zip(etiquetas, self._por_tramo))
+
+    def diferencias(self, productos: Iterable["Producto"]) -> List[str]:
+        """Compara con un recálculo sobre `productos`; describe cada total que no coincide."""
+        esperado = Estadisticas.construir(productos)
+        diferencias = []
+        for campo in ("productos", "unidades", "valor_total", "precio_promedio", "precio_minimo", "precio_maximo"):
+            valor, actual = getattr(esperado, campo), getattr(self, campo)
+            if isinstance(valor, float) and isinstance(actual, float):
+                iguales = math.isclose(valor, actual, rel_tol=1e-9, abs_tol=1e-6)
+            else:
+                iguales = valor == actual
+            if not iguales:
+                diferencias.append(f"{campo}: se esperaba {valor}, hay {actual}")
+        if esperado.por_tramo() != self.por_tramo():
+            diferencias.append(f"por_tramo: se esperaba {esperado.por_tramo()}, hay {self.por_tramo()}")
+        return diferencias
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de los motores de inventario del repositorio
+------------------------------------------------------
+Ejecuta cada motor contra catálogos sintéticos (por defecto de 1k a 1M
+productos) y mide:
+- agregar, actualizar, eliminar y buscar por nombre: operaciones/s y latencias
+  p50, p95, p99 y máxima por operación;
+- guardar y cargar el archivo completo (los motores que persisten);
+- memoria máxima (RSS) del proceso.
+
+Cada combinación motor/tamaño corre en un subproceso propio, así el RSS máximo
+es el de esa corrida y los motores con módulos del mismo nombre no chocan. Los
+catálogos se generan con una semilla fija, de modo que dos corridas con los
+mismos parámetros son comparables. Los resultados se escriben en JSON; con
+--comparar se contrastan contra una corrida anterior.
+
+Las operaciones lineales (búsquedas o guardados por cada cambio) se cortan por
+tiempo: cada operación mide como máximo --max-ops repeticiones o --presupuesto
+segundos, lo que ocurra primero, y el JSON indica cuántas se midieron.
+
+Uso:
+- python benchmarks/benchmark_inventarios.py
+- python benchmarks/benchmark_inventarios.py --motores tarea10,n9 --tamanos 1000,100000
+- python benchmarks/benchmark_inventarios.py --salida hoy.json --comparar ayer.json
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TAMANOS_POR_DEFECTO = (1_000, 10_000, 100_000, 1_000_000)
+MAX_OPS = 1000
+PRESUPUESTO = 10.0
+SEMILLA = 12345
+UMBRAL_REGRESION = 0.8  # ops/s por debajo del 80 % de la corrida anterior
+
+_PALABRAS = (
+    "teclado", "mouse", "monitor", "cable", "cargador", "disco", "memoria", "router",
+    "parlante", "camara", "impresora", "tinta", "papel", "lapiz", "cuaderno", "silla",
+    "mesa", "lampara", "foco", "bateria", "adaptador", "soporte", "funda", "filtro",
+)
+_MARCAS = ("acme", "nova", "orion", "delta", "zen", "polar", "atlas", "vega")
+
+Fila = Tuple[str, str, int, float]
+
+
+# ---------------------- Datos sintéticos ----------------------
+def generar_catalogo(n: int, semilla: int = SEMILLA) -> List[Fila]:
+    """Filas (id, nombre, cantidad, precio) reproducibles; los nombres no llevan comas."""
+    rnd = random.Random(semilla)
+    filas = []
+    for i in range(n):
+        nombre = f"{rnd.choice(_PALABRAS)} {rnd.choice(_MARCAS)} {rnd.randrange(1000)}"
+        filas.append((f"P{i:07d}", nombre, rnd.randrange(500), round(rnd.uniform(0.5, 999.0), 2)))
+    return filas
+
+
+# ---------------------- Motores ----------------------
+def _cargar_modulo(ruta_relativa: str, nombre: str) -> Any:
+    """Importa un script del repo por ruta (su carpeta va primero en sys.path por sus módulos hermanos)."""
+    ruta = os.path.join(RAIZ, ruta_relativa)
+    sys.path.insert(0, os.path.dirname(ruta))
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo  # dataclasses lo busca aquí
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+class Motor:
+    """
+    Adaptador común. `poblar` carga el catálogo inicial sin medirse y puede usar
+    atajos internos cuando la API pública es cuadrática (p. ej. una búsqueda
+    lineal o un guardado completo por cada alta).
+    """
+
+    persiste = True
+
+    def __init__(self, directorio: str) -> None:
+        self.directorio = directorio
+
+    def poblar(self, filas: List[Fila]) -> None: ...
+    def agregar(self, fila: Fila) -> None: ...
+    def actualizar(self, id_: str, cantidad: int, precio: float) -> None: ...
+    def eliminar(self, id_: str) -> None: ...
+    def buscar(self, texto: str) -> Any: ...
+    def guardar(self) -> None: ...
+    def cargar(self) -> None: ...
+
+
+class MotorTarea10(Motor):
+    """TAREA 10/inventario.py: dict + JSON con guardado atómico por cambio."""
+
+    usar_diario = False
+
+    def __init__(self, directorio: str) -> None:
+        super().__init__(directorio)
+        self.m = _cargar_modulo("TAREA 10/inventario.py", "inventario_tarea10")
+        self.ruta = os.path.join(directorio, "inventario.json")
+        self.inv = self.m.Inventario(self.ruta, usar_diario=self.usar_diario)
+
+    def poblar(self, filas: List[Fila]) -> None:
+        with self.inv.transaccion():
+            for f in filas:
+                self.inv.agregar(self.m.Producto(*f))
+        if self.usar_diario:
+            self.inv.compactar()
+
+    def agregar(self, fila: Fila) -> None:
+        self.inv.agregar(self.m.Producto(*fila))
+
+    def actualizar(self, id_: str, cantidad: int, precio: float) -> None:
+        self.inv.actualizar(id_, cantidad=cantidad, precio=precio)
+
+    def eliminar(self, id_: str) -> None:
+        self.inv.eliminar(id_)
+
+    def buscar(self, texto: str) -> Any:
+        return self.inv.buscar_por_nombre(texto)
+
+    def guardar(self) -> None:
+        self.inv.guardar_en_archivo()
+
+    def cargar(self) -> None:
+        self.inv.cerrar()
+        self.inv = self.m.Inventario(self.ruta, usar_diario=self.usar_diario)
+
+
+class MotorTarea10Diario(MotorTarea10):
+    """TAREA 10/inventario.py --diario: cada cambio es una línea en el diario."""
+
+    usar_diario = True
+
+
+class MotorPickle(Motor):
+    """sistema_inventario.py (dict + pickle) de TAREA SEMANA 11 y tarea_inventario_text_id."""
+
+    carpeta = "TAREA SEMANA 11"
+
+    def __init__(self, directorio: str) -> None:
+        super().__init__(directorio)
+        self.m = _cargar_modulo(f"{self.carpeta}/sistema_inventario.py", "sistema_inventario")
+        self.ruta = os.path.join(directorio, "inventario.pkl")
+        self.inv = self.m.Inventario()
+
+    def poblar(self, filas: List[Fila]) -> None:
+        for f in filas:
+            self.inv.agregar_producto(self.m.Producto(*f))
+
+    def agregar(self, fila: Fila) -> None:
+        self.inv.agregar_producto(self.m.Producto(*fila))
+
+    def actualizar(self, id_: str, cantidad: int, precio: float) -> None:
+        self.inv.actualizar_producto(id_, cantidad, precio)
+
+    def eliminar(self, id_: str) -> None:
+        self.inv.eliminar_producto(id_)
+
+    def buscar(self, texto: str) -> Any:
+        return self.inv.buscar_producto(texto)
+
+    def guardar(self) -> None:
+        self.inv.guardar_inventario(self.ruta)
+
+    def cargar(self) -> None:
+        self.inv = self.m.Inventario()
+        self.inv.cargar_inventario(self.ruta)
+
+
+class MotorTextId(MotorPickle):
+    carpeta = "tarea_inventario_text_id"
+
+
+class MotorN9(Motor):
+    """Tarea_N9/Inventario.py: lista en memoria con índice por id; no persiste."""
+
+    persiste = False
+
+    def __init__(self, directorio: str) -> None:
+        super().__init__(directorio)
+        self.m = _cargar_modulo("Tarea_N9/Inventario.py", "inventario_n9")
+        self.inv = self.m.Inventario()
+
+    def poblar(self, filas: List[Fila]) -> None:
+        for f in filas:
+            self.inv.agregar_producto(self.m.Producto(*f))
+
+    def agregar(self, fila: Fila) -> None:
+        self.inv.agregar_producto(self.m.Producto(*fila))
+
+    def actualizar(self, id_: str, cantidad: int, precio: float) -> None:
+        self.inv.actualizar_cantidad(id_, cantidad)
+        self.inv.actualizar_precio(id_, precio)
+
+    def eliminar(self, id_: str) -> None:
+        self.inv.eliminar_por_id(id_)
+
+    def buscar(self, texto: str) -> Any:
+        return self.inv.buscar_por_nombre(texto)
+
+
+class MotorInventarioApp(Motor):
+    """InventarioApp/inventario.py: diccionario por ID + archivo de texto separado por comas, reescrito en cada cambio."""
+
+    def __init__(self, directorio: str) -> None:
+        super().__init__(directorio)
+        self.m = _cargar_modulo("InventarioApp/inventario.py", "inventario_app")
+        self.Producto = sys.modules["producto"].Producto
+        self.ruta = os.path.join(directorio, "datos.txt")
+        self.inv = self.m.Inventario(self.ruta)
+
+    def poblar(self, filas: List[Fila]) -> None:
+        # agregar_producto reescribe el archivo completo en cada alta
+        self.inv.productos.update((f[0], self.Producto(*f)) for f in filas)
+        self.inv.guardar_en_archivo()
+
+    def agregar(self, fila: Fila) -> None:
+        self.inv.agregar_producto(self.Producto(*fila))
+
+    def actualizar(self, id_: str, cantidad: int, precio: float) -> None:
+        # modificar_producto exige el nombre: se conserva el actual
+        p = self.inv.buscar_producto(id_)
+        if p is not None:
+            self.inv.modificar_producto(id_, p.nombre, cantidad, precio)
+
+    def eliminar(self, id_: str) -> None:
+        self.inv.eliminar_producto(id_)
+
+    def buscar(self, texto: str) -> Any:
+        # La app no tiene búsqueda: la interfaz filtra la lista completa
+        t = texto.lower()
+        return [p for p in self.inv.mostrar_productos() if t in p.nombre.lower()]
+
+    def guardar(self) -> None:
+        self.inv.guardar_en_archivo()
+
+    def cargar(self) -> None:
+        self.inv = self.m.Inventario(self.ruta)
+
+
+MOTORES: Dict[str, Callable[[str], Motor]] = {
+    "tarea10": MotorTarea10,
+    "tarea10_diario": MotorTarea10Diario,
+    "semana11": MotorPickle,
+    "text_id": MotorTextId,
+    "n9": MotorN9,
+    "inventarioapp": MotorInventarioApp,
+}
+
+
+# ---------------------- Medición ----------------------
+def _percentil(ordenados: List[float], q: float) -> float:
+    i = min(len(ordenados) - 1, max(0, int(round(q * (len(ordenados) - 1)))))
+    return ordenados[i]
+
+
+def resumir(tiempos: List[float]) -> Dict[str, Any]:
+    """Estadísticas de una lista de duraciones en segundos."""
+    if not tiempos:
+        return {"ops": 0}
+    ordenados = sorted(tiempos)
+    total = sum(tiempos)
+    return {
+        "ops": len(tiempos),
+        "ops_s": round(len(tiempos) / total, 2) if total > 0 else None,
+        "p50_ms": round(_percentil(ordenados, 0.50) * 1e3, 4),
+        "p95_ms": round(_percentil(ordenados, 0.95) * 1e3, 4),
+        "p99_ms": round(_percentil(ordenados, 0.99) * 1e3, 4),
+        "max_ms": round(ordenados[-1] * 1e3, 4),
+    }
+
+
+def medir(operacion: Callable[[Any], Any], argumentos: Iterator[Any], max_ops: int, presupuesto: float) -> Dict[str, Any]:
+    tiempos: List[float] = []
+    reloj = time.perf_counter
+    limite = reloj() + presupuesto
+    for arg in argumentos:
+        if len(tiempos) >= max_ops or reloj() > limite:
+            break
+        t0 = reloj()
+        operacion(arg)
+        tiempos.append(reloj() - t0)
+    return resumir(tiempos)
+
+
+def rss_maximo_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo reporta en KiB y macOS en bytes
+    return round(rss / (1 << 20) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def correr(motor_nombre: str, tamano: int, max_ops: int, presupuesto: float, semilla: int) -> Dict[str, Any]:
+    """Una corrida completa de un motor con un tamaño (se ejecuta en el subproceso)."""
+    rnd = random.Random(semilla + 1)
+    filas = generar_catalogo(tamano, semilla)
+    nuevas = generar_catalogo(max_ops, semilla + 2)
+    nuevas = [(f"N{i:07d}", n, c, p) for i, (_, n, c, p) in enumerate(nuevas)]
+    directorio = tempfile.mkdtemp(prefix=f"bench-{motor_nombre}-")
+    ops: Dict[str, Any] = {}
+    try:
+        motor = MOTORES[motor_nombre](directorio)
+        t0 = time.perf_counter()
+        motor.poblar(filas)
+        poblar_s = time.perf_counter() - t0
+
+        ids = [f[0] for f in filas]
+        muestra = lambda: (rnd.choice(ids) for _ in iter(int, 1))  # infinita, cortada por medir()
+        ops["agregar"] = medir(motor.agregar, iter(nuevas), max_ops, presupuesto)
+        ops["actualizar"] = medir(
+            lambda i: motor.actualizar(i, rnd.randrange(500), round(rnd.uniform(0.5, 999.0), 2)),
+            muestra(), max_ops, presupuesto)
+        textos = (rnd.choice(filas)[1].split()[rnd.randrange(3)] for _ in iter(int, 1))
+        ops["buscar"] = medir(motor.buscar, textos, max_ops, presupuesto)
+        if motor.persiste:
+            # Guardar y cargar son operaciones completas: pocas repeticiones
+            ops["guardar"] = medir(lambda _: motor.guardar(), iter(range(5)), 5, presupuesto)
+            ops["cargar"] = medir(lambda _: motor.cargar(), iter(range(3)), 3, presupuesto)
+        a_eliminar = rnd.sample(ids, min(len(ids), max_ops))
+        ops["eliminar"] = medir(motor.eliminar, iter(a_eliminar), max_ops, presupuesto)
+        if hasattr(motor, "inv") and hasattr(motor.inv, "cerrar"):
+            motor.inv.cerrar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    return {
+        "motor": motor_nombre,
+        "tamano": tamano,
+        "poblar_s": round(poblar_s, 3),
+        "operaciones": ops,
+        "rss_max_mb": rss_maximo_mb(),
+    }
+
+
+def _subproceso(args: argparse.Namespace) -> int:
+    # Los motores de consola imprimen en cada operación: se descarta esa salida
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        resultado = correr(args.motor, args.tamano, args.max_ops, args.presupuesto, args.semilla)
+    sys.stdout.write(json.dumps(resultado))
+    return 0
+
+
+def ejecutar(args: argparse.Namespace) -> Dict[str, Any]:
+    resultados = []
+    for tamano in args.tamanos:
+        for motor in args.motores:
+            print(f"· {motor} con {tamano:,} productos ...", file=sys.stderr, flush=True)
+            cmd = [sys.executable, os.path.abspath(__file__), "--_subproceso", "--motor", motor,
+                   "--tamano", str(tamano), "--max-ops", str(args.max_ops),
+                   "--presupuesto", str(args.presupuesto), "--semilla", str(args.semilla)]
+            try:
+                proc = subprocess.run(cmd, capture_output=True, text=True, timeout=args.timeout)
+            except subprocess.TimeoutExpired:
+                resultados.append({"motor": motor, "tamano": tamano, "error": f"superó {args.timeout} s"})
+                continue
+            if proc.returncode != 0:
+                error = (proc.stderr.strip().splitlines() or ["sin detalle"])[-1]
+                resultados.append({"motor": motor, "tamano": tamano, "error": error})
+                continue
+            resultados.append(json.loads(proc.stdout))
+    return {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semilla": args.semilla,
+            "max_ops": args.max_ops,
+            "presupuesto_s": args.presupuesto,
+        },
+        "resultados": resultados,
+    }
+
+
+# ---------------------- Informe ----------------------
+def imprimir_tabla(informe: Dict[str, Any], salida: io.TextIOBase = sys.stdout) -> None:
+    nombres = ("agregar", "actualizar", "eliminar", "buscar", "guardar", "cargar")
+    print(f"{'motor':<15}{'tamaño':>10}" + "".join(f"{n:>14}" for n in nombres) + f"{'RSS MB':>10}", file=salida)
+    for r in informe["resultados"]:
+        if "error" in r:
+            print(f"{r['motor']:<15}{r['tamano']:>10}  ERROR: {r['error']}", file=salida)
+            continue
+        celdas = []
+        for n in nombres:
+            op = r["operaciones"].get(n)
+            celdas.append(f"{op['ops_s']:>12,.0f}/s" if op and op.get("ops_s") else f"{'-':>14}")
+        rss = r.get("rss_max_mb")
+        print(f"{r['motor']:<15}{r['tamano']:>10}" + "".join(celdas) + f"{rss if rss is not None else '-':>10}", file=salida)
+
+
+def comparar(actual: Dict[str, Any], anterior: Dict[str, Any], umbral: float = UMBRAL_REGRESION) -> List[str]:
+    """Operaciones cuyo ops/s cayó por debajo de `umbral` veces el de la corrida anterior."""
+    previos = {(r["motor"], r["tamano"]): r for r in anterior.get("resultados", []) if "error" not in r}
+    regresiones = []
+    for r in actual["resultados"]:
+        previo = previos.get((r["motor"], r["tamano"]))
+        if previo is None or "error" in r:
+            continue
+        for nombre, op in r["operaciones"].items():
+            antes = previo["operaciones"].get(nombre, {}).get("ops_s")
+            ahora = op.get("ops_s")
+            if antes and ahora and ahora < antes * umbral:
+                regresiones.append(
+                    f"{r['motor']} / {r['tamano']:,} / {nombre}: {antes:,.0f} -> {ahora:,.0f} ops/s ({ahora / antes:.0%})"
+                )
+    return regresiones
+
+
+def _lista_enteros(texto: str) -> List[int]:
+    return [int(x.replace("_", "")) for x in texto.split(",") if x.strip()]
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de inventario")
+    parser.add_argument("--motores", default=",".join(MOTORES),
+                        help=f"lista separada por comas (disponibles: {', '.join(MOTORES)})")
+    parser.add_argument("--tamanos", type=_lista_enteros, default=list(TAMANOS_POR_DEFECTO),
+                        help="tamaños de catálogo separados por comas")
+    parser.add_argument("--max-ops", type=int, default=MAX_OPS, help="repeticiones máximas por operación")
+    parser.add_argument("--presupuesto", type=float, default=PRESUPUESTO, help="segundos máximos por operación")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--timeout", type=float, default=1800.0, help="segundos máximos por corrida motor/tamaño")
+    parser.add_argument("--salida", default="benchmark_inventarios.json", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior para detectar regresiones")
+    # Uso interno: una sola corrida dentro del subproceso
+    parser.add_argument("--_subproceso", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--motor", help=argparse.SUPPRESS)
+    parser.add_argument("--tamano", type=int, help=argparse.SUPPRESS)
+    return parser
+
+
+def main() -> int:
+    args = crear_parser().parse_args()
+    if args._subproceso:
+        return _subproceso(args)
+    args.motores = [m.strip() for m in args.motores.split(",") if m.strip()]
+    desconocidos = [m for m in args.motores if m not in MOTORES]
+    if desconocidos:
+        print(f"Motores desconocidos: {', '.join(desconocidos)}", file=sys.stderr)
+        return 2
+    informe = ejecutar(args)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    imprimir_tabla(informe)
+    print(f"\nResultados en '{args.salida}'.")
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            regresiones = comparar(informe, json.load(f))
+        if regresiones:
+            print(f"\nRegresiones respecto de '{args.comparar}':")
+            for linea in regresiones:
+                print(f"- {linea}")
+            return 1
+        print(f"\nSin regresiones respecto de '{args.comparar}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,11 @@
-import pickle
+from estadisticas import Estadisticas
+from tabla_productos import TablaProductos, cargar_tabla, guardar_tabla
+
 
 class Producto:
+    # Sin __dict__: el inventario copia los valores a su tabla (ver tabla_productos.py)
+    __slots__ = ("id_producto", "nombre", "cantidad", "precio")
+
     def __init__(self, id_producto, nombre, cantidad, precio):
         self.id_producto = str(id_producto)  # ahora siempre será texto
         self.nombre = nombre
@@ -28,19 +33,32 @@ class Producto:
     def __str__(self):
         return f"ID: {self.id_producto}, Nombre: {self.nombre}, Cantidad: {self.cantidad}, Precio: {self.precio}"
 
+    def __setstate__(self, estado):
+        # Los archivos antiguos guardaban el __dict__ de cada producto
+        if isinstance(estado, tuple):
+            estado = estado[1]
+        for clave, valor in estado.items():
+            setattr(self, clave, valor)
+
 
 class Inventario:
     def __init__(self):
-        self.productos = {}  # Diccionario {ID: Producto}
+        self.productos = TablaProductos()  # Se usa como el diccionario {ID: Producto}
+        # Totales: se calculan en la primera consulta y luego se ajustan
+        self._estadisticas = None
 
     def agregar_producto(self, producto):
         if producto.obtener_id() not in self.productos:
             self.productos[producto.obtener_id()] = producto
+            if self._estadisticas is not None:
+                self._estadisticas.agregar(producto)
         else:
             print(f"⚠️ Producto con ID '{producto.obtener_id()}' ya existe.")
 
     def eliminar_producto(self, id_producto):
         if id_producto in self.productos:
+            if self._estadisticas is not None:
+                self._estadisticas.quitar(self.productos[id_producto])
             del self.productos[id_producto]
             print(f"✅ Producto '{id_producto}' eliminado.")
         else:
@@ -49,16 +67,33 @@ class Inventario:
     def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None):
         if id_producto in self.productos:
             producto = self.productos[id_producto]
+            if self._estadisticas is not None:
+                self._estadisticas.quitar(producto)  # la vista lee la fila: antes de cambiarla
             if nueva_cantidad is not None:
                 producto.establecer_cantidad(nueva_cantidad)
             if nuevo_precio is not None:
                 producto.establecer_precio(nuevo_precio)
+            if self._estadisticas is not None:
+                self._estadisticas.agregar(producto)
             print(f"✅ Producto '{id_producto}' actualizado.")
         else:
             print(f"⚠️ Producto con ID '{id_producto}' no encontrado.")
 
+    def estadisticas(self):
+        """Totales del inventario (ver estadisticas.py); se calculan en la primera consulta."""
+        if self._estadisticas is None:
+            self._estadisticas = Estadisticas.construir(self.productos.values())
+        return self._estadisticas
+
+    def verificar_estadisticas(self):
+        """Compara con un recorrido completo; si algo no coincide, se recalculan."""
+        diferencias = self.estadisticas().diferencias(self.productos.values())
+        if diferencias:
+            self._estadisticas = None
+        return diferencias
+
     def buscar_producto(self, nombre):
-        resultados = [producto for producto in self.productos.values() if nombre.lower() in producto.obtener_nombre().lower()]
+        resultados = self.productos.buscar_por_nombre(nombre)
         if resultados:
             for producto in resultados:
                 print(producto)
@@ -73,14 +108,15 @@ class Inventario:
             print("📦 El inventario está vacío.")
 
     def guardar_inventario(self, archivo):
-        with open(archivo, 'wb') as f:
-            pickle.dump(self.productos, f)
+        # Protocolo 5: los arreglos de la tabla se escriben sin copiarse
+        guardar_tabla(self.productos, archivo)
         print(f"💾 Inventario guardado en '{archivo}'.")
 
     def cargar_inventario(self, archivo):
         try:
-            with open(archivo, 'rb') as f:
-                self.productos = pickle.load(f)
+            # También acepta los archivos antiguos con el diccionario completo
+            self.productos = cargar_tabla(archivo)
+            self._estadisticas = None
             print(f"📂 Inventario cargado desde '{archivo}'.")
         except FileNotFoundError:
             print(f"⚠️ El archivo '{archivo}' no existe.")
@@ -95,6 +131,7 @@ def mostrar_menu():
     print("5. Mostrar inventario")
     print("6. Guardar inventario")
     print("7. Cargar inventario")
+    print("E. Estadísticas")
     print("8. Salir")
 
 
@@ -148,6 +185,9 @@ def menu():
             archivo = input("Nombre del archivo para cargar el inventario: ")
             inventario.cargar_inventario(archivo)
 
+        elif opcion.strip().upper() == "E":
+            inventario.estadisticas().mostrar()
+
         elif opcion == "8":
             print("👋 Saliendo...")
             break
@@ -0,0 +1,358 @@
+"""
+Tabla compacta de productos (estructura de arreglos).
+
+En lugar de un objeto Producto con su __dict__ por cada producto, la tabla
+guarda cada campo en un arreglo tipado paralelo:
+
+    cantidades  array('q')      precios  array('d')
+    IDs y nombres: bytes UTF-8 en un montículo + inicio/largo por fila
+
+Los IDs se ubican con una tabla hash de direccionamiento abierto (crc32 +
+sondeo lineal) guardada también en un array, sin un dict de Python con millones
+de claves str. Un producto ocupa así unos 80 bytes en lugar de ~300.
+
+Borrar solo marca la fila como borrada (lápida); cuando las filas borradas o
+los bytes sin usar pasan de la mitad, `_compactar` reescribe los arreglos sin
+ellas. Así las filas conservan el orden de inserción, como en un dict.
+
+`TablaProductos` se usa como el diccionario {ID: Producto} de siempre:
+asignar copia los valores a los arreglos y leer devuelve una `VistaProducto`,
+un objeto liviano con la misma interfaz que Producto que lee y escribe la fila.
+
+`guardar_tabla` usa pickle protocolo 5 con búferes fuera de banda: los arreglos
+se escriben al archivo directamente desde su memoria, sin copiarlos a bytes.
+"""
+
+import pickle
+import zlib
+from array import array
+
+MAGIA = b"INVSOA01"
+_VACIO = -1
+_BORRADO = -2
+_CAPACIDAD_INICIAL = 8
+
+
+class VistaProducto:
+    """Producto guardado en una TablaProductos; siempre refleja su fila actual."""
+
+    __slots__ = ("_tabla", "id_producto")
+
+    def __init__(self, tabla, id_producto):
+        self._tabla = tabla
+        self.id_producto = id_producto
+
+    def _fila(self):
+        fila = self._tabla._buscar_fila(self.id_producto.encode("utf-8"))
+        if fila < 0:
+            raise KeyError(f"El producto '{self.id_producto}' ya no está en el inventario.")
+        return fila
+
+    @property
+    def nombre(self):
+        return self._tabla._nombre(self._fila())
+
+    @property
+    def cantidad(self):
+        return self._tabla._cantidades[self._fila()]
+
+    @cantidad.setter
+    def cantidad(self, valor):
+        self._tabla._cantidades[self._fila()] = valor
+
+    @property
+    def precio(self):
+        return self._tabla._precios[self._fila()]
+
+    @precio.setter
+    def precio(self, valor):
+        self._tabla._precios[self._fila()] = valor
+
+    def obtener_id(self):
+        return self.id_producto
+
+    def obtener_nombre(self):
+        return self.nombre
+
+    def obtener_cantidad(self):
+        return self.cantidad
+
+    def obtener_precio(self):
+        return self.precio
+
+    def establecer_cantidad(self, nueva_cantidad):
+        self.cantidad = nueva_cantidad
+
+    def establecer_precio(self, nuevo_precio):
+        self.precio = nuevo_precio
+
+    def __str__(self):
+        return f"ID: {self.id_producto}, Nombre: {self.nombre}, Cantidad: {self.cantidad}, Precio: {self.precio}"
+
+
+class TablaProductos:
+    def __init__(self):
+        self._cantidades = array("q")
+        self._precios = array("d")
+        self._id_ini = array("Q")
+        self._id_len = array("I")
+        self._nom_ini = array("Q")
+        self._nom_len = array("I")
+        self._ids = bytearray()
+        self._nombres = bytearray()
+        self._vivas = bytearray()  # 1 por fila vigente, 0 por fila borrada
+        self._borradas = 0
+        self._basura = 0  # bytes de los montículos que ya no usa ninguna fila
+        self._ranuras = array("i", [_VACIO]) * _CAPACIDAD_INICIAL
+        self._ocupadas = 0  # ranuras con fila o borradas (las borradas también alargan el sondeo)
+
+    # ---------- Tabla hash ----------
+    def _sondear(self, idb):
+        """(ranura con el ID o -1, primera ranura libre para insertarlo)."""
+        ranuras = self._ranuras
+        mascara = len(ranuras) - 1
+        i = zlib.crc32(idb) & mascara
+        libre = -1
+        while True:
+            fila = ranuras[i]
+            if fila == _VACIO:
+                return -1, (i if libre < 0 else libre)
+            if fila == _BORRADO:
+                if libre < 0:
+                    libre = i
+            else:
+                ini = self._id_ini[fila]
+                if self._id_len[fila] == len(idb) and self._ids[ini:ini + len(idb)] == idb:
+                    return i, libre
+            i = (i + 1) & mascara
+
+    def _buscar_fila(self, idb):
+        ranura, _ = self._sondear(idb)
+        return -1 if ranura < 0 else self._ranuras[ranura]
+
+    def _redimensionar(self, capacidad):
+        self._ranuras = array("i", [_VACIO]) * capacidad
+        self._ocupadas = 0
+        mascara = capacidad - 1
+        for fila in self._filas():
+            i = zlib.crc32(self._id_bytes(fila)) & mascara
+            while self._ranuras[i] != _VACIO:
+                i = (i + 1) & mascara
+            self._ranuras[i] = fila
+            self._ocupadas += 1
+
+    # ---------- Filas ----------
+    def _filas(self):
+        """Filas vigentes en orden de inserción."""
+        if not self._borradas:
+            return range(len(self._cantidades))
+        return [fila for fila, viva in enumerate(self._vivas) if viva]
+
+    def _id_bytes(self, fila):
+        ini = self._id_ini[fila]
+        return bytes(self._ids[ini:ini + self._id_len[fila]])
+
+    def _id(self, fila):
+        return self._id_bytes(fila).decode("utf-8")
+
+    def _nombre(self, fila):
+        ini = self._nom_ini[fila]
+        return self._nombres[ini:ini + self._nom_len[fila]].decode("utf-8")
+
+    def _agregar_nombre(self, fila, nombre):
+        nb = nombre.encode("utf-8")
+        self._basura += self._nom_len[fila]
+        self._nom_ini[fila] = len(self._nombres)
+        self._nom_len[fila] = len(nb)
+        self._nombres += nb
+
+    # ---------- Interfaz de diccionario ----------
+    def __len__(self):
+        return len(self._cantidades) - self._borradas
+
+    def __contains__(self, id_producto):
+        return self._buscar_fila(id_producto.encode("utf-8")) >= 0
+
+    def __getitem__(self, id_producto):
+        if id_producto not in self:
+            raise KeyError(id_producto)
+        return VistaProducto(self, id_producto)
+
+    def get(self, id_producto, defecto=None):
+        return self[id_producto] if id_producto in self else defecto
+
+    def __setitem__(self, id_producto, producto):
+        """Copia los valores de `producto` (cualquier objeto con los getters de Producto)."""
+        idb = id_producto.encode("utf-8")
+        ranura, libre = self._sondear(idb)
+        if ranura >= 0:
+            fila = self._ranuras[ranura]
+            if self._nombre(fila) != producto.obtener_nombre():
+                self._agregar_nombre(fila, producto.obtener_nombre())
+            self._cantidades[fila] = producto.obtener_cantidad()
+            self._precios[fila] = producto.obtener_precio()
+            return
+        fila = len(self._cantidades)
+        self._cantidades.append(producto.obtener_cantidad())
+        self._precios.append(producto.obtener_precio())
+        self._id_ini.append(len(self._ids))
+        self._id_len.append(len(idb))
+        self._ids += idb
+        self._nom_ini.append(0)
+        self._nom_len.append(0)
+        self._vivas.append(1)
+        self._agregar_nombre(fila, producto.obtener_nombre())
+        if self._ranuras[libre] == _VACIO:
+            self._ocupadas += 1
+        self._ranuras[libre] = fila
+        if self._ocupadas * 3 > len(self._ranuras) * 2:
+            self._redimensionar(len(self._ranuras) * 2)
+
+    def __delitem__(self, id_producto):
+        ranura, _ = self._sondear(id_producto.encode("utf-8"))
+        if ranura < 0:
+            raise KeyError(id_producto)
+        fila = self._ranuras[ranura]
+        # Lápida en la fila y en la ranura: O(1) y las demás filas no se mueven
+        self._ranuras[ranura] = _BORRADO
+        self._vivas[fila] = 0
+        self._borradas += 1
+        self._basura += self._id_len[fila] + self._nom_len[fila]
+        if (self._borradas > len(self._cantidades) // 2
+                or self._basura > (len(self._ids) + len(self._nombres)) // 2):
+            self._compactar()
+
+    def _compactar(self):
+        """Reescribe arreglos y montículos sin las filas borradas ni los nombres reemplazados."""
+        filas = self._filas()
+        columnas = (self._cantidades, self._precios, self._id_len, self._nom_len)
+        (self._cantidades, self._precios, self._id_len, self._nom_len) = (
+            array(c.typecode, [c[f] for f in filas]) for c in columnas)
+        id_ini, nom_ini = array("Q"), array("Q")
+        ids, nombres = bytearray(), bytearray()
+        for nueva, fila in enumerate(filas):
+            ini = self._id_ini[fila]
+            id_ini.append(len(ids))
+            ids += self._ids[ini:ini + self._id_len[nueva]]
+            ini = self._nom_ini[fila]
+            nom_ini.append(len(nombres))
+            nombres += self._nombres[ini:ini + self._nom_len[nueva]]
+        self._id_ini, self._nom_ini = id_ini, nom_ini
+        self._ids, self._nombres = ids, nombres
+        self._vivas = bytearray(b"\x01") * len(self._cantidades)
+        self._borradas = 0
+        self._basura = 0
+        # Las ranuras borradas solo alargan los sondeos: se limpian también
+        capacidad = _CAPACIDAD_INICIAL
+        while capacidad * 2 < len(self._cantidades) * 3:
+            capacidad *= 2
+        self._redimensionar(capacidad)
+
+    def __iter__(self):
+        for fila in self._filas():
+            yield self._id(fila)
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        for id_producto in self:
+            yield VistaProducto(self, id_producto)
+
+    def items(self):
+        for id_producto in self:
+            yield id_producto, VistaProducto(self, id_producto)
+
+    def buscar_por_nombre(self, texto):
+        """Vistas de los productos cuyo nombre contiene `texto` (sin distinguir mayúsculas)."""
+        t = texto.lower()
+        ini, largo = self._nom_ini, self._nom_len
+        if self._nombres.isascii():
+            # Caso común: los desplazamientos en bytes coinciden con los de caracteres,
+            # así que se decodifica y pasa a minúsculas el montículo una sola vez
+            todo = self._nombres.decode("ascii").lower()
+            if t not in todo:
+                return []
+            filas = [f for f in self._filas() if t in todo[ini[f]:ini[f] + largo[f]]]
+        else:
+            filas = [f for f in self._filas() if t in self._nombre(f).lower()]
+        return [VistaProducto(self, self._id(f)) for f in filas]
+
+    # ---------- Serialización ----------
+    def __reduce_ex__(self, protocolo):
+        if self._basura or self._borradas or self._ocupadas != len(self._cantidades):
+            self._compactar()
+        # La tabla hash también se guarda: cargar no tiene que volver a insertar cada ID
+        numericas = (self._cantidades, self._precios, self._id_ini, self._id_len, self._nom_ini, self._nom_len,
+                     self._ranuras)
+        tipos = tuple(c.typecode for c in numericas)
+        columnas = numericas + (self._ids, self._nombres)
+        if protocolo >= 5:
+            # Con buffer_callback los búferes salen fuera de banda, sin copiarse
+            columnas = tuple(pickle.PickleBuffer(c) for c in columnas)
+        else:
+            columnas = tuple(bytes(c) for c in columnas)
+        return _reconstruir, (tipos, columnas)
+
+
+def _reconstruir(tipos, columnas):
+    tabla = TablaProductos()
+    arreglos = []
+    for tipo, datos in zip(tipos, columnas):
+        a = array(tipo)
+        a.frombytes(datos)
+        arreglos.append(a)
+    (tabla._cantidades, tabla._precios, tabla._id_ini, tabla._id_len,
+     tabla._nom_ini, tabla._nom_len, tabla._ranuras) = arreglos
+    tabla._ids = bytearray(columnas[-2])
+    tabla._nombres = bytearray(columnas[-1])
+    tabla._vivas = bytearray(b"\x01") * len(tabla._cantidades)
+    # Tras compactar no quedan ranuras borradas: las ocupadas son las filas
+    tabla._ocupadas = len(tabla._cantidades)
+    return tabla
+
+
+def desde_diccionario(productos):
+    """Convierte el diccionario {ID: Producto} de los archivos antiguos."""
+    tabla = TablaProductos()
+    for id_producto, producto in productos.items():
+        tabla[id_producto] = producto
+    return tabla
+
+
+def guardar_tabla(tabla, archivo):
+    """
+    Formato: MAGIA, largo del pickle de cabecera, cabecera y luego cada búfer
+    precedido de su largo. Los arreglos se escriben desde su propia memoria.
+    """
+    buferes = []
+    cabecera = pickle.dumps(tabla, protocol=5, buffer_callback=buferes.append)
+    with open(archivo, "wb") as f:
+        f.write(MAGIA)
+        f.write(len(cabecera).to_bytes(8, "little"))
+        f.write(cabecera)
+        for b in buferes:
+            vista = b.raw()
+            f.write(vista.nbytes.to_bytes(8, "little"))
+            f.write(vista)
+            vista.release()
+
+
+def cargar_tabla(archivo):
+    """Lee una tabla guardada con guardar_tabla o un pickle antiguo con el diccionario completo."""
+    with open(archivo, "rb") as f:
+        if f.read(len(MAGIA)) != MAGIA:
+            f.seek(0)
+            return desde_diccionario(pickle.load(f))
+        largo = int.from_bytes(f.read(8), "little")
+        cabecera = f.read(largo)
+        buferes = []
+        while True:
+            prefijo = f.read(8)
+            if not prefijo:
+                break
+            b = bytearray(int.from_bytes(prefijo, "little"))
+            if f.readinto(b) != len(b):
+                raise EOFError(f"'{archivo}' está truncado.")
+            buferes.append(b)
+    return pickle.loads(cabecera, buffers=buferes)
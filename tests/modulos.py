@@ -0,0 +1,33 @@
+"""Carga de los scripts del repo por ruta para las pruebas."""
+
+import importlib.util
+import os
+import sys
+from typing import Any
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cargar_modulo(ruta_relativa: str, nombre: str) -> Any:
+    """
+    Importa un script del repo con un nombre propio. Su carpeta va primero en
+    sys.path mientras se importa (por sus módulos hermanos) y luego los hermanos
+    se quitan de sys.modules: varias carpetas tienen módulos con el mismo nombre
+    (inventario, producto...) y cada prueba debe ver los de la suya.
+    """
+    ruta = os.path.join(RAIZ, ruta_relativa)
+    antes = set(sys.modules)
+    sys.path.insert(0, os.path.dirname(ruta))
+    try:
+        spec = importlib.util.spec_from_file_location(nombre, ruta)
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules[nombre] = modulo  # dataclasses lo busca aquí
+        spec.loader.exec_module(modulo)
+    finally:
+        sys.path.pop(0)
+        carpeta = os.path.dirname(ruta)
+        for clave in set(sys.modules) - antes:
+            archivo = getattr(sys.modules[clave], "__file__", None) or ""
+            if clave != nombre and os.path.dirname(os.path.abspath(archivo)) == carpeta:
+                del sys.modules[clave]
+    return modulo
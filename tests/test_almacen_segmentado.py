@@ -0,0 +1,177 @@
+"""Guardado por segmentos de TAREA SEMANA 11: manifiesto, guardado incremental y cortes."""
+
+import os
+import pickle
+
+import pytest
+
+from modulos import cargar_modulo
+
+almacen = cargar_modulo("TAREA SEMANA 11/almacen_segmentado.py", "almacen_segmentado_semana11")
+sistema = cargar_modulo("TAREA SEMANA 11/sistema_inventario.py", "sistema_inventario_segmentos")
+Producto = sistema.Producto
+
+
+def catalogo(n, desde=0):
+    return {f"id{i}": Producto(f"id{i}", f"producto {i}", i, i * 1.25) for i in range(desde, desde + n)}
+
+
+def filas(productos):
+    return sorted((p.obtener_id(), p.obtener_nombre(), p.obtener_cantidad(), p.obtener_precio())
+                  for p in productos.values())
+
+
+def segmentos(archivo):
+    return sorted(os.listdir(almacen.AlmacenSegmentado.directorio_de(archivo)))
+
+
+@pytest.fixture
+def guardado(tmp_path):
+    archivo = str(tmp_path / "inventario.pkl")
+    productos = catalogo(300)
+    a = almacen.AlmacenSegmentado(Producto, num_segmentos=8)
+    assert a.guardar(productos, archivo) == 8
+    return a, productos, archivo
+
+
+def test_ida_y_vuelta_completa_y_perezosa(guardado):
+    _, productos, archivo = guardado
+    with open(archivo, "rb") as f:
+        manifiesto = pickle.load(f)
+    assert manifiesto["formato"] == almacen.FORMATO and manifiesto["generacion"] == 1
+    assert sorted(manifiesto["segmentos"].values()) == segmentos(archivo)
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(archivo)) == filas(productos)
+    perezosos = almacen.AlmacenSegmentado(Producto).cargar_perezoso(archivo, limite=5)
+    assert filas(perezosos) == filas(productos)
+    assert len(perezosos._residentes) == 5
+
+
+def test_solo_se_reescriben_los_segmentos_modificados(guardado):
+    a, productos, archivo = guardado
+    productos["id3"].establecer_cantidad(1000)
+    a.modificado("id3")
+    del productos["id4"]
+    a.eliminado("id4")
+    sucios = {almacen.segmento_de(i, 8) for i in ("id3", "id4")}
+    assert a.guardar(productos, archivo) == len(sucios)
+    assert len(segmentos(archivo)) == 8  # los segmentos reemplazados se borran
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(archivo)) == filas(productos)
+
+
+def test_un_corte_antes_del_manifiesto_conserva_el_guardado_anterior(guardado, monkeypatch):
+    a, productos, archivo = guardado
+    esperado = filas(productos)
+    escribir = almacen._escribir_atomico
+
+    def cortar_en_manifiesto(ruta, partes):
+        if ruta == archivo:
+            raise OSError("disco lleno")
+        escribir(ruta, partes)
+
+    productos.update(catalogo(50, desde=1000))
+    for i in range(1000, 1050):
+        a.agregado(f"id{i}")
+    monkeypatch.setattr(almacen, "_escribir_atomico", cortar_en_manifiesto)
+    with pytest.raises(OSError):
+        a.guardar(productos, archivo)
+    monkeypatch.undo()
+    # El manifiesto vigente sigue apuntando a la generación anterior
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(archivo)) == esperado
+    # Reintentar guarda todo y borra los segmentos que quedaron huérfanos
+    a.guardar(productos, archivo)
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(archivo)) == filas(productos)
+    assert len(segmentos(archivo)) == 8
+
+
+def test_pickle_antiguo_se_carga_y_se_convierte(tmp_path):
+    archivo = str(tmp_path / "inventario.pkl")
+    productos = catalogo(40)
+    with open(archivo, "wb") as f:
+        pickle.dump(productos, f)
+    a = almacen.AlmacenSegmentado(Producto, num_segmentos=4)
+    cargados = a.cargar(archivo)
+    assert filas(cargados) == filas(productos)
+    assert a.guardar(cargados, archivo) == 4
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(archivo)) == filas(productos)
+
+
+def test_manifiesto_dañado_se_informa_sin_perder_el_inventario(guardado, capsys):
+    _, productos, archivo = guardado
+    with open(archivo, "rb") as f:
+        datos = f.read()
+    with open(archivo, "wb") as f:
+        f.write(datos[:len(datos) // 2])
+    inv = sistema.Inventario()
+    inv.agregar_producto(Producto("x", "x", 1, 1.0))
+    inv.cargar_inventario(archivo)
+    assert "está dañado o incompleto" in capsys.readouterr().out
+    assert list(inv.productos) == ["x"]
+
+
+def otro_guardado_sin_un_segmento(tmp_path):
+    """Un inventario distinto en otro archivo, al que le falta uno de sus segmentos."""
+    archivo = str(tmp_path / "otro.pkl")
+    almacen.AlmacenSegmentado(Producto, num_segmentos=8).guardar(catalogo(30, desde=500), archivo)
+    os.remove(os.path.join(almacen.AlmacenSegmentado.directorio_de(archivo), segmentos(archivo)[0]))
+    return archivo
+
+
+@pytest.mark.parametrize("perezoso", [False, True])
+def test_carga_fallida_no_cambia_el_estado_del_guardado(guardado, tmp_path, perezoso):
+    a, productos, archivo = guardado
+    otro = otro_guardado_sin_un_segmento(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        a.cargar_perezoso(otro) if perezoso else a.cargar(otro)
+    assert a.archivo == archivo and a.generacion == 1
+    # Guardar lo que hay en memoria sobre el archivo que falló lo reescribe completo
+    assert a.guardar(productos, otro) == 8
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(otro)) == filas(productos)
+    # Y el archivo propio sigue guardándose de forma incremental
+    productos["id1"].establecer_cantidad(77)
+    a.modificado("id1")
+    assert a.guardar(productos, archivo) == 8  # `a` ahora corresponde a `otro`
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(archivo)) == filas(productos)
+
+
+def test_inventario_conserva_sus_productos_si_la_carga_falla(guardado, tmp_path, capsys):
+    _, productos, archivo = guardado
+    inv = sistema.Inventario()
+    inv.cargar_inventario(archivo, perezoso=True, limite=10)
+    inv.actualizar_producto("id2", nueva_cantidad=500)
+    otro = otro_guardado_sin_un_segmento(tmp_path)
+    inv.cargar_inventario(otro, perezoso=True)
+    assert "no existe" in capsys.readouterr().out
+    inv.guardar_inventario(archivo)
+    assert "(1 de 8 segmentos reescritos)" in capsys.readouterr().out
+    cargados = almacen.AlmacenSegmentado(Producto).cargar(archivo)
+    assert cargados["id2"].obtener_cantidad() == 500 and len(cargados) == len(productos)
+
+
+def test_perezoso_modificar_borrar_y_guardar(guardado):
+    _, productos, archivo = guardado
+    a = almacen.AlmacenSegmentado(Producto)
+    perezosos = a.cargar_perezoso(archivo, limite=3)
+    assert len(perezosos._residentes) == 0 and len(perezosos) == 300
+    assert dict(perezosos.nombres())["id7"] == "producto 7"
+    # La caché LRU no pasa del límite y los modificados no se descartan
+    for i in range(10):
+        perezosos[f"id{i}"]
+    assert list(perezosos._residentes) == ["id7", "id8", "id9"]
+    perezosos["id8"].establecer_precio(0.5)
+    a.modificado("id8")
+    for i in range(20, 30):
+        perezosos[f"id{i}"]
+    assert perezosos["id8"].obtener_precio() == 0.5
+    del perezosos["id9"]
+    a.eliminado("id9")
+    perezosos["nuevo"] = Producto("nuevo", "nuevo", 1, 1.0)
+    a.agregado("nuevo")
+    sucios = {almacen.segmento_de(i, 8) for i in ("id8", "id9", "nuevo")}
+    assert a.guardar(perezosos, archivo) == len(sucios)
+    assert not perezosos._modificados and len(perezosos._residentes) <= 3
+    esperado = dict(productos)
+    esperado["id8"].establecer_precio(0.5)
+    del esperado["id9"]
+    esperado["nuevo"] = Producto("nuevo", "nuevo", 1, 1.0)
+    assert filas(perezosos) == filas(esperado)
+    assert filas(almacen.AlmacenSegmentado(Producto).cargar(archivo)) == filas(esperado)
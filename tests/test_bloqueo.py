@@ -0,0 +1,125 @@
+"""Bloqueo entre procesos de TAREA 10 y fusión de guardados concurrentes."""
+
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from modulos import cargar_modulo
+
+t10 = cargar_modulo("TAREA 10/inventario.py", "inventario_t10_bloqueo")
+BloqueoArchivo = t10.BloqueoArchivo
+BloqueoOcupado = t10.BloqueoOcupado
+Producto = t10.Producto
+
+requiere_fcntl = pytest.mark.skipif(sys.platform == "win32", reason="flock solo existe en POSIX")
+
+
+@requiere_fcntl
+def test_contencion_agota_la_espera(tmp_path):
+    ruta = str(tmp_path / "inv.json.lock")
+    a, b = BloqueoArchivo(ruta), BloqueoArchivo(ruta)
+    with a.retener():
+        with pytest.raises(BloqueoOcupado) as exc:
+            b.adquirir(espera=0.1)
+        assert exc.value.ruta == ruta
+        assert not b.retenido
+    with b.retener(espera=0.1):  # ya liberado
+        assert b.retenido
+
+
+def test_reentrada_en_el_mismo_proceso(tmp_path):
+    bloqueo = BloqueoArchivo(str(tmp_path / "inv.json.lock"))
+    with bloqueo.retener():
+        with bloqueo.retener():
+            assert bloqueo._profundidad == 2
+        assert bloqueo.retenido
+    assert not bloqueo.retenido
+    with pytest.raises(RuntimeError):
+        bloqueo.liberar()
+
+
+def test_otro_hilo_espera_a_que_se_libere(tmp_path):
+    bloqueo = BloqueoArchivo(str(tmp_path / "inv.json.lock"))
+    orden = []
+    bloqueo.adquirir()
+
+    def otro():
+        with bloqueo.retener(espera=5):
+            orden.append("otro")
+
+    hilo = threading.Thread(target=otro)
+    hilo.start()
+    hilo.join(0.2)
+    assert hilo.is_alive()  # sigue esperando
+    orden.append("dueño")
+    bloqueo.liberar()
+    hilo.join(5)
+    assert orden == ["dueño", "otro"]
+
+
+@requiere_fcntl
+def test_archivo_de_bloqueo_huerfano_no_bloquea(tmp_path):
+    """Un proceso que muere con el bloqueo tomado deja el .lock, pero no el flock."""
+    ruta = str(tmp_path / "inv.json.lock")
+    codigo = (
+        "import fcntl, os, sys\n"
+        "fd = os.open(sys.argv[1], os.O_RDWR | os.O_CREAT)\n"
+        "fcntl.flock(fd, fcntl.LOCK_EX)\n"
+        "os._exit(9)\n"
+    )
+    assert subprocess.run([sys.executable, "-c", codigo, ruta]).returncode == 9
+    assert (tmp_path / "inv.json.lock").exists()
+    bloqueo = BloqueoArchivo(ruta)
+    with bloqueo.retener(espera=0.5):
+        assert bloqueo.retenido
+
+
+@requiere_fcntl
+def test_diario_abierto_deja_al_segundo_en_solo_lectura(tmp_path):
+    ruta = str(tmp_path / "inv.json")
+    escritor = t10.Inventario(ruta, usar_diario=True, espera_bloqueo=0.1)
+    assert escritor.agregar(Producto("A", "uno", 1, 1.0))[0]
+    lector = t10.Inventario(ruta, usar_diario=True, espera_bloqueo=0.1)
+    assert lector.solo_lectura and "solo lectura" in lector.mensaje_inicio()
+    ok, msg = lector.agregar(Producto("B", "dos", 1, 1.0))
+    assert not ok and "solo lectura" in msg
+    escritor.cerrar()
+
+
+def ids(inv):
+    return sorted(p.id for p in inv.listar())
+
+
+def test_fusion_de_tres_vias_sin_conflicto(tmp_path):
+    ruta = str(tmp_path / "inv.json")
+    base = t10.Inventario(ruta)
+    assert base.agregar(Producto("X", "común", 5, 2.0))[0]
+    a, b = t10.Inventario(ruta), t10.Inventario(ruta)
+    assert a.agregar(Producto("A", "de a", 1, 1.0))[0]
+    assert a.actualizar("X", cantidad=7)[0]
+    ok, msg = b.agregar(Producto("B", "de b", 1, 1.0))
+    assert ok, msg
+    assert ids(b) == ["A", "B", "X"] and b.buscar_por_id("X").cantidad == 7
+    assert ids(t10.Inventario(ruta)) == ["A", "B", "X"]
+    assert b.version == a.version + 1
+
+
+def test_fusion_de_tres_vias_con_conflicto(tmp_path):
+    ruta = str(tmp_path / "inv.json")
+    base = t10.Inventario(ruta)
+    assert base.agregar(Producto("X", "común", 5, 2.0))[0]
+    a, b = t10.Inventario(ruta), t10.Inventario(ruta)
+    assert a.eliminar("X")[0]
+    ok, msg = b.actualizar("X", cantidad=1)
+    assert not ok and "Conflicto" in msg and "'X' fue eliminado por otro proceso" in msg
+    # Ni el disco ni la memoria de b reciben el cambio rechazado
+    assert ids(t10.Inventario(ruta)) == []
+    assert b.buscar_por_id("X").cantidad == 5
+    assert b.recargar_si_cambio()[0] and ids(b) == []
+    # Dos altas del mismo id
+    assert a.agregar(Producto("N", "de a", 1, 1.0))[0]
+    ok, msg = b.agregar(Producto("N", "de b", 1, 1.0))
+    assert not ok and "ya fue agregado por otro proceso" in msg
+    assert t10.Inventario(ruta).buscar_por_id("N").nombre == "de a"
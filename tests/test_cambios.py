@@ -0,0 +1,169 @@
+"""Flujo de cambios de TAREA 10: anillo en memoria, suscripciones y archivo de eventos."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from modulos import cargar_modulo
+
+cambios = cargar_modulo("TAREA 10/cambios.py", "cambios_t10")
+t10 = cargar_modulo("TAREA 10/inventario.py", "inventario_t10_cambios")
+
+
+def eventos(*secuencias):
+    return [{"secuencia": s, "op": "agregar"} for s in secuencias]
+
+
+def secuencias(lote):
+    return [e["secuencia"] for e in lote]
+
+
+def esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "la condición no se cumplió a tiempo"
+        time.sleep(0.01)
+
+
+# ---------------------- En memoria ----------------------
+def test_anillo_desbordado_informa_los_perdidos():
+    buffer = cambios.BufferCambios(capacidad=5)
+    for s in range(1, 13):
+        buffer.publicar(eventos(s))
+    lote, perdidos = buffer.leer_desde(0)
+    assert secuencias(lote) == [8, 9, 10, 11, 12] and perdidos == 7
+    lote, perdidos = buffer.leer_desde(9, maximo=2)
+    assert secuencias(lote) == [10, 11] and perdidos == 0
+    assert buffer.leer_desde(12) == ([], 0)
+
+
+def test_saltos_de_secuencia_no_cuentan_como_perdidos():
+    # Con el archivo compartido otros procesos consumen secuencias intermedias
+    buffer = cambios.BufferCambios(capacidad=10)
+    buffer.publicar(eventos(1, 2, 5, 9))
+    assert buffer.leer_desde(3) == (eventos(5, 9), 0)
+    assert buffer.leer_desde(5) == (eventos(9), 0)
+    assert not buffer.esperar(9, tiempo=0.01)
+
+
+def test_suscriptor_lento_pierde_eventos_sin_frenar_al_publicador():
+    buffer = cambios.BufferCambios(capacidad=10)
+    recibidos, primera_entrega, seguir = [], threading.Event(), threading.Event()
+
+    def lento(lote):
+        recibidos.extend(secuencias(lote))
+        primera_entrega.set()
+        seguir.wait(5)
+
+    suscripcion = buffer.suscribir(lento, tam_lote=3)
+    buffer.publicar(eventos(1))
+    assert primera_entrega.wait(5)
+    inicio = time.monotonic()
+    for s in range(2, 51):
+        buffer.publicar(eventos(s))
+    assert time.monotonic() - inicio < 1.0
+    seguir.set()
+    esperar(lambda: suscripcion.secuencia == 50)
+    suscripcion.detener()
+    assert recibidos == sorted(recibidos) and recibidos[-1] == 50
+    assert suscripcion.perdidos == 50 - len(recibidos) > 0
+    assert suscripcion.error is None
+
+
+def test_suscriptor_que_falla_se_detiene():
+    buffer = cambios.BufferCambios()
+
+    def falla(lote):
+        raise RuntimeError("exportador caído")
+
+    suscripcion = buffer.suscribir(falla)
+    buffer.publicar(eventos(1))
+    esperar(lambda: suscripcion.error is not None)
+    assert str(suscripcion.error) == "exportador caído" and suscripcion.secuencia == 0
+    suscripcion.detener()
+
+
+# ---------------------- En archivo ----------------------
+def test_seguidor_con_punto_de_control(tmp_path):
+    ruta, control = str(tmp_path / "inv.cambios"), str(tmp_path / "exportador.control")
+    registro = cambios.RegistroCambios(ruta)
+    registro.escribir(cambios.crear_eventos([{"op": "agregar"}] * 5, registro.siguiente_secuencia(), 1))
+    seguidor = cambios.SeguidorCambios(ruta, control, tam_lote=3)
+    assert secuencias(seguidor.leer_lote()) == [1, 2, 3]
+    seguidor.confirmar()
+    assert secuencias(seguidor.leer_lote()) == [4, 5]  # sin confirmar
+    # Otro seguidor retoma desde el punto de control guardado
+    otro = cambios.SeguidorCambios(ruta, control, tam_lote=10)
+    assert secuencias(otro.leer_lote()) == [4, 5]
+    registro.escribir(cambios.crear_eventos([{"op": "eliminar"}], registro.siguiente_secuencia(), 2))
+    otro.confirmar()
+    lote = otro.leer_lote()
+    assert secuencias(lote) == [6] and lote[0]["version"] == 2
+    registro.cerrar()
+
+
+def test_linea_a_medio_escribir_se_entrega_al_completarse(tmp_path):
+    ruta = tmp_path / "inv.cambios"
+    ruta.write_bytes(b'{"secuencia":1}\n{"secuencia":2')
+    seguidor = cambios.SeguidorCambios(str(ruta))
+    assert secuencias(seguidor.leer_lote()) == [1]
+    seguidor.confirmar()
+    assert seguidor.leer_lote() == []
+    with open(ruta, "ab") as f:
+        f.write(b',"op":"agregar"}\n')
+    assert secuencias(seguidor.leer_lote()) == [2]
+
+
+def test_archivo_truncado_por_una_caida(tmp_path):
+    ruta = tmp_path / "inv.cambios"
+    ruta.write_bytes(b'{"secuencia":1}\n{"secuencia":2}\n{"secuen')
+    assert cambios.ultima_secuencia(str(ruta)) == 2
+    # Reabrir el registro cierra la línea cortada; el siguiente evento va en una línea propia
+    registro = cambios.RegistroCambios(str(ruta))
+    assert registro.siguiente_secuencia() == 3
+    registro.escribir(eventos(3))
+    registro.cerrar()
+    seguidor = cambios.SeguidorCambios(str(ruta))
+    assert secuencias(seguidor.leer_lote()) == [1, 2, 3] and seguidor.descartadas == 1
+
+
+def test_archivo_reemplazado_por_uno_mas_corto(tmp_path):
+    ruta, control = tmp_path / "inv.cambios", str(tmp_path / "exportador.control")
+    ruta.write_bytes(b"".join(json.dumps({"secuencia": s}).encode() + b"\n" for s in range(1, 20)))
+    seguidor = cambios.SeguidorCambios(str(ruta), control)
+    seguidor.leer_lote()
+    seguidor.confirmar()
+    ruta.write_bytes(b'{"secuencia":1}\n')  # rotado
+    with pytest.raises(ValueError, match="más corto que el punto de control"):
+        cambios.SeguidorCambios(str(ruta), control).leer_lote()
+    ruta.unlink()
+    assert cambios.SeguidorCambios(str(ruta), control).leer_lote() == []
+    assert cambios.ultima_secuencia(str(ruta)) == 0
+
+
+def test_ultima_secuencia_con_una_cola_chica(tmp_path):
+    ruta = tmp_path / "inv.cambios"
+    ruta.write_bytes(b"".join(json.dumps({"secuencia": s, "relleno": "x" * 50}).encode() + b"\n"
+                              for s in range(1, 200)) + b"basura sin terminar")
+    assert cambios.ultima_secuencia(str(ruta), tam_cola=16) == 199
+
+
+# ---------------------- Con el inventario ----------------------
+def test_inventario_publica_en_el_anillo_y_en_el_archivo(tmp_path):
+    ruta = str(tmp_path / "inv.json")
+    inv = t10.Inventario(ruta, registrar_cambios=True)
+    assert inv.agregar(t10.Producto("A", "uno", 1, 1.0))[0]
+    assert inv.actualizar("A", cantidad=4)[0]
+    assert inv.eliminar("A")[0]
+    lote, perdidos = inv.cambios.leer_desde(0)
+    assert [e["op"] for e in lote] == ["agregar", "actualizar", "eliminar"] and perdidos == 0
+    assert secuencias(lote) == [1, 2, 3] and [e["version"] for e in lote] == [1, 2, 3]
+    # Un segundo proceso continúa la secuencia del archivo compartido
+    otro = t10.Inventario(ruta, registrar_cambios=True)
+    assert otro.agregar(t10.Producto("B", "dos", 1, 1.0))[0]
+    assert secuencias(otro.cambios.leer_desde(0)[0]) == [4]
+    assert secuencias(cambios.SeguidorCambios(inv.ruta_cambios).leer_lote()) == [1, 2, 3, 4]
+    inv.cerrar()
+    otro.cerrar()
@@ -0,0 +1,49 @@
+"""Generador de carga de TAREA 10 contra el servicio y contra un puerto cerrado."""
+
+import asyncio
+import socket
+
+from modulos import cargar_modulo
+
+carga = cargar_modulo("TAREA 10/carga_servicio.py", "carga_servicio_t10")
+servicio = cargar_modulo("TAREA 10/servicio.py", "servicio_t10")
+
+
+def puerto_cerrado():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def argumentos(puerto, *extra):
+    return carga.crear_parser().parse_args(["--host", "127.0.0.1", "--puerto", str(puerto), *extra])
+
+
+def test_puerto_cerrado_informa_las_conexiones_fallidas(capsys):
+    args = argumentos(puerto_cerrado(), "--clientes", "3", "--peticiones", "5")
+    assert asyncio.run(carga.ejecutar(args)) == 1
+    salida = capsys.readouterr().out
+    assert "0 peticiones respondidas de 0/3 clientes" in salida
+    assert "sin respuestas" in salida
+    assert "3 errores (3 conexiones fallidas)" in salida
+
+
+def test_carga_contra_el_servicio(tmp_path, capsys):
+    async def correr():
+        serv = servicio.ServicioInventario(str(tmp_path / "inv.json"))
+        ok, msg = await serv.iniciar()
+        assert ok, msg
+        servidor = await asyncio.start_server(serv.conexion, "127.0.0.1", 0, limit=servicio.LIMITE_LINEA)
+        puerto = servidor.sockets[0].getsockname()[1]
+        try:
+            args = argumentos(puerto, "--clientes", "4", "--peticiones", "25", "--escrituras", "0.3")
+            return await carga.ejecutar(args)
+        finally:
+            servidor.close()
+            await servidor.wait_closed()
+            await serv.detener()
+
+    assert asyncio.run(correr()) == 0
+    salida = capsys.readouterr().out
+    assert "100 peticiones respondidas de 4/4 clientes" in salida
+    assert "agregar" in salida and "❌" not in salida
@@ -0,0 +1,79 @@
+"""Diario de TAREA 10: reproducción al abrir y recuperación tras una escritura cortada."""
+
+import glob
+import os
+
+import pytest
+
+from modulos import cargar_modulo
+
+t10 = cargar_modulo("TAREA 10/inventario.py", "inventario_t10")
+Diario = t10.Diario
+Producto = t10.Producto
+
+
+def abrir(ruta, **opciones):
+    return t10.Inventario(str(ruta), usar_diario=True, **opciones)
+
+
+def estado(inv):
+    return sorted((p.id, p.nombre, p.cantidad, p.precio) for p in inv.listar())
+
+
+@pytest.fixture
+def con_cambios(tmp_path):
+    ruta = tmp_path / "inventario.json"
+    inv = abrir(ruta)
+    for i in range(20):
+        assert inv.agregar(Producto(f"P{i}", f"prod {i}", i, i + 0.5))[0]
+    assert inv.actualizar("P3", nombre="nuevo", cantidad=99)[0]
+    assert inv.eliminar("P7")[0]
+    esperado = estado(inv)
+    inv.cerrar()
+    return ruta, esperado
+
+
+def test_reabrir_reproduce_el_diario(con_cambios):
+    ruta, esperado = con_cambios
+    inv = abrir(ruta)
+    assert inv.mensaje_inicio().startswith("Inventario cargado correctamente")
+    assert estado(inv) == esperado
+    # Tras compactar todo queda en la instantánea y el diario vacío
+    assert inv.compactar()[0]
+    inv.cerrar()
+    assert os.path.getsize(f"{ruta}.diario") == 0
+    assert estado(t10.Inventario(str(ruta))) == esperado
+
+
+def test_ultimo_registro_cortado_se_respalda_y_descarta(con_cambios):
+    ruta, esperado = con_cambios
+    diario = f"{ruta}.diario"
+    tam_valido = os.path.getsize(diario)
+    with open(diario, "ab") as f:
+        f.write(b'{"op":"agregar","producto":{"id":"X","nom')  # corte de energía a mitad de escritura
+    inv = abrir(ruta)
+    assert "terminaba en un registro incompleto" in inv.mensaje_inicio()
+    assert estado(inv) == esperado
+    assert os.path.getsize(diario) == tam_valido
+    respaldos = glob.glob(os.path.join(os.path.dirname(diario), "inventario.json.corrupto-*"))
+    assert len(respaldos) == 1 and os.path.getsize(respaldos[0]) > tam_valido
+    # El diario reparado sigue aceptando cambios
+    assert inv.agregar(Producto("X", "x", 1, 1.0))[0]
+    inv.cerrar()
+    inv = abrir(ruta)
+    assert inv.mensaje_inicio().startswith("Inventario cargado correctamente")
+    assert len(inv.listar()) == len(esperado) + 1
+    inv.cerrar()
+
+
+def test_leer_entrega_los_registros_validos_antes_del_error(tmp_path):
+    ruta = str(tmp_path / "d.diario")
+    with open(ruta, "wb") as f:
+        f.write(b'{"op":"eliminar","id":"a"}\n{"op":"eliminar","id":"b"}\nno es json\n{"op":"eliminar","id":"c"}\n')
+    leidos = []
+    with pytest.raises(t10.DiarioCorrupto) as error:
+        for registro in Diario.leer(ruta):
+            leidos.append(registro["id"])
+    assert leidos == ["a", "b"]
+    assert error.value.registros_validos == 2
+    assert error.value.desplazamiento == len(b'{"op":"eliminar","id":"a"}\n{"op":"eliminar","id":"b"}\n')
@@ -0,0 +1,82 @@
+"""Estadísticas incrementales de Tarea_N9, TAREA SEMANA 11 y tarea_inventario_text_id."""
+
+import random
+
+import pytest
+
+from modulos import cargar_modulo
+
+n9 = cargar_modulo("Tarea_N9/Inventario.py", "Inventario")
+n9_sqlite = cargar_modulo("Tarea_N9/almacen_sqlite.py", "almacen_sqlite_n9")
+semana11 = cargar_modulo("TAREA SEMANA 11/sistema_inventario.py", "sistema_inventario_semana11")
+text_id = cargar_modulo("tarea_inventario_text_id/sistema_inventario.py", "sistema_inventario_text_id")
+
+
+class OperacionesN9:
+    def __init__(self, inv):
+        self.inv = inv
+
+    def agregar(self, id_, cantidad, precio):
+        self.inv.agregar_producto(n9.Producto(id_, f"p{id_}", cantidad, precio))
+
+    def eliminar(self, id_):
+        self.inv.eliminar_por_id(id_)
+
+    def actualizar(self, id_, cantidad, precio):
+        self.inv.actualizar_cantidad(id_, cantidad)
+        self.inv.actualizar_precio(id_, precio)
+
+    def contar(self):
+        return len(self.inv)
+
+
+class OperacionesSistema:
+    def __init__(self, modulo):
+        self.modulo = modulo
+        self.inv = modulo.Inventario()
+
+    def agregar(self, id_, cantidad, precio):
+        self.inv.agregar_producto(self.modulo.Producto(id_, f"p{id_}", cantidad, precio))
+
+    def eliminar(self, id_):
+        self.inv.eliminar_producto(id_)
+
+    def actualizar(self, id_, cantidad, precio):
+        self.inv.actualizar_producto(id_, cantidad, precio)
+
+    def contar(self):
+        return len(self.inv.productos)
+
+
+@pytest.fixture(params=["n9_memoria", "n9_sqlite", "semana11", "text_id"])
+def operaciones(request):
+    if request.param == "n9_memoria":
+        yield OperacionesN9(n9.Inventario())
+    elif request.param == "n9_sqlite":
+        inv = n9_sqlite.InventarioSQLite(":memory:")
+        yield OperacionesN9(inv)
+        inv.cerrar()
+    else:
+        yield OperacionesSistema(semana11 if request.param == "semana11" else text_id)
+
+
+def test_agregados_coinciden_tras_cambios_al_azar(operaciones, capsys):
+    azar = random.Random(18)
+    inv = operaciones.inv
+    for i in range(30):
+        operaciones.agregar(str(i), azar.randint(0, 50), round(azar.uniform(0.5, 900), 2))
+    inv.estadisticas()  # desde aquí los agregados se ajustan en cada cambio
+    for _ in range(400):
+        id_ = str(azar.randrange(60))
+        op = azar.random()
+        if op < 0.4:
+            operaciones.agregar(id_, azar.randint(0, 50), round(azar.uniform(0.5, 900), 2))
+        elif op < 0.7:
+            operaciones.eliminar(id_)
+        else:
+            operaciones.actualizar(id_, azar.randint(0, 50), round(azar.uniform(0.5, 900), 2))
+        if azar.random() < 0.05:
+            assert inv.verificar_estadisticas() == []
+    assert inv.verificar_estadisticas() == []
+    assert inv._estadisticas is not None  # se ajustaron en cada cambio, sin recalcular
+    assert inv.estadisticas().productos == operaciones.contar()
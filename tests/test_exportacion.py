@@ -0,0 +1,53 @@
+"""Exportación a CSV de TAREA 10: fragmentos, gzip y limpieza de temporales."""
+
+import csv
+import gzip
+from types import SimpleNamespace
+
+import pytest
+
+from modulos import cargar_modulo
+
+exportacion = cargar_modulo("TAREA 10/exportacion.py", "exportacion_tarea10")
+
+PRODUCTOS = [SimpleNamespace(id=f"P{i}", nombre=f'nombre, "{i}"\nlinea', cantidad=i, precio=i / 3)
+             for i in range(1234)]
+
+
+def leer(ruta):
+    abrir = gzip.open if ruta.endswith(".gz") else open
+    with abrir(ruta, "rt", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+@pytest.mark.parametrize("fragmentos, sufijo, procesos", [(1, ".csv", None), (1, ".csv.gz", None),
+                                                         (4, ".csv.gz", 1), (3, ".csv", 2), (2000, ".csv", 1)])
+def test_fragmentos_juntos_dan_todas_las_filas(tmp_path, fragmentos, sufijo, procesos):
+    ruta = str(tmp_path / f"inventario{sufijo}")
+    ok, msg = exportacion.exportar_csv(PRODUCTOS, ruta, fragmentos=fragmentos, procesos=procesos, tam_lote=100)
+    assert ok, msg
+    filas = []
+    for r in exportacion.rutas_fragmentos(ruta, fragmentos):
+        contenido = leer(r)
+        assert contenido[0] == exportacion.ENCABEZADO
+        filas += contenido[1:]
+    assert filas == [[p.id, p.nombre, str(p.cantidad), "%.2f" % p.precio] for p in PRODUCTOS]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("fragmentos", [1, 3])
+def test_un_error_a_mitad_no_deja_temporales(tmp_path, fragmentos):
+    class Productos:
+        def __len__(self):
+            return len(PRODUCTOS)
+
+        def __iter__(self):
+            for i, p in enumerate(PRODUCTOS):
+                if i == 900:
+                    raise OSError("disco lleno")
+                yield p
+
+    ok, msg = exportacion.exportar_csv(Productos(), str(tmp_path / "inventario.csv"), fragmentos=fragmentos,
+                                       procesos=1, tam_lote=100)
+    assert not ok and "disco lleno" in msg
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,117 @@
+"""Formato columnar INVCOL02 de TAREA 10: ida y vuelta, compatibilidad y archivos dañados."""
+
+import glob
+import os
+
+import pytest
+
+from modulos import cargar_modulo
+
+columnar = cargar_modulo("TAREA 10/formato_columnar.py", "formato_columnar_t10")
+t10 = cargar_modulo("TAREA 10/inventario.py", "inventario_t10_columnar")
+
+FILAS = [
+    ("b2", "Teclado, inalámbrico", 10, 25.5),
+    ("a1", "ñandú 🦤", 0, 0.0),
+    ("c3", "", 2 ** 40, 1e-7),
+    ("ä", "con\nsalto", -1, 3.25),
+]
+
+
+def escribir(ruta, filas, version=0):
+    with open(ruta, "wb") as f:
+        return columnar.escribir_columnar(f, filas, version)
+
+
+def test_ida_y_vuelta(tmp_path):
+    ruta = str(tmp_path / "inv.col")
+    assert escribir(ruta, FILAS, version=7) == len(FILAS)
+    assert columnar.leer_version(ruta) == 7
+    catalogo = columnar.CatalogoColumnar(ruta, lambda *fila: fila)
+    try:
+        assert catalogo.version == 7
+        assert list(catalogo.filas()) == FILAS
+        for fila in FILAS:
+            assert catalogo[fila[0]] == fila
+        assert "zz" not in catalogo and "a" not in catalogo
+        with pytest.raises(KeyError):
+            catalogo["zz"]
+    finally:
+        catalogo.cerrar()
+
+
+def test_catalogo_vacio(tmp_path):
+    ruta = str(tmp_path / "inv.col")
+    escribir(ruta, [])
+    catalogo = columnar.CatalogoColumnar(ruta, lambda *fila: fila)
+    assert len(catalogo) == 0 and list(catalogo.filas()) == []
+    catalogo.cerrar()
+
+
+def test_conversion_json_columnar_conserva_filas_y_version(tmp_path):
+    col, json_ = str(tmp_path / "inv.col"), str(tmp_path / "inv.json")
+    escribir(col, FILAS, version=3)
+    assert columnar.columnar_a_json(col, json_) == len(FILAS)
+    os.remove(col)
+    assert columnar.json_a_columnar(json_, col) == len(FILAS)
+    assert columnar.leer_version(col) == 3
+    catalogo = columnar.CatalogoColumnar(col, lambda *fila: fila)
+    assert list(catalogo.filas()) == FILAS
+    catalogo.cerrar()
+
+
+def test_lee_el_formato_invcol01_como_version_0(tmp_path):
+    ruta = tmp_path / "inv.col"
+    escribir(str(ruta), FILAS, version=9)
+    datos = bytearray(ruta.read_bytes())
+    _, _, n, *secciones = columnar._CABECERA.unpack_from(datos, 0)
+    columnar._CABECERA_V1.pack_into(datos, 0, columnar.MAGIA_V1, n, *secciones)
+    ruta.write_bytes(bytes(datos))
+    catalogo = columnar.CatalogoColumnar(str(ruta), lambda *fila: fila)
+    assert catalogo.version == 0 and list(catalogo.filas()) == FILAS
+    catalogo.cerrar()
+
+
+def test_inventario_columnar_guarda_altas_cambios_y_bajas(tmp_path):
+    ruta = str(tmp_path / "inventario.col")
+    inv = t10.Inventario(ruta, formato="columnar")
+    for i in range(50):
+        assert inv.agregar(t10.Producto(f"P{i:02}", f"prod {i}", i, i / 4))[0]
+    assert inv.actualizar("P10", nombre="otro", precio=1.5)[0]
+    assert inv.eliminar("P20")[0]
+    esperado = sorted((p.id, p.nombre, p.cantidad, p.precio) for p in inv.listar())
+    inv.cerrar()
+    otro = t10.Inventario(ruta, formato="columnar")
+    assert sorted((p.id, p.nombre, p.cantidad, p.precio) for p in otro.listar()) == esperado
+    otro.cerrar()
+
+
+@pytest.mark.parametrize("recorte", [0, 5, 8, 40, 100, -9])
+def test_archivo_truncado(tmp_path, recorte):
+    ruta = tmp_path / "inv.col"
+    escribir(str(ruta), FILAS * 5)
+    datos = ruta.read_bytes()
+    ruta.write_bytes(datos[:recorte])
+    with pytest.raises(columnar.FormatoColumnarInvalido):
+        columnar.CatalogoColumnar(str(ruta), lambda *fila: fila)
+
+
+def test_magia_desconocida(tmp_path):
+    ruta = tmp_path / "inv.col"
+    escribir(str(ruta), FILAS)
+    ruta.write_bytes(b"INVCOL99" + ruta.read_bytes()[8:])
+    with pytest.raises(columnar.FormatoColumnarInvalido, match="no es un catálogo columnar"):
+        columnar.CatalogoColumnar(str(ruta), lambda *fila: fila)
+
+
+def test_inventario_respalda_un_archivo_columnar_dañado(tmp_path):
+    ruta = tmp_path / "inventario.col"
+    escribir(str(ruta), FILAS)
+    datos = ruta.read_bytes()
+    ruta.write_bytes(datos[:len(datos) // 2])
+    inv = t10.Inventario(str(ruta), formato="columnar")
+    assert "estaba corrupto" in inv.mensaje_inicio()
+    assert len(inv.listar()) == 0
+    respaldos = glob.glob(str(tmp_path / "inventario.corrupto-*.col"))
+    assert len(respaldos) == 1 and os.path.getsize(respaldos[0]) == len(datos) // 2
+    inv.cerrar()
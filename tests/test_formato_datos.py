@@ -0,0 +1,111 @@
+"""datos.txt de InventarioApp: formato v2, compatibilidad con el anterior y errores."""
+
+import pytest
+
+from modulos import cargar_modulo
+
+app = cargar_modulo("InventarioApp/inventario.py", "inventario_app")
+formato = app.formato
+Producto = app.Producto
+
+ENCABEZADO = "#INVENTARIO 2\tid_producto\tnombre\tcantidad\tprecio\n"
+
+
+def filas(inv):
+    return [(p.id_producto, p.nombre, p.cantidad, p.precio) for p in inv.mostrar_productos()]
+
+
+def test_ida_y_vuelta_con_caracteres_especiales(tmp_path):
+    ruta = str(tmp_path / "datos.txt")
+    inv = app.Inventario(ruta)
+    esperadas = [
+        ("A1", "Teclado, inalámbrico", 10, 25.5),
+        ("B\t2", "con\ttab y\nsalto\r", 0, 0.1),
+        ("C3", "barra \\n literal \\", 7, 1e-7),
+    ]
+    for fila in esperadas:
+        assert inv.agregar_producto(Producto(*fila))
+    assert filas(app.Inventario(ruta)) == esperadas
+    with open(ruta, encoding="utf-8") as f:
+        assert f.readline() == ENCABEZADO
+
+
+def test_ida_y_vuelta_en_varios_bloques(tmp_path, monkeypatch):
+    monkeypatch.setattr(formato, "TAM_BLOQUE", 16)
+    monkeypatch.setattr(formato, "FILAS_BLOQUE", 7)
+    ruta = str(tmp_path / "datos.txt")
+    inv = app.Inventario(ruta)
+    inv.productos = {f"P{i}": Producto(f"P{i}", f"n\\{i}\t", i, i + 0.25) for i in range(100)}
+    inv.guardar_en_archivo()
+    assert filas(app.Inventario(ruta)) == filas(inv)
+
+
+def test_formato_anterior_con_comas_en_el_nombre(tmp_path):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text("A1,Teclado,10,25.5\nA2,Mouse, óptico,3,2.0\n\nA1,repetido,1,1.0\n", encoding="utf-8")
+    inv = app.Inventario(str(ruta))
+    assert filas(inv) == [("A1", "Teclado", 10, 25.5), ("A2", "Mouse, óptico", 3, 2.0)]
+    inv.guardar_en_archivo()
+    assert ruta.read_text(encoding="utf-8").startswith(ENCABEZADO)
+    assert filas(app.Inventario(str(ruta))) == filas(inv)
+
+
+def test_formato_anterior_en_la_codificacion_del_sistema(tmp_path, monkeypatch):
+    # La versión anterior abría datos.txt sin encoding: en Windows quedaba en cp1252
+    ruta = tmp_path / "datos.txt"
+    ruta.write_bytes("A1,Café molido,3,4.5\nA2,Año €,1,2\n".encode("cp1252"))
+    monkeypatch.setattr(formato.locale, "getpreferredencoding", lambda hacer_setlocale=True: "cp1252")
+    inv = app.Inventario(str(ruta))
+    assert filas(inv) == [("A1", "Café molido", 3, 4.5), ("A2", "Año €", 1, 2.0)]
+    # Al guardar pasa al formato actual en UTF-8
+    inv.guardar_en_archivo()
+    assert ruta.read_text(encoding="utf-8").startswith(ENCABEZADO)
+    monkeypatch.undo()
+    assert filas(app.Inventario(str(ruta))) == filas(inv)
+
+
+def test_formato_anterior_en_utf8_no_usa_la_del_sistema(tmp_path, monkeypatch):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text("A1,Café,3,4.5\n", encoding="utf-8")
+    monkeypatch.setattr(formato.locale, "getpreferredencoding", lambda hacer_setlocale=True: "cp1252")
+    assert formato.codificacion(str(ruta)) == "utf-8"
+    assert filas(app.Inventario(str(ruta))) == [("A1", "Café", 3, 4.5)]
+
+
+def test_ids_repetidos_conservan_el_primero(tmp_path, monkeypatch):
+    monkeypatch.setattr(formato, "TAM_BLOQUE", 32)
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text(ENCABEZADO + "".join(f"P{i}\tn{i}\t{i}\t1\n" for i in range(20)) + "P3\totro\t0\t0\n",
+                    encoding="utf-8")
+    inv = app.Inventario(str(ruta))
+    assert inv.contar() == 20 and inv.buscar_producto("P3").nombre == "n3"
+    assert [p.id_producto for p in inv.mostrar_productos()] == [f"P{i}" for i in range(20)]
+    # Volver a cargar sobre un inventario con productos conserva los que ya estaban
+    inv.productos = {"P5": Producto("P5", "en memoria", 1, 1.0)}
+    inv.cargar_desde_archivo()
+    assert inv.contar() == 20 and inv.buscar_producto("P5").nombre == "en memoria"
+
+
+def test_archivo_vacio_y_ultima_linea_sin_salto(tmp_path):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text("")
+    assert app.Inventario(str(ruta)).contar() == 0
+    ruta.write_text(ENCABEZADO + "A\tb\t1\t2\n\nC\td\t3\t4")
+    assert filas(app.Inventario(str(ruta))) == [("A", "b", 1, 2.0), ("C", "d", 3, 4.0)]
+
+
+@pytest.mark.parametrize("contenido, mensaje", [
+    # Una fila de 5 campos junto a una de 3 suma los mismos campos que dos filas válidas
+    (ENCABEZADO + "a\tb\t1\t2\t3\nx\t4\t5\n", "Línea 2: se esperaban 4 campos y hay 5"),
+    (ENCABEZADO + "a\tb\t1\t2\nx\t4\t5\n", "Línea 3: se esperaban 4 campos y hay 3"),
+    # Los mismos tabuladores y saltos que dos filas válidas, pero todos en la primera
+    (ENCABEZADO + "a\tb\t1\t2\t3\t4\t5\nx\n", "Línea 2: se esperaban 4 campos y hay 7"),
+    (ENCABEZADO + "a\tb\tx\t2\n", "Línea 2: cantidad o precio no válidos"),
+    ("#INVENTARIO 3\n", "no soportada: 3"),
+    ("A1,Teclado\n", "Línea 1: se esperaban 4 campos y hay 2"),
+])
+def test_filas_mal_formadas(tmp_path, contenido, mensaje):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text(contenido, encoding="utf-8")
+    with pytest.raises(ValueError, match=mensaje):
+        app.Inventario(str(ruta))
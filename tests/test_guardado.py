@@ -0,0 +1,62 @@
+"""Guardado en segundo plano de InventarioApp (GuardadoDiferido)."""
+
+import threading
+
+import pytest
+
+from modulos import cargar_modulo
+
+guardado = cargar_modulo("InventarioApp/guardado.py", "guardado_app")
+
+
+def avisos(g):
+    return [g.avisos.get_nowait() for _ in range(g.avisos.qsize())]
+
+
+def test_junta_pedidos_y_guarda_lo_pendiente_al_cerrar():
+    llamadas = []
+    g = guardado.GuardadoDiferido(lambda: llamadas.append(1), retardo=10)
+    for _ in range(50):
+        g.pedir()
+    g.cerrar()  # corta la espera y guarda una sola vez
+    assert len(llamadas) == 1
+    assert avisos(g) == [("guardando", None), ("guardado", None)]
+
+
+def test_un_error_que_no_es_de_disco_no_detiene_el_hilo():
+    fallar = [True]
+    hecho = threading.Event()
+
+    def guardar():
+        if fallar[0]:
+            fallar[0] = False
+            raise TypeError("dato no serializable")
+        hecho.set()
+
+    g = guardado.GuardadoDiferido(guardar, retardo=0)
+    g.pedir()
+    while g.error is None:
+        hecho.wait(0.01)
+    assert g.error == "TypeError: dato no serializable"
+    g.pedir()
+    assert hecho.wait(5)
+    g.cerrar()
+    assert g.error is None
+    assert ("error", "TypeError: dato no serializable") in avisos(g)
+
+
+def test_pedir_y_cerrar_avisan_si_el_hilo_termino(monkeypatch):
+    # Lo que no es Exception (aquí KeyboardInterrupt) sí termina el hilo
+    monkeypatch.setattr(threading, "excepthook", lambda args: None)
+
+    def guardar():
+        raise KeyboardInterrupt
+
+    g = guardado.GuardadoDiferido(guardar, retardo=0)
+    g.pedir()
+    g.hilo.join(5)
+    assert not g.hilo.is_alive()
+    with pytest.raises(RuntimeError, match="El hilo de guardado terminó: KeyboardInterrupt"):
+        g.pedir()
+    with pytest.raises(RuntimeError):
+        g.cerrar()
@@ -0,0 +1,83 @@
+"""Importación masiva de TAREA 10 (CSV y JSONL por lotes)."""
+
+import csv
+
+from modulos import cargar_modulo
+
+t10 = cargar_modulo("TAREA 10/inventario.py", "inventario_t10_importacion")
+
+
+def abrir(tmp_path):
+    return t10.Inventario(str(tmp_path / "inventario.json"))
+
+
+def ids(inv):
+    return sorted(p.id for p in inv.listar())
+
+
+def errores(ruta):
+    with open(ruta, encoding="utf-8", newline="") as f:
+        return [(int(n), m) for n, m in list(csv.reader(f))[1:]]
+
+
+def test_csv_con_filas_invalidas_repetidas_y_existentes(tmp_path):
+    inv = abrir(tmp_path)
+    assert inv.agregar(t10.Producto("E1", "existente", 1, 1.0))[0]
+    origen = tmp_path / "nuevos.csv"
+    origen.write_text(
+        "id,nombre,cantidad,precio\n"
+        "A1,Teclado,3,10.5\n"          # línea 2
+        "A2,Mouse,x,2\n"               # 3: cantidad no numérica
+        "A3,Cable,-1,2\n"              # 4: negativa
+        ",Sin id,1,1\n"                # 5
+        "A1,Otra vez,1,1\n"            # 6: repetida en el archivo
+        "E1,Ya estaba,1,1\n"           # 7: ya en el inventario
+        "A4,\"Pila, AA\",8,0.5\n",     # 8
+        encoding="utf-8",
+    )
+    ok, msg = inv.importar(str(origen))
+    assert ok and "2 productos nuevos" in msg and "5 filas con errores" in msg
+    assert [n for n, _ in errores(f"{origen}.errores.csv")] == [3, 4, 5, 6, 7]
+    assert ids(inv) == ["A1", "A4", "E1"]
+    assert inv.buscar_por_id("A1").nombre == "Teclado"
+    assert ids(abrir(tmp_path)) == ["A1", "A4", "E1"]  # confirmado en disco
+
+
+def test_jsonl(tmp_path):
+    inv = abrir(tmp_path)
+    origen = tmp_path / "nuevos.jsonl"
+    origen.write_text(
+        '{"id": "J1", "nombre": "uno", "cantidad": 1, "precio": 1.5}\n'
+        "\n"
+        "{no es json\n"
+        "[1, 2]\n"
+        '{"id": "J2", "nombre": "dos", "cantidad": "2", "precio": "3"}\n',
+        encoding="utf-8",
+    )
+    ruta_errores = str(tmp_path / "errores.csv")
+    ok, msg = inv.importar(str(origen), ruta_errores=ruta_errores)
+    assert ok, msg
+    assert ids(inv) == ["J1", "J2"] and inv.buscar_por_id("J2").cantidad == 2
+    lineas = errores(ruta_errores)
+    assert [n for n, _ in lineas] == [3, 4]
+    assert lineas[0][1].startswith("JSON inválido")
+
+
+def test_error_de_lectura_revierte_lo_importado(tmp_path):
+    inv = abrir(tmp_path)
+    assert inv.agregar(t10.Producto("E1", "existente", 1, 1.0))[0]
+    origen = tmp_path / "nuevos.csv"
+    # Más de un lote (TAM_LOTE = 10000) de filas válidas y luego bytes que no son UTF-8
+    filas = "".join(f"P{i},n,1,1\n" for i in range(10010))
+    origen.write_bytes(b"id,nombre,cantidad,precio\n" + filas.encode() + b"X,\xff\xfe,1,1\n")
+    ok, msg = inv.importar(str(origen))
+    assert not ok and "No se importó nada" in msg
+    assert ids(inv) == ["E1"]
+    assert ids(abrir(tmp_path)) == ["E1"]
+
+
+def test_formato_desconocido_y_archivo_inexistente(tmp_path):
+    inv = abrir(tmp_path)
+    assert not inv.importar(str(tmp_path / "datos.xml"))[0]
+    ok, msg = inv.importar(str(tmp_path / "no_existe.csv"))
+    assert not ok and "No existe" in msg
@@ -0,0 +1,32 @@
+"""Índices ordenados de TAREA 10 contra un recorrido completo."""
+
+import random
+from types import SimpleNamespace
+
+from modulos import cargar_modulo
+
+indices = cargar_modulo("TAREA 10/indices_ordenados.py", "indices_ordenados_tarea10")
+
+
+def test_consultas_coinciden_con_un_recorrido_completo():
+    rnd = random.Random(7)
+    productos = {f"P{i}": SimpleNamespace(id=f"P{i}", cantidad=rnd.randrange(20)) for i in range(300)}
+    indice = indices.IndiceOrdenado.construir(lambda p: p.cantidad, productos.values())
+    for paso in range(2000):
+        id_ = f"P{rnd.randrange(400)}"
+        antes = productos.get(id_)
+        if antes is None:
+            productos[id_] = SimpleNamespace(id=id_, cantidad=rnd.randrange(20))
+            indice.agregar(productos[id_])
+        elif paso % 3:
+            productos[id_] = SimpleNamespace(id=id_, cantidad=rnd.randrange(20))
+            indice.actualizar(antes, productos[id_])
+        else:
+            indice.eliminar(productos.pop(id_))
+        a, b = sorted((rnd.randrange(22) - 1, rnd.randrange(22) - 1))
+        ordenados = sorted((p.cantidad, p.id) for p in productos.values())
+        assert indice.menores_que(a) == [i for c, i in ordenados if c < a]
+        assert indice.rango(a, b) == [i for c, i in ordenados if a <= c <= b]
+        assert indice.rango(maximo=b) == [i for c, i in ordenados if c <= b]
+        assert indice.mayores(5) == [i for _, i in reversed(ordenados[-5:])]
+    assert len(indice) == len(productos)
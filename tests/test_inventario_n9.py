@@ -0,0 +1,63 @@
+"""Inventario de Tarea_N9 (en memoria y SQLite) contra una lista de referencia."""
+
+import random
+
+import pytest
+
+from modulos import cargar_modulo
+
+n9 = cargar_modulo("Tarea_N9/Inventario.py", "Inventario")
+sqlite_n9 = cargar_modulo("Tarea_N9/almacen_sqlite.py", "almacen_sqlite_n9")
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def inventario(request, tmp_path):
+    if request.param == "memoria":
+        yield n9.Inventario()
+    else:
+        with sqlite_n9.InventarioSQLite(str(tmp_path / "inventario.db")) as inv:
+            yield inv
+
+
+def tuplas(productos):
+    return [(p.id, p.nombre, p.cantidad, p.precio) for p in productos]
+
+
+def test_paginas_coinciden_con_la_referencia_tras_cambios(inventario):
+    rnd = random.Random(3)
+    referencia = []  # productos en orden de alta
+    for paso in range(600):
+        id_ = f"P{rnd.randrange(300)}"
+        existente = next((p for p in referencia if p.id.lower() == id_.lower()), None)
+        accion = rnd.random()
+        if existente is None:
+            p = n9.Producto(id_, f"nombre {rnd.randrange(50)}", rnd.randrange(30), float(rnd.randrange(100)))
+            assert inventario.agregar_producto(p)
+            referencia.append(n9.Producto(p.id, p.nombre, p.cantidad, p.precio))
+        elif accion < 0.3:
+            assert inventario.eliminar_por_id(id_.upper())
+            referencia.remove(existente)
+        elif accion < 0.6:
+            assert inventario.actualizar_cantidad(id_, rnd.randrange(30))
+            existente.cantidad = inventario._buscar_por_id(id_).cantidad
+        else:
+            assert inventario.actualizar_precio(id_, float(rnd.randrange(100)))
+            existente.precio = inventario._buscar_por_id(id_).precio
+        if paso % 20 == 0:
+            campo = rnd.choice((None,) + n9.CAMPOS_ORDEN)
+            esperado = referencia if campo is None else sorted(referencia, key=lambda p: getattr(p, campo))
+            desde = rnd.randrange(len(esperado) + 1)
+            assert tuplas(inventario.pagina(desde, 7, campo)) == tuplas(esperado[desde:desde + 7])
+            assert tuplas(inventario.iterar(campo, desde)) == tuplas(esperado[desde:])
+    assert len(inventario) == len(referencia)
+
+
+def test_ordenar_por_un_campo_desconocido(inventario):
+    with pytest.raises(ValueError):
+        inventario.pagina(0, 5, "color")
+
+
+def test_sqlite_inicializa_el_estado_de_la_clase_base(tmp_path):
+    with sqlite_n9.InventarioSQLite(str(tmp_path / "inventario.db")) as inv:
+        for atributo in vars(n9.Inventario()):
+            assert hasattr(inv, atributo)
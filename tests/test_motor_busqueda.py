@@ -0,0 +1,101 @@
+"""Motor de búsqueda de TAREA SEMANA 11: prefijos, errores de tipeo, subcadenas y caché."""
+
+import pytest
+
+from modulos import cargar_modulo
+
+motor_mod = cargar_modulo("TAREA SEMANA 11/motor_busqueda.py", "motor_busqueda_semana11")
+sistema = cargar_modulo("TAREA SEMANA 11/sistema_inventario.py", "sistema_inventario_busqueda")
+MotorBusqueda = motor_mod.MotorBusqueda
+
+NOMBRES = {
+    "1": "Teclado mecánico",
+    "2": "Teclado inalámbrico",
+    "3": "Mouse óptico",
+    "4": "Cuaderno Ferriol",
+    "5": "Tecla de repuesto",
+    "6": "Café molido",
+}
+
+
+@pytest.fixture
+def motor():
+    return MotorBusqueda.construir(NOMBRES.items())
+
+
+def test_exacta_antes_que_prefijo(motor):
+    pagina = motor.buscar("tecla")
+    assert pagina.resultados == ["5", "1", "2"] and pagina.total == 3
+
+
+def test_tildes_y_mayusculas(motor):
+    assert motor.buscar("CAFE").resultados == ["6"]
+    assert motor.buscar("óptico").resultados == ["3"]
+
+
+def test_errores_de_tipeo_con_el_arbol_bk(motor):
+    assert motor.buscar("teclaod").resultados[:2] == ["1", "2"]  # transposición: 2 ediciones
+    assert motor.buscar("mouze").resultados == ["3"]
+    assert motor.buscar("xyz").resultados == []  # palabras cortas no toleran errores
+
+
+def test_arbol_bk_contra_comparar_todo():
+    vocabulario = ["teclado", "tecla", "techo", "pecado", "clave", "mouse", "house", "casa", "cosa", "caso"]
+    arbol = motor_mod.ArbolBK()
+    for palabra in vocabulario:
+        arbol.agregar(palabra)
+    for consulta in ("tecado", "mose", "cas", "zzz"):
+        for k in (1, 2):
+            esperado = {(p, d) for p in vocabulario if (d := motor_mod.distancia_edicion(consulta, p, 99)) <= k}
+            assert set(arbol.buscar(consulta, k)) == esperado
+
+
+def test_subcadena_dentro_de_una_palabra(motor):
+    assert motor.buscar("riol").resultados == ["4"]
+    assert "4" in motor.buscar("rno fer").resultados  # también a través de espacios
+    # Las coincidencias por palabra van antes que las de subcadena
+    assert motor.buscar("mol").resultados == ["6"]
+    assert motor.buscar("lado").resultados == ["1", "2"]
+
+
+def test_consulta_vacia_lista_todo(motor):
+    pagina = motor.buscar("", por_pagina=4)
+    assert pagina.total == len(NOMBRES) and pagina.resultados == ["1", "2", "3", "4"]
+    assert motor.buscar("  ", pagina=2, por_pagina=4).resultados == ["5", "6"]
+
+
+def test_paginacion(motor):
+    # "teclado" también encuentra "tecla" (a 2 ediciones), después de los exactos
+    paginas = [motor.buscar("teclado", pagina=n, por_pagina=1) for n in (1, 2, 3, 4)]
+    assert [p.resultados for p in paginas] == [["1"], ["2"], ["5"], []]
+    assert {p.total for p in paginas} == {3}
+
+
+def test_cache_lru_y_su_invalidacion():
+    motor = MotorBusqueda.construir(NOMBRES.items())
+    motor.tam_cache = 2
+    primera = motor.buscar("teclado")
+    assert motor.buscar("Teclado ") is primera  # misma clave normalizada
+    motor.buscar("mouse")
+    motor.buscar("cafe")
+    assert len(motor._cache) == 2 and ("teclado", 1, motor_mod.POR_PAGINA) not in motor._cache
+    motor.agregar("7", "Teclado gamer")
+    assert not motor._cache
+    assert motor.buscar("teclado").resultados == ["1", "2", "7", "5"]
+    motor.eliminar("1", NOMBRES["1"])
+    assert motor.buscar("teclado").resultados == ["2", "7", "5"]
+    assert "1" not in motor.buscar("").resultados
+
+
+def test_buscar_producto_en_el_inventario(capsys):
+    inv = sistema.Inventario()
+    for id_producto, nombre in NOMBRES.items():
+        inv.agregar_producto(sistema.Producto(id_producto, nombre, 1, 1.0))
+    inv.buscar_producto("riol")
+    assert "Cuaderno Ferriol" in capsys.readouterr().out
+    inv.buscar_producto("")
+    assert capsys.readouterr().out.count("ID:") == len(NOMBRES)
+    inv.eliminar_producto("4")
+    capsys.readouterr()
+    inv.buscar_producto("riol")
+    assert "No se encontraron" in capsys.readouterr().out
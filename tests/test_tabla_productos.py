@@ -0,0 +1,113 @@
+"""TablaProductos de tarea_inventario_text_id: borrado con lápidas, compactación y archivos."""
+
+import copyreg
+import pickle
+
+import pytest
+
+from modulos import cargar_modulo
+
+# pickle busca _reconstruir en el módulo 'tabla_productos': se carga con ese nombre
+# antes que sistema_inventario, que lo reutiliza
+cargar_modulo("tarea_inventario_text_id/tabla_productos.py", "tabla_productos")
+inv_mod = cargar_modulo("tarea_inventario_text_id/sistema_inventario.py", "sistema_inventario_text_id_tabla")
+Producto = inv_mod.Producto
+TablaProductos = inv_mod.TablaProductos
+cargar_tabla, guardar_tabla = inv_mod.cargar_tabla, inv_mod.guardar_tabla
+
+
+def tabla_con(n):
+    tabla = TablaProductos()
+    for i in range(n):
+        tabla[f"P{i}"] = Producto(f"P{i}", f"producto {i}", i, i + 0.25)
+    return tabla
+
+
+def filas(tabla):
+    return [(p.obtener_id(), p.nombre, p.cantidad, p.precio) for p in tabla.values()]
+
+
+def test_borrar_conserva_el_orden_de_insercion():
+    tabla = tabla_con(10)
+    del tabla["P3"]
+    del tabla["P0"]
+    assert list(tabla) == ["P1", "P2", "P4", "P5", "P6", "P7", "P8", "P9"]
+    assert len(tabla) == 8 and "P3" not in tabla
+    assert tabla["P9"].cantidad == 9
+    with pytest.raises(KeyError):
+        del tabla["P3"]
+
+
+def test_compactacion_tras_muchos_borrados():
+    tabla = tabla_con(100)
+    for i in range(0, 100, 3):
+        del tabla[f"P{i}"]
+    for i in range(1, 100, 3):
+        del tabla[f"P{i}"]
+    # Más de la mitad de las filas borradas: ya se compactó
+    assert tabla._borradas < len(tabla)
+    assert len(tabla._cantidades) < 100
+    esperado = [f"P{i}" for i in range(2, 100, 3)]
+    assert list(tabla) == esperado
+    assert [p.precio for p in tabla.values()] == [i + 0.25 for i in range(2, 100, 3)]
+    assert all(i in tabla for i in esperado)
+    assert [v.obtener_id() for v in tabla.buscar_por_nombre("PRODUCTO 5")] == ["P5", "P50", "P53", "P56", "P59"]
+
+
+def test_reinsertar_tras_una_lapida():
+    tabla = tabla_con(5)
+    del tabla["P1"]
+    tabla["P1"] = Producto("P1", "de nuevo", 7, 1.5)
+    # Como en un dict: la clave reinsertada va al final
+    assert list(tabla) == ["P0", "P2", "P3", "P4", "P1"]
+    assert (tabla["P1"].nombre, tabla["P1"].cantidad) == ("de nuevo", 7)
+    assert len(tabla) == 5
+    # Muchos borrados y altas sobre las mismas claves no pierden ninguna
+    for _ in range(20):
+        for i in range(5):
+            del tabla[f"P{i}"]
+            tabla[f"P{i}"] = Producto(f"P{i}", f"producto {i}", i, 0.0)
+    assert sorted(tabla) == [f"P{i}" for i in range(5)] and len(tabla) == 5
+
+
+def test_guardar_y_cargar_con_filas_borradas(tmp_path):
+    tabla = tabla_con(50)
+    for i in (4, 17, 30):
+        del tabla[f"P{i}"]
+    tabla["P5"] = Producto("P5", "ñandú renombrado", 55, 9.5)
+    esperado = filas(tabla)
+    ruta = str(tmp_path / "inventario.dat")
+    guardar_tabla(tabla, ruta)
+    cargada = cargar_tabla(ruta)
+    assert filas(cargada) == esperado
+    assert "P17" not in cargada and len(cargada) == 47
+    cargada["P17"] = Producto("P17", "vuelve", 1, 1.0)
+    assert list(cargada)[-1] == "P17"
+
+
+def test_archivo_truncado(tmp_path):
+    ruta = tmp_path / "inventario.dat"
+    guardar_tabla(tabla_con(10), str(ruta))
+    ruta.write_bytes(ruta.read_bytes()[:-5])
+    with pytest.raises(EOFError):
+        cargar_tabla(str(ruta))
+
+
+class _ProductoAntiguo:
+    """Se serializa como el Producto de antes: la clase y su __dict__."""
+
+    def __init__(self, id_producto, nombre, cantidad, precio):
+        self.id_producto, self.nombre, self.cantidad, self.precio = id_producto, nombre, cantidad, precio
+
+    def __reduce_ex__(self, protocolo):
+        return copyreg._reconstructor, (Producto, object, None), dict(self.__dict__)
+
+
+def test_cargar_pickle_antiguo(tmp_path, capsys):
+    antiguos = {f"A{i}": _ProductoAntiguo(f"A{i}", f"viejo {i}", i, i * 2.0) for i in range(3)}
+    ruta = tmp_path / "antiguo.pkl"
+    ruta.write_bytes(pickle.dumps(antiguos))
+    inv = inv_mod.Inventario()
+    inv.cargar_inventario(str(ruta))
+    assert filas(inv.productos) == [(f"A{i}", f"viejo {i}", i, i * 2.0) for i in range(3)]
+    assert "cargado" in capsys.readouterr().out